@@ -0,0 +1,280 @@
+"""An offline stand-in for the evnex.api.Evnex client.
+
+Serves a synthetic account of orgs x chargers x connectors x sessions from
+memory, with a configurable latency per endpoint, and counts every call.
+"""
+
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from evnex.schema.charge_points import (
+    EvnexChargePoint,
+    EvnexChargePointLoadSchedule,
+    EvnexChargePointOverrideConfig,
+)
+from evnex.schema.org import EvnexOrgBrief, EvnexOrgInsightEntry
+from evnex.schema.user import EvnexUserDetail
+from evnex.schema.v3.charge_points import (
+    EvnexChargePointDetail,
+    EvnexChargePointSession,
+)
+from evnex.schema.v3.generic import EvnexV3APIResponse
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def charge_point_id(org: int, charger: int) -> str:
+    return f"{org:08d}-0000-4000-8000-{charger:012d}"
+
+
+class FakeEvnex:
+    """Synthetic Evnex account served from memory.
+
+    ``latency`` maps an endpoint (method) name to the seconds each call
+    sleeps for, ``default_latency`` applies to every other endpoint.
+    """
+
+    def __init__(
+        self,
+        orgs: int = 1,
+        chargers: int = 2,
+        connectors: int = 1,
+        sessions: int = 10,
+        status: str = "CHARGING",
+        default_latency: float = 0.0,
+        latency: dict[str, float] | None = None,
+    ) -> None:
+        self.orgs = orgs
+        self.chargers = chargers
+        self.connectors = connectors
+        self.sessions = sessions
+        self.status = status
+        self.default_latency = default_latency
+        self.latency = latency or {}
+        self.calls: Counter[str] = Counter()
+        self.charge_now: dict[str, bool] = {}
+
+        self.id_token = "fake-id-token"
+        self.refresh_token = "fake-refresh-token"
+        self.access_token = "fake-access-token"
+        # Counters of the integration's EvnexClient, nothing is parsed here
+        self.responses_parsed = 0
+        self.responses_reused = 0
+
+        self._org_briefs = [
+            EvnexOrgBrief(
+                id=f"00000000-0000-4000-9000-{org:012d}",
+                isDefault=org == 0,
+                role=1,
+                createdDate=EPOCH,
+                updatedDate=EPOCH,
+                name=f"Org {org}",
+                slug=f"org-{org}",
+                tier=1,
+            )
+            for org in range(orgs)
+        ]
+
+    async def _call(self, endpoint: str) -> None:
+        self.calls[endpoint] += 1
+        delay = self.latency.get(endpoint, self.default_latency)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _org_index(self, org_id: str) -> int:
+        for index, org in enumerate(self._org_briefs):
+            if org_id in (org.id, org.slug):
+                return index
+        raise KeyError(org_id)
+
+    def authenticate(self) -> None:
+        self.calls["authenticate"] += 1
+
+    async def get_user_detail(self) -> EvnexUserDetail:
+        await self._call("get_user_detail")
+        return EvnexUserDetail(
+            id="00000000-0000-4000-a000-000000000000",
+            createdDate=EPOCH,
+            updatedDate=EPOCH,
+            name="Benchmark",
+            email="benchmark@example.com",
+            organisations=self._org_briefs,
+        )
+
+    async def get_org_charge_points(self, org_id: str) -> list[EvnexChargePoint]:
+        await self._call("get_org_charge_points")
+        org = self._org_index(org_id)
+        return [
+            EvnexChargePoint.model_validate(
+                {
+                    "id": charge_point_id(org, charger),
+                    "createdDate": EPOCH,
+                    "updatedDate": EPOCH,
+                    "networkStatusUpdatedDate": EPOCH,
+                    "name": f"Charger {org}-{charger}",
+                    "ocppChargePointId": f"OCPP{org}{charger}",
+                    "serial": f"SN{org:03d}{charger:05d}",
+                    "networkStatus": "ONLINE",
+                    "location": {
+                        "id": f"location-{org}",
+                        "name": "Garage",
+                        "createdDate": EPOCH,
+                        "updatedDate": EPOCH,
+                        "chargePointCount": self.chargers,
+                    },
+                    "details": {
+                        "model": "E2-P7-T2-5-SN",
+                        "vendor": "Evnex",
+                        "firmware": "1.0.0",
+                    },
+                    "maxCurrent": 32,
+                    "tokenRequired": False,
+                    "needsRegistrationInformation": False,
+                }
+            )
+            for charger in range(self.chargers)
+        ]
+
+    async def get_org_insight(
+        self, days: int, org_id: str, tz_offset: int | float = 12
+    ) -> list[EvnexOrgInsightEntry]:
+        await self._call("get_org_insight")
+        today = datetime.now(timezone(timedelta(hours=tz_offset))).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return [
+            EvnexOrgInsightEntry(
+                carbonOffset=1.0,
+                cost={"currency": "NZD", "amount": 1.0},
+                duration=3600,
+                powerUsage=1000.0 * day,
+                sessions=day,
+                startDate=today - timedelta(days=days - 1 - day),
+            )
+            for day in range(days)
+        ]
+
+    async def get_charge_point_detail_v3(self, charge_point_id: str):
+        await self._call("get_charge_point_detail_v3")
+        now = datetime.now(timezone.utc)
+        attributes = {
+            "connectors": [
+                {
+                    "evseId": f"{charge_point_id}-{connector}",
+                    "connectorFormat": "CABLE",
+                    "connectorType": "IEC_62196_T2",
+                    "ocppStatus": self.status,
+                    "powerType": "AC_1_PHASE",
+                    "connectorId": str(connector + 1),
+                    "ocppCode": "NoError",
+                    "updatedDate": now,
+                    "meter": {
+                        "frequency": 50.0,
+                        "power": 7200.0,
+                        "register": 123456.0,
+                        "updatedDate": now,
+                        "voltageL1N": 230.0,
+                        "currentL1": 31.3,
+                    },
+                    "maxVoltage": 230.0,
+                    "maxAmperage": 32.0,
+                }
+                for connector in range(self.connectors)
+            ],
+            "createdDate": EPOCH,
+            "electricityCost": {"currency": "NZD", "tariffs": [], "tariffType": "Flat"},
+            "firmware": "1.0.0",
+            "maxCurrent": 32,
+            "model": "E2-P7-T2-5-SN",
+            "name": charge_point_id,
+            "networkStatus": "ONLINE",
+            "networkStatusUpdatedDate": EPOCH,
+            "ocppChargePointId": charge_point_id,
+            "profiles": {},
+            "serial": charge_point_id[-8:],
+            "timeZone": "Pacific/Auckland",
+            "tokenRequired": False,
+            "updatedDate": now,
+            "vendor": "Evnex",
+        }
+        return EvnexV3APIResponse[EvnexChargePointDetail].model_validate(
+            {
+                "data": {
+                    "id": charge_point_id,
+                    "type": "charge-points",
+                    "attributes": attributes,
+                    "relationships": {},
+                },
+                "included": None,
+            }
+        )
+
+    async def get_charge_point_sessions(
+        self, charge_point_id: str
+    ) -> list[EvnexChargePointSession]:
+        await self._call("get_charge_point_sessions")
+        charging = self.status in ("CHARGING", "SUSPENDED_EVSE", "SUSPENDED_EV")
+        sessions = []
+        for index in range(self.sessions):
+            start = EPOCH + timedelta(days=self.sessions - index)
+            active = charging and index == 0
+            sessions.append(
+                EvnexChargePointSession.model_validate(
+                    {
+                        "id": f"{charge_point_id}-session-{index}",
+                        "type": "sessions",
+                        "attributes": {
+                            "connectorId": "1",
+                            "startDate": start,
+                            "endDate": None if active else start + timedelta(hours=2),
+                            "sessionStatus": "ACTIVE" if active else "COMPLETED",
+                            "totalPowerUsage": 14400.0,
+                            "totalCost": {"amount": 3.6, "currency": "NZD"},
+                        },
+                    }
+                )
+            )
+        return sessions
+
+    async def get_charge_point_override(
+        self, charge_point_id: str
+    ) -> EvnexChargePointOverrideConfig:
+        await self._call("get_charge_point_override")
+        return EvnexChargePointOverrideConfig(
+            chargeNow=self.charge_now.get(charge_point_id, False)
+        )
+
+    async def set_charge_point_override(
+        self, charge_point_id: str, charge_now: bool, connector_id: int = 1
+    ) -> bool:
+        await self._call("set_charge_point_override")
+        self.charge_now[charge_point_id] = charge_now
+        return True
+
+    async def stop_charge_point(
+        self, charge_point_id: str, org_id: str | None = None, **kwargs
+    ) -> None:
+        await self._call("stop_charge_point")
+
+    async def enable_charger(
+        self, org_id: str, charge_point_id: str, connector_id=1
+    ) -> None:
+        await self._call("enable_charger")
+
+    async def disable_charger(
+        self, org_id: str, charge_point_id: str, connector_id=1
+    ) -> None:
+        await self._call("disable_charger")
+
+    async def set_charger_load_profile(
+        self, charge_point_id: str, charging_profile_periods, **kwargs
+    ) -> EvnexChargePointLoadSchedule:
+        await self._call("set_charger_load_profile")
+        return EvnexChargePointLoadSchedule(
+            duration=kwargs.get("duration", 86400),
+            enabled=kwargs.get("enabled", True),
+            timezone="Pacific/Auckland",
+            units=kwargs.get("units", "A"),
+            chargingProfilePeriods=charging_profile_periods,
+        )
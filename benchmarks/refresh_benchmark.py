@@ -0,0 +1,390 @@
+"""Measure the setup and refresh cost of the evnex integration offline.
+
+Sets the integration up in a test Home Assistant instance against FakeEvnex,
+then refreshes every coordinator a number of times. Reports wall-clock
+latency, API calls per endpoint, entity setup time and peak traced memory.
+
+Run from the repository root, with pytest-homeassistant-custom-component
+installed alongside the integration's dependencies:
+
+    python benchmarks/refresh_benchmark.py --orgs 2 --chargers 25 --connectors 2 \\
+        --latency 0.05 --endpoint-latency get_charge_point_override=0.5
+
+With --replay, the integration's real Evnex client is used instead, with a
+trace recorded by the evnex.start_trace and evnex.stop_trace services served
+in place of the network:
+
+    python benchmarks/refresh_benchmark.py --replay evnex_trace_1700000000_0.jsonl.gz
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant import loader  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+import custom_components.evnex  # noqa: E402, F401
+from custom_components.evnex.const import (  # noqa: E402
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_BURST,
+    CONF_REQUESTS_PER_MINUTE,
+    DATA_ACCOUNT_COORDINATOR,
+    DATA_CHARGE_POINT_COORDINATORS,
+    DATA_INSIGHTS_COORDINATOR,
+    DOMAIN,
+)
+from custom_components.evnex.ratelimit import (  # noqa: E402
+    async_create_rate_limited_client,
+)
+from custom_components.evnex.tokens import async_get_token_store  # noqa: E402
+from custom_components.evnex.trace import ReplayTransport, load_trace  # noqa: E402
+from fake_evnex import FakeEvnex  # noqa: E402
+
+BENCHMARK_USERNAME = "benchmark"
+
+
+def _latency_stats(samples: list[float]) -> dict[str, float]:
+    """Median, 95th percentile and maximum of samples, in milliseconds."""
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    p95 = (
+        statistics.quantiles(samples_ms, n=20, method="inclusive")[18]
+        if len(samples_ms) > 1
+        else samples_ms[0]
+    )
+    return {
+        "median_ms": round(statistics.median(samples_ms), 2),
+        "p95_ms": round(p95, 2),
+        "max_ms": round(samples_ms[-1], 2),
+    }
+
+
+def _peak_memory_mib() -> float:
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    return round(peak / 2**20, 2)
+
+
+async def _timed(awaitable) -> float:
+    start = time.perf_counter()
+    await awaitable
+    return time.perf_counter() - start
+
+
+async def benchmark_setup(
+    hass: HomeAssistant,
+    fake: FakeEvnex | None,
+    options: dict,
+    api_calls: Callable[[], Counter[str]],
+) -> tuple[MockConfigEntry, dict]:
+    """Set up a config entry, timing the platforms' entity setup separately.
+
+    The entry uses fake, or the real client when replaying a trace.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": BENCHMARK_USERNAME, "password": "benchmark"},
+        options=options,
+        version=1,
+        minor_version=2,
+    )
+    entry.add_to_hass(hass)
+    if fake is None:
+        # Stored tokens, so that the client doesn't log in
+        async_get_token_store(hass).async_set(
+            entry.entry_id, "replay-id-token", "replay-refresh-token", "replay-token"
+        )
+
+    entity_setup: list[float] = []
+    forward_entry_setups = hass.config_entries.async_forward_entry_setups
+
+    async def timed_forward_entry_setups(*args, **kwargs):
+        start = time.perf_counter()
+        await forward_entry_setups(*args, **kwargs)
+        entity_setup.append(time.perf_counter() - start)
+
+    tracemalloc.reset_peak()
+    with (
+        patch("custom_components.evnex.EvnexClient", return_value=fake)
+        if fake is not None
+        else contextlib.nullcontext(),
+        patch.object(
+            hass.config_entries,
+            "async_forward_entry_setups",
+            timed_forward_entry_setups,
+        ),
+    ):
+        start = time.perf_counter()
+        if not await hass.config_entries.async_setup(entry.entry_id):
+            raise RuntimeError("Setting up the evnex config entry failed")
+        await hass.async_block_till_done()
+        total = time.perf_counter() - start
+
+    return entry, {
+        "total_ms": round(total * 1000, 2),
+        "entity_setup_ms": round(sum(entity_setup) * 1000, 2),
+        "entities": len(hass.states.async_all()),
+        "api_calls": dict(api_calls()),
+        "peak_memory_mib": _peak_memory_mib(),
+    }
+
+
+async def benchmark_refreshes(
+    hass: HomeAssistant,
+    entry: MockConfigEntry,
+    api_calls: Callable[[], Counter[str]],
+    rounds: int,
+) -> dict:
+    """Refresh each coordinator tier `rounds` times."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    account_coordinator = entry_data[DATA_ACCOUNT_COORDINATOR]
+    insights_coordinator = entry_data[DATA_INSIGHTS_COORDINATOR]
+    charge_point_coordinators = list(
+        entry_data[DATA_CHARGE_POINT_COORDINATORS].values()
+    )
+
+    latencies: dict[str, list[float]] = {
+        "account": [],
+        "insights": [],
+        "charge_points": [],
+    }
+    calls_before = api_calls()
+    writes_before = sum(c.state_writes for c in charge_point_coordinators)
+    avoided_before = sum(c.state_writes_avoided for c in charge_point_coordinators)
+
+    tracemalloc.reset_peak()
+    for _ in range(rounds):
+        latencies["account"].append(await _timed(account_coordinator.async_refresh()))
+        latencies["insights"].append(await _timed(insights_coordinator.async_refresh()))
+        latencies["charge_points"].append(
+            await _timed(
+                asyncio.gather(
+                    *(
+                        coordinator.async_refresh()
+                        for coordinator in charge_point_coordinators
+                    )
+                )
+            )
+        )
+        await hass.async_block_till_done()
+
+    calls = api_calls()
+    calls.subtract(calls_before)
+    return {
+        "rounds": rounds,
+        "latency": {
+            tier: _latency_stats(samples) for tier, samples in latencies.items()
+        },
+        "api_calls_per_round": {
+            endpoint: round(count / rounds, 2)
+            for endpoint, count in calls.items()
+            if count
+        },
+        "state_writes": sum(c.state_writes for c in charge_point_coordinators)
+        - writes_before,
+        "state_writes_avoided": sum(
+            c.state_writes_avoided for c in charge_point_coordinators
+        )
+        - avoided_before,
+        "peak_memory_mib": _peak_memory_mib(),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    options = {}
+    if args.max_concurrent_requests:
+        options[CONF_MAX_CONCURRENT_REQUESTS] = args.max_concurrent_requests
+
+    fake = None
+    if args.replay:
+        entries = load_trace(args.replay)
+        replay = ReplayTransport(entries, realtime=args.realtime)
+        # The client's unused Cognito client would otherwise probe for EC2
+        # instance credentials
+        os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+        # The trace's timing is only limited by --realtime
+        options[CONF_REQUESTS_PER_MINUTE] = options[CONF_REQUEST_BURST] = 10**6
+        fleet = {
+            "replay": args.replay,
+            "requests": len(entries),
+            "realtime": args.realtime,
+        }
+    else:
+        fake = FakeEvnex(
+            orgs=args.orgs,
+            chargers=args.chargers,
+            connectors=args.connectors,
+            sessions=args.sessions,
+            status=args.status,
+            default_latency=args.latency,
+            latency=dict(args.endpoint_latency),
+        )
+        fleet = {
+            "orgs": args.orgs,
+            "chargers_per_org": args.chargers,
+            "connectors_per_charger": args.connectors,
+            "sessions_per_charger": args.sessions,
+            "status": args.status,
+        }
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            # Load custom integrations, as the enable_custom_integrations fixture does
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS)
+            if fake is not None:
+
+                def api_calls() -> Counter[str]:
+                    return Counter(fake.calls)
+
+            else:
+                # Created ahead of the entry, which then uses it
+                telemetry = async_create_rate_limited_client(
+                    hass,
+                    BENCHMARK_USERNAME,
+                    rate=options[CONF_REQUESTS_PER_MINUTE] / 60,
+                    burst=options[CONF_REQUEST_BURST],
+                    transport=replay,
+                ).telemetry
+
+                def api_calls() -> Counter[str]:
+                    return Counter(
+                        {
+                            endpoint: stats.calls
+                            for endpoint, stats in telemetry.endpoints.items()
+                        }
+                    )
+
+            tracemalloc.start()
+            try:
+                entry, setup = await benchmark_setup(hass, fake, options, api_calls)
+                refresh = await benchmark_refreshes(hass, entry, api_calls, args.rounds)
+            finally:
+                tracemalloc.stop()
+            await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+
+    if fake is None:
+        fleet["unmatched_requests"] = replay.unmatched
+    return {
+        "fleet": fleet,
+        "setup": setup,
+        "refresh": refresh,
+    }
+
+
+def _endpoint_latency(value: str) -> tuple[str, float]:
+    endpoint, _, seconds = value.partition("=")
+    try:
+        return endpoint, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected ENDPOINT=SECONDS, got {value!r}"
+        ) from None
+
+
+def _print_report(report: dict) -> None:
+    fleet, setup, refresh = report["fleet"], report["setup"], report["refresh"]
+    if "replay" in fleet:
+        print(
+            f"Replay: {fleet['replay']}, {fleet['requests']} recorded request(s), "
+            f"{'recorded speed' if fleet['realtime'] else 'as fast as possible'}, "
+            f"{fleet['unmatched_requests']} request(s) not in the trace"
+        )
+    else:
+        print(
+            f"Fleet: {fleet['orgs']} org(s) x {fleet['chargers_per_org']} charger(s) "
+            f"x {fleet['connectors_per_charger']} connector(s), "
+            f"{fleet['sessions_per_charger']} session(s) per charger, "
+            f"{fleet['status']}"
+        )
+    print(
+        f"\nSetup: {setup['total_ms']} ms total, {setup['entity_setup_ms']} ms entity "
+        f"setup, {setup['entities']} entities, peak {setup['peak_memory_mib']} MiB"
+    )
+    for endpoint, count in sorted(setup["api_calls"].items()):
+        print(f"  {endpoint:32} {count:8}")
+
+    print(f"\nRefresh ({refresh['rounds']} rounds):")
+    print(f"  {'tier':32} {'median ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for tier, stats in refresh["latency"].items():
+        print(
+            f"  {tier:32} {stats['median_ms']:>10} {stats['p95_ms']:>10} "
+            f"{stats['max_ms']:>10}"
+        )
+    print("  API calls per round:")
+    for endpoint, count in sorted(refresh["api_calls_per_round"].items()):
+        print(f"    {endpoint:30} {count:8}")
+    print(
+        f"  State writes: {refresh['state_writes']}, "
+        f"avoided: {refresh['state_writes_avoided']}"
+    )
+    print(f"  Peak memory: {refresh['peak_memory_mib']} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orgs", type=int, default=1)
+    parser.add_argument("--chargers", type=int, default=10, help="per org")
+    parser.add_argument("--connectors", type=int, default=1, help="per charger")
+    parser.add_argument("--sessions", type=int, default=20, help="per charger")
+    parser.add_argument(
+        "--status",
+        default="CHARGING",
+        help="OCPP status reported by every connector (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds added to every API call (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--endpoint-latency",
+        type=_endpoint_latency,
+        action="append",
+        default=[],
+        metavar="ENDPOINT=SECONDS",
+        help="latency of a single endpoint, e.g. get_charge_point_override=0.5",
+    )
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument(
+        "--replay",
+        metavar="TRACE",
+        help="serve the API from a recorded trace instead of the fake",
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="replay responses with their recorded latency",
+    )
+    parser.add_argument("--max-concurrent-requests", type=int)
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
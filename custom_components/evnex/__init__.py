@@ -3,93 +3,81 @@ Custom integration to integrate Evnex with Home Assistant.
 
 """
 
-import os
-import json
+import asyncio
 import logging
 from datetime import timedelta
-from typing import Optional
 
-from evnex.api import Evnex
-from evnex.schema.charge_points import EvnexChargePoint, EvnexChargePointOverrideConfig
-from evnex.schema.v3.charge_points import EvnexChargePointDetail
-
-from evnex.schema.user import EvnexUserDetail
 from evnex.errors import NotAuthorizedException
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD, Platform
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.httpx_client import get_async_client
-from homeassistant.helpers.update_coordinator import (
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
-from httpx import HTTPStatusError, ReadTimeout
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from httpx import HTTPStatusError
 
 from .const import (
+    CONF_ACCOUNT_SCAN_INTERVAL,
+    CONF_ACTIVE_SCAN_INTERVAL,
+    CONF_CHARGE_POINT_SCAN_INTERVAL,
+    CONF_INSIGHTS_SCAN_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_OFFLINE_MAX_SCAN_INTERVAL,
+    CONF_REQUEST_BURST,
+    CONF_REQUESTS_PER_MINUTE,
+    DATA_ACCOUNT_COORDINATOR,
+    DATA_API_TELEMETRY,
+    DATA_CHARGE_POINT_COORDINATORS,
     DATA_CLIENT,
-    DATA_COORDINATOR,
+    DATA_INSIGHTS_COORDINATOR,
+    DATA_ORG_IDS,
+    DATA_RATE_LIMITER,
+    DATA_TRACE_RECORDER,
+    DEFAULT_ACCOUNT_SCAN_INTERVAL,
+    DEFAULT_ACTIVE_SCAN_INTERVAL,
+    DEFAULT_CHARGE_POINT_SCAN_INTERVAL,
+    DEFAULT_INSIGHTS_SCAN_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_OFFLINE_MAX_SCAN_INTERVAL,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUESTS_PER_MINUTE,
     DOMAIN,
     ISSUE_URL,
     PLATFORMS,
+    SIGNAL_TOPOLOGY_UPDATED,
     VERSION,
-    TOKEN_FILE_NAME,
 )
-
-SCAN_INTERVAL = timedelta(minutes=5)
+from .api import EvnexClient
+from .auth import EvnexTokenManager
+from .coordinator import (
+    EvnexAccountCoordinator,
+    EvnexChargePointCoordinator,
+    EvnexDataUpdateCoordinator,
+    EvnexOrgInsightsCoordinator,
+)
+from .orgs import async_get_org_identifier_store
+from .ratelimit import async_get_rate_limited_client
+from .registry import (
+    ACCOUNT,
+    CHARGE_POINT,
+    ORG,
+    EvnexPollerRegistry,
+    async_get_poller_registry,
+)
+from .restore import EvnexSnapshotStore
+from .scheduler import ChargePointPollScheduler
+from .services import async_setup_services
+from .tokens import async_get_token_store
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
 
-def persist_evnex_auth_tokens(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    id_token=None,
-    refresh_token=None,
-    access_token=None,
-) -> None:
-    config_dir = hass.config.config_dir
-    file = os.path.join(config_dir, TOKEN_FILE_NAME)
-    session_dict = {}
-    if os.path.isfile(file):
-        with open(file, "r") as spf:
-            try:
-                session_dict = json.load(spf)
-            except json.decoder.JSONDecodeError:
-                _LOGGER.error("Failed to load existing session data, overwriting!")
-    _LOGGER.info("Persisting session tokens to %s", file)
-    session_dict[entry.entry_id] = {
-        "id_token": id_token,
-        "refresh_token": refresh_token,
-        "access_token": access_token,
-    }
-
-    with open(os.open(file, os.O_CREAT | os.O_WRONLY, 0o600), "w") as spf:
-        json.dump(session_dict, spf)
-
-
-def retrieve_evnex_auth_tokens(
-    hass: HomeAssistant, entry: ConfigEntry
-) -> Optional[dict]:
-    config_dir = hass.config.config_dir
-    file = os.path.join(config_dir, TOKEN_FILE_NAME)
-    _LOGGER.info("Retrieving session token from: %s", file)
-    if os.path.isfile(file):
-        with open(file, "r") as spf:
-            try:
-                sessions = json.load(spf)
-                return sessions.get(entry.entry_id)
-            except json.decoder.JSONDecodeError:
-                _LOGGER.error("Failed to decode JSON session data in %s", file)
-                return None
-
-    return None
-
-
 async def async_setup(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Disallow configuration via YAML"""
+    async_setup_services(hass)
     return True
 
 
@@ -101,27 +89,101 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ISSUE_URL,
     )
 
+    hass.data.setdefault(DOMAIN, {})
+
+    await _async_migrate_entries(hass, entry)
+
+    account_key = _account_key(entry)
+    # Entries made before an account could only be added once get its user id
+    # as their unique id, so that the config flow refuses to add it again
+    if (
+        entry.unique_id is None
+        and "user_id" in entry.data
+        and hass.config_entries.async_entry_for_domain_unique_id(
+            DOMAIN, entry.data["user_id"]
+        )
+        is None
+    ):
+        hass.config_entries.async_update_entry(entry, unique_id=entry.data["user_id"])
+
+    # Entries for an account which another entry already polls share its
+    # pollers, and provide no entities of their own
+    registry = async_get_poller_registry(hass)
+    async with registry.lock(ACCOUNT, account_key):
+        if shared := registry.async_subscribe(ACCOUNT, account_key, entry.entry_id):
+            _LOGGER.warning(
+                f"The evnex account of '{entry.title}' is already set up by another "
+                "entry, this entry adds no entities until that one is removed"
+            )
+            entry_data = {
+                DATA_CLIENT: shared[DATA_CLIENT],
+                DATA_ACCOUNT_COORDINATOR: shared[DATA_ACCOUNT_COORDINATOR],
+                DATA_INSIGHTS_COORDINATOR: shared[DATA_INSIGHTS_COORDINATOR],
+                DATA_CHARGE_POINT_COORDINATORS: {},
+                DATA_ORG_IDS: set(),
+            }
+        else:
+            try:
+                entry_data = await _async_setup_account(
+                    hass, entry, registry, account_key
+                )
+            except Exception:
+                registry.async_release(entry.entry_id)
+                raise
+            registry.async_register(ACCOUNT, account_key, entry.entry_id, entry_data)
+
+    hass.data[DOMAIN][entry.entry_id] = entry_data
+
+    # Setup components
+    # hass.config_entries.async_setup_platforms(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    return True
+
+
+def _account_key(entry: ConfigEntry) -> str:
+    """Key of the account of an entry, shared by the entries of that account."""
+    return entry.data.get("user_id") or entry.data[CONF_USERNAME].casefold()
+
+
+async def _async_setup_account(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    registry: EvnexPollerRegistry,
+    account_key: str,
+) -> dict:
+    """Create the client and the pollers of an account, and fetch their data.
+
+    Charge points and orgs which the entry of another account already polls
+    are left to it.
+    """
     username = entry.data[CONF_USERNAME]
     password = entry.data[CONF_PASSWORD]
 
     # Load tokens from storage
-    evnex_auth_tokens = await hass.async_add_executor_job(
-        retrieve_evnex_auth_tokens, hass, entry
-    )
+    evnex_auth_tokens = await async_get_token_store(hass).async_get(entry.entry_id)
     evnex_auth_tokens = {} if evnex_auth_tokens is None else evnex_auth_tokens
 
-    httpx_client = get_async_client(hass)
+    # Every entry of an account shares one HTTP client and request budget
+    http_client = async_get_rate_limited_client(
+        hass,
+        entry,
+        account_key,
+        rate=entry.options.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE)
+        / 60,
+        burst=entry.options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST),
+    )
 
     try:
-        evnex_client: Evnex = await hass.async_add_executor_job(
-            Evnex,
+        evnex_client: EvnexClient = await hass.async_add_executor_job(
+            EvnexClient,
             username,
             password,
             evnex_auth_tokens.get("id_token"),
             evnex_auth_tokens.get("refresh_token"),
             evnex_auth_tokens.get("access_token"),
             None,
-            httpx_client,
+            http_client.client,
         )
 
     except NotAuthorizedException as exc:
@@ -131,171 +193,318 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.error("Failed to authenticate to evnex api")
         raise ConfigEntryAuthFailed from exc
 
-    hass.data.setdefault(DOMAIN, {})
+    # Limit how many requests are in flight against the Evnex API at once
+    request_semaphore = asyncio.Semaphore(
+        entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
+    )
 
-    await _async_migrate_entries(hass, entry)
+    @callback
+    def async_persist_tokens() -> None:
+        async_get_token_store(hass).async_set(
+            entry.entry_id,
+            evnex_client.id_token,
+            evnex_client.refresh_token,
+            evnex_client.access_token,
+        )
 
-    async def async_update_data(is_retry: bool = False):
-        """Fetch data from EVNEX API"""
-
-        data: dict = {
-            "user": None,
-            "org_briefs": {},  # by org_id
-            "org_insights": {},  # by org_id
-            "charge_points_by_org": {},  # by_org_id -> list of CPs
-            "charge_point_brief": {},  # by cp_id
-            "charge_point_details": {},  # by cp_id
-            "charge_point_override": {},  # by cp_id
-            "charge_point_sessions": {},  # by cp_id
-            "connector_brief": {},  # by (cp_id, connectorId)
-            "charge_point_to_org_map": {},  # by cp_id -> org_id
-        }
+    # Renew the session tokens before they expire rather than after a
+    # request is refused
+    token_manager = EvnexTokenManager(
+        hass, evnex_client, get_async_client(hass), async_persist_tokens
+    )
+    async_persist_tokens()
+    token_manager.async_start()
+    entry.async_on_unload(token_manager.async_stop)
 
-        try:
-            _LOGGER.info("Getting evnex user detail")
-            account: EvnexUserDetail = await evnex_client.get_user_detail()
+    org_identifiers = async_get_org_identifier_store(hass)
+    await org_identifiers.async_load()
 
-            await hass.async_add_executor_job(
-                persist_evnex_auth_tokens,
+    account_coordinator = EvnexAccountCoordinator(
+        hass,
+        entry,
+        evnex_client,
+        request_semaphore,
+        token_manager,
+        update_interval=timedelta(
+            minutes=entry.options.get(
+                CONF_ACCOUNT_SCAN_INTERVAL, DEFAULT_ACCOUNT_SCAN_INTERVAL
+            )
+        ),
+        org_identifiers=org_identifiers,
+    )
+    scheduler = ChargePointPollScheduler(
+        active_interval=timedelta(
+            seconds=entry.options.get(
+                CONF_ACTIVE_SCAN_INTERVAL, DEFAULT_ACTIVE_SCAN_INTERVAL
+            )
+        ),
+        idle_interval=timedelta(
+            seconds=entry.options.get(
+                CONF_CHARGE_POINT_SCAN_INTERVAL, DEFAULT_CHARGE_POINT_SCAN_INTERVAL
+            )
+        ),
+        offline_max_interval=timedelta(
+            minutes=entry.options.get(
+                CONF_OFFLINE_MAX_SCAN_INTERVAL, DEFAULT_OFFLINE_MAX_SCAN_INTERVAL
+            )
+        ),
+    )
+
+    # Start from the data saved before a restart if there is any, so that
+    # entities are set up without waiting on the Evnex API
+    snapshot_store = EvnexSnapshotStore(hass, entry.entry_id)
+    restored = await snapshot_store.async_load()
+    if restored is not None:
+        _LOGGER.info("Setting up from the evnex data saved before the restart")
+        account_coordinator.async_set_restored_data(restored.account)
+    else:
+        # Fetch initial data so we have data when entities subscribe
+        #
+        # If the refresh fails, async_config_entry_first_refresh will
+        # raise ConfigEntryNotReady and setup will try again later
+        await account_coordinator.async_config_entry_first_refresh()
+
+    org_ids = {
+        org_id
+        for org_id in account_coordinator.data.org_briefs
+        if registry.async_subscribe(ORG, org_id, entry.entry_id) is None
+    }
+    insights_coordinator = EvnexOrgInsightsCoordinator(
+        hass,
+        entry,
+        evnex_client,
+        request_semaphore,
+        token_manager,
+        update_interval=timedelta(
+            minutes=entry.options.get(
+                CONF_INSIGHTS_SCAN_INTERVAL, DEFAULT_INSIGHTS_SCAN_INTERVAL
+            )
+        ),
+        account_coordinator=account_coordinator,
+        org_ids=org_ids,
+    )
+    for org_id in org_ids:
+        registry.async_register(ORG, org_id, entry.entry_id, insights_coordinator)
+
+    # Each charge point gets its own coordinator so that a slow or failing
+    # charge point doesn't hold up or take down the others.
+    charge_point_coordinators: dict[str, EvnexChargePointCoordinator] = {}
+    # Removers of the callbacks saving the charge point snapshots
+    snapshot_callbacks: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_add_charge_point(charger_id: str) -> EvnexChargePointCoordinator | None:
+        """Create the coordinator of a charge point, None if another entry polls it."""
+        if registry.async_subscribe(CHARGE_POINT, charger_id, entry.entry_id):
+            return None
+        charge_point_coordinators[charger_id] = coordinator = (
+            EvnexChargePointCoordinator(
                 hass,
                 entry,
-                evnex_client.id_token,
-                evnex_client.refresh_token,
-                evnex_client.access_token,
+                evnex_client,
+                request_semaphore,
+                token_manager,
+                account_coordinator=account_coordinator,
+                scheduler=scheduler,
+                charger_id=charger_id,
             )
+        )
+        registry.async_register(CHARGE_POINT, charger_id, entry.entry_id, coordinator)
+        return coordinator
+
+    async def async_remove_charge_point(charger_id: str) -> None:
+        coordinator = charge_point_coordinators.pop(charger_id)
+        if remove_callback := snapshot_callbacks.pop(charger_id, None):
+            remove_callback()
+        registry.async_unregister(CHARGE_POINT, charger_id, entry.entry_id)
+        await coordinator.async_shutdown()
+
+    for charger_id in account_coordinator.data.charge_point_brief:
+        async_add_charge_point(charger_id)
+
+    coordinators: list[EvnexDataUpdateCoordinator] = [
+        account_coordinator,
+        insights_coordinator,
+        *charge_point_coordinators.values(),
+    ]
+    if restored is not None:
+        insights_coordinator.async_set_restored_data(restored.insights)
+        for charger_id, coordinator in charge_point_coordinators.items():
+            if snapshot := restored.charge_points.get(charger_id):
+                coordinator.async_set_restored_data(snapshot)
+    await asyncio.gather(
+        *(
+            coordinator.async_config_entry_first_refresh()
+            for coordinator in (account_coordinator, insights_coordinator)
+            if coordinator.data is None
+        ),
+        *(
+            coordinator.async_refresh()
+            for coordinator in charge_point_coordinators.values()
+            if coordinator.data is None
+        ),
+    )
+    # A charge point which can't be fetched doesn't hold up the others, it is
+    # set up on a later refresh of the account, see async_update_topology()
+    for charger_id, coordinator in list(charge_point_coordinators.items()):
+        if coordinator.data is None:
+            _LOGGER.warning(
+                f"Could not fetch charge point {charger_id}, "
+                "trying again on the next refresh of the account"
+            )
+            await async_remove_charge_point(charger_id)
+    # Index the orgs, charge points and connectors once for every platform
+    account_coordinator.async_update_topology(
+        {
+            charger_id: coordinator.data
+            for charger_id, coordinator in charge_point_coordinators.items()
+        }
+    )
+    if restored_coordinators := [
+        coordinator for coordinator in coordinators if coordinator.restored
+    ]:
+        entry.async_create_background_task(
+            hass,
+            _async_refresh_restored(restored_coordinators),
+            f"{DOMAIN} refresh of restored data",
+        )
 
-            data["user"] = account
+    @callback
+    def async_save_snapshots() -> None:
+        snapshot_store.async_schedule_save(
+            account_coordinator.data,
+            insights_coordinator.data,
+            {
+                charger_id: coordinator.data
+                for charger_id, coordinator in charge_point_coordinators.items()
+                if coordinator.data is not None
+            },
+        )
+
+    # Saved after each refresh, rather than as a listener, so that it isn't
+    # counted as an entity state write
+    for coordinator in (account_coordinator, insights_coordinator):
+        entry.async_on_unload(
+            coordinator.async_add_refresh_callback(async_save_snapshots)
+        )
+    # Charge points come and go with the account, see async_update_topology()
+    for charger_id, coordinator in charge_point_coordinators.items():
+        snapshot_callbacks[charger_id] = coordinator.async_add_refresh_callback(
+            async_save_snapshots
+        )
 
-            for org in account.organisations:
+    @callback
+    def async_remove_snapshot_callbacks() -> None:
+        for remove_callback in snapshot_callbacks.values():
+            remove_callback()
+
+    entry.async_on_unload(async_remove_snapshot_callbacks)
+
+    topology_lock = asyncio.Lock()
+
+    async def async_update_topology() -> None:
+        """Follow the charge points and connectors of the account.
+
+        Charge points added to the account get a coordinator, and those
+        removed lose theirs. The platforms then add and remove the entities
+        of the charge points and connectors which changed, and removed charge
+        points are removed from the device registry.
+        """
+        async with topology_lock:
+            charger_ids = account_coordinator.data.charge_point_brief.keys()
+            for charger_id in charge_point_coordinators.keys() - charger_ids:
+                _LOGGER.info(f"Charge point {charger_id} left the evnex account")
+                await async_remove_charge_point(charger_id)
+            added = [
+                coordinator
+                for charger_id in charger_ids - charge_point_coordinators.keys()
+                if (coordinator := async_add_charge_point(charger_id)) is not None
+            ]
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in added)
+            )
+            for coordinator in added:
+                if coordinator.data is None:
+                    # Tried again on the next refresh of the account
+                    await async_remove_charge_point(coordinator.charger_id)
+                    continue
                 _LOGGER.info(
-                    f"Getting evnex charge points for '{org.name}' (Org ID: {org.id}, Slug: {org.slug})"
+                    f"Charge point '{coordinator.charge_point_name}' "
+                    "joined the evnex account"
                 )
-                charge_points: list[EvnexChargePoint] = list()
-                try:
-                    charge_points = await evnex_client.get_org_charge_points(org.id)
-                except HTTPStatusError:
-                    _LOGGER.info("Org ID not supported switching to Slug")
-                    charge_points = await evnex_client.get_org_charge_points(org.slug)
-                data["charge_points_by_org"][org.id] = [cp for cp in charge_points]
-                data["org_briefs"][org.id] = org
-                _LOGGER.debug(f"Getting evnex org insights for {org.name}")
-                daily_insights = await evnex_client.get_org_insight(
-                    days=7, org_id=org.id
+                snapshot_callbacks[coordinator.charger_id] = (
+                    coordinator.async_add_refresh_callback(async_save_snapshots)
                 )
-                data["org_insights"][org.id] = daily_insights
-
-                for charge_point in charge_points:
-                    data["charge_point_to_org_map"][charge_point.id] = (
-                        org.id
-                    )  # Map charge_point.id back to org.id
-
-                    _LOGGER.debug(
-                        f"Getting evnex charge point data for '{charge_point.name}'"
-                    )
-                    api_v3_response = await evnex_client.get_charge_point_detail_v3(
-                        charge_point_id=charge_point.id
-                    )
-                    charge_point_detail: EvnexChargePointDetail = (
-                        api_v3_response.data.attributes
-                    )
-
-                    for connector_brief in charge_point_detail.connectors:
-                        data["connector_brief"][
-                            (charge_point.id, connector_brief.connectorId)
-                        ] = connector_brief
 
-                    _LOGGER.debug(
-                        f"Getting evnex charge point sessions for '{charge_point.name}'"
-                    )
-                    charge_point_sessions = (
-                        await evnex_client.get_charge_point_sessions(
-                            charge_point_id=charge_point.id
-                        )
-                    )
+            previous = account_coordinator.topology
+            topology = account_coordinator.async_update_topology(
+                {
+                    charger_id: coordinator.data
+                    for charger_id, coordinator in charge_point_coordinators.items()
+                }
+            )
+            if topology is previous:
+                return
+            changed = {
+                charger_id
+                for charger_id in previous.chargers.keys() | topology.chargers.keys()
+                if previous.chargers.get(charger_id)
+                != topology.chargers.get(charger_id)
+            }
+            async_dispatcher_send(
+                hass, SIGNAL_TOPOLOGY_UPDATED.format(entry.entry_id), changed
+            )
 
-                    # Only get the charge point override if the charge point is online!
-                    if charge_point_detail.networkStatus == "ONLINE":
-                        _LOGGER.debug(
-                            f"Getting evnex charge point override for '{charge_point.name}'"
-                        )
-                        # Don't block data update if a read timeout encountered
-                        try:
-                            charge_point_override: EvnexChargePointOverrideConfig = (
-                                await evnex_client.get_charge_point_override(
-                                    charge_point_id=charge_point.id
-                                )
-                            )
-                        except ReadTimeout:
-                            _LOGGER.warning(
-                                "Read timeout prevented getting charge point override"
-                            )
-                            charge_point_override = None
-                    else:
-                        _LOGGER.debug(
-                            "Not getting charge point override as charge point is not ONLINE"
-                        )
-                        charge_point_override = None
-
-                    data["charge_point_brief"][charge_point.id] = charge_point
-                    data["charge_point_details"][charge_point.id] = charge_point_detail
-                    data["charge_point_override"][charge_point.id] = (
-                        charge_point_override
-                    )
-                    data["charge_point_sessions"][charge_point.id] = (
-                        charge_point_sessions
+            device_registry = dr.async_get(hass)
+            for charger_id in previous.chargers.keys() - topology.chargers.keys():
+                if device := device_registry.async_get_device(
+                    identifiers={(DOMAIN, charger_id)}
+                ):
+                    device_registry.async_update_device(
+                        device.id, remove_config_entry_id=entry.entry_id
                     )
 
-            # Keep old key for migration purposes - can remove in future versions
-            data["charge_points"] = data["charge_points_by_org"]
-            return data
-        except NotAuthorizedException:
-            if not is_retry:
-                _LOGGER.debug("Refreshing auth and trying again")
-                await hass.async_add_executor_job(evnex_client.authenticate)
-                await hass.async_add_executor_job(
-                    persist_evnex_auth_tokens,
-                    hass,
-                    entry,
-                    evnex_client.id_token,
-                    evnex_client.refresh_token,
-                    evnex_client.access_token,
-                )
-                return await async_update_data(is_retry=True)
-            _LOGGER.warning(
-                "EVNEX Session Token is invalid and failed attempt to re-login"
-            )
-            raise
-        except Exception as err:
-            _LOGGER.exception(
-                f"Unhandled exception while updating evnex info {err=} {type(err)}"
+    @callback
+    def async_account_refreshed() -> None:
+        if account_coordinator.last_update_success:
+            entry.async_create_task(
+                hass, async_update_topology(), f"{DOMAIN} topology update"
             )
-            raise UpdateFailed from err
 
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=async_update_data,
-        update_interval=SCAN_INTERVAL,
-        config_entry=entry,
+    entry.async_on_unload(
+        account_coordinator.async_add_listener(async_account_refreshed)
     )
 
-    hass.data[DOMAIN][entry.entry_id] = {
+    return {
         DATA_CLIENT: evnex_client,
-        DATA_COORDINATOR: coordinator,
+        DATA_RATE_LIMITER: http_client.limiter,
+        DATA_API_TELEMETRY: http_client.telemetry,
+        DATA_TRACE_RECORDER: http_client.recorder,
+        DATA_ACCOUNT_COORDINATOR: account_coordinator,
+        DATA_INSIGHTS_COORDINATOR: insights_coordinator,
+        DATA_CHARGE_POINT_COORDINATORS: charge_point_coordinators,
+        DATA_ORG_IDS: org_ids,
     }
 
-    # Fetch initial data so we have data when entities subscribe
-    #
-    # If the refresh fails, async_config_entry_first_refresh will
-    # raise ConfigEntryNotReady and setup will try again later
 
-    await coordinator.async_config_entry_first_refresh()
+async def _async_refresh_restored(
+    coordinators: list[EvnexDataUpdateCoordinator],
+) -> None:
+    """Replace the data restored at startup with live data."""
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
 
-    # Setup components
-    # hass.config_entries.async_setup_platforms(entry, PLATFORMS)
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    return True
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the session tokens and saved data of a removed config entry."""
+    token_store = async_get_token_store(hass)
+    await token_store.async_load()
+    token_store.async_remove(entry.entry_id)
+    await EvnexSnapshotStore(hass, entry.entry_id).async_remove()
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -304,6 +513,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_get_poller_registry(hass).async_release(entry.entry_id)
 
     return unload_ok
 
@@ -0,0 +1,149 @@
+"""Evnex API client as used by the integration.
+
+Polling mostly returns exactly the same response as last time, idle chargers
+in particular. Parsing those responses into pydantic models is the bulk of
+the CPU time of a refresh, so:
+
+- ConditionalRequestTransport sends If-None-Match for GET requests whose
+  last response carried an ETag, and answers a 304 with the cached body.
+- EvnexClient fingerprints the body of each polled endpoint's response and
+  hands back the model parsed last time when the fingerprint is unchanged.
+
+Cached models are shared between refreshes and must not be modified.
+"""
+
+import contextlib
+import hashlib
+import logging
+from collections.abc import Iterator
+from contextvars import ContextVar
+
+import httpx
+from evnex.api import Evnex
+from evnex.schema.charge_points import EvnexGetChargePointsResponse
+from evnex.schema.org import EvnexGetOrgInsights
+from evnex.schema.user import EvnexGetUserResponse
+from evnex.schema.v3.charge_points import (
+    EvnexChargePointDetail,
+    EvnexGetChargePointSessionsResponse,
+)
+from evnex.schema.v3.generic import EvnexV3APIResponse
+from pydantic import BaseModel
+
+_LOGGER = logging.getLogger(__name__)
+
+# Response headers describing the encoded body, which no longer apply to the
+# decoded body replayed for a 304
+_ENCODING_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+_response_model: ContextVar[type[BaseModel] | None] = ContextVar(
+    "evnex_response_model", default=None
+)
+
+
+@contextlib.contextmanager
+def _parse_as(model: type[BaseModel]) -> Iterator[None]:
+    """Let EvnexClient parse and cache the responses received in this block."""
+    token = _response_model.set(model)
+    try:
+        yield
+    finally:
+        _response_model.reset(token)
+
+
+def _fingerprint(content: bytes) -> bytes:
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class ConditionalRequestTransport(httpx.AsyncBaseTransport):
+    """HTTP transport revalidating GET responses with their ETag."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+        # URL -> ETag, headers and decoded body of the last response
+        self._cached: dict[str, tuple[str, httpx.Headers, bytes]] = {}
+        self.not_modified = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self._transport.handle_async_request(request)
+
+        key = str(request.url)
+        cached = self._cached.get(key)
+        if cached is not None:
+            request.headers["If-None-Match"] = cached[0]
+        response = await self._transport.handle_async_request(request)
+
+        if response.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+            await response.aclose()
+            self.not_modified += 1
+            _, headers, content = cached
+            return httpx.Response(
+                httpx.codes.OK, headers=headers, content=content, request=request
+            )
+        if response.status_code == httpx.codes.OK:
+            if etag := response.headers.get("ETag"):
+                content = await response.aread()
+                headers = httpx.Headers(
+                    [
+                        (name, value)
+                        for name, value in response.headers.multi_items()
+                        if name.lower() not in _ENCODING_HEADERS
+                    ]
+                )
+                self._cached[key] = (etag, headers, content)
+            else:
+                self._cached.pop(key, None)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class EvnexClient(Evnex):
+    """Evnex client which only parses the polled responses that changed."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        # URL -> fingerprint of the body and the model parsed from it
+        self._parsed: dict[str, tuple[bytes, BaseModel]] = {}
+        self.responses_parsed = 0
+        self.responses_reused = 0
+        super().__init__(*args, **kwargs)
+
+    async def _check_api_response(self, response: httpx.Response):
+        model = _response_model.get()
+        if model is None or not response.is_success:
+            return await super()._check_api_response(response)
+
+        key = str(response.request.url)
+        fingerprint = _fingerprint(response.content)
+        cached = self._parsed.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            # Validating a model instance of the same class returns it as is
+            self.responses_reused += 1
+            return cached[1]
+
+        parsed = model.model_validate(await super()._check_api_response(response))
+        self._parsed[key] = (fingerprint, parsed)
+        self.responses_parsed += 1
+        return parsed
+
+    async def get_user_detail(self):
+        with _parse_as(EvnexGetUserResponse):
+            return await super().get_user_detail()
+
+    async def get_org_charge_points(self, org_id=None):
+        with _parse_as(EvnexGetChargePointsResponse):
+            return await super().get_org_charge_points(org_id)
+
+    async def get_org_insight(self, days, org_id=None, tz_offset=12):
+        with _parse_as(EvnexGetOrgInsights):
+            return await super().get_org_insight(days, org_id, tz_offset)
+
+    async def get_charge_point_detail_v3(self, charge_point_id):
+        with _parse_as(EvnexV3APIResponse[EvnexChargePointDetail]):
+            return await super().get_charge_point_detail_v3(charge_point_id)
+
+    async def get_charge_point_sessions(self, charge_point_id):
+        with _parse_as(EvnexGetChargePointSessionsResponse):
+            return await super().get_charge_point_sessions(charge_point_id)
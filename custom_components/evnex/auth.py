@@ -0,0 +1,187 @@
+"""Renewal of the Evnex session tokens before they expire.
+
+The Evnex API is authorised by Cognito tokens, which expire after an hour.
+Rather than waiting for a request to fail, EvnexTokenManager reads the
+expiry of the access and id tokens and renews them shortly before, with the
+refresh token. A request which is still refused triggers a renewal too.
+Renewals are single-flighted, so concurrent callers share the one renewal.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections.abc import Callable
+
+import httpx
+from evnex.api import Evnex
+from evnex.errors import NotAuthorizedException
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Renew the tokens this many seconds before they expire
+TOKEN_RENEWAL_MARGIN = 300
+
+
+def token_expiry(token: str | None) -> float | None:
+    """Return the expiry of a JWT as a timestamp, None if it can't be read.
+
+    The signature isn't verified, the expiry is only used to decide when to
+    renew the token.
+    """
+    if not token:
+        return None
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class EvnexTokenManager:
+    """Keeps the session tokens of an Evnex client valid."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: Evnex,
+        http_client: httpx.AsyncClient,
+        on_renewed: Callable[[], None],
+    ) -> None:
+        self.hass = hass
+        self.client = client
+        self._http_client = http_client
+        self._on_renewed = on_renewed
+        self._renewal: asyncio.Task | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        # Set once the entry is unloaded, a renewal finishing after that
+        # neither persists the tokens nor schedules the next renewal
+        self._stopped = False
+        self.renewals = 0
+
+    @property
+    def expires_at(self) -> float | None:
+        """When the first of the access and id tokens expires."""
+        expiries = [
+            expiry
+            for expiry in (
+                token_expiry(self.client.access_token),
+                token_expiry(self.client.id_token),
+            )
+            if expiry is not None
+        ]
+        return min(expiries, default=None)
+
+    def _expiring(self) -> bool:
+        expires_at = self.expires_at
+        return (
+            expires_at is not None and expires_at - time.time() < TOKEN_RENEWAL_MARGIN
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Renew the tokens whenever they are about to expire."""
+        self._stopped = False
+        self._async_schedule_renewal()
+
+    @callback
+    def async_stop(self) -> None:
+        self._stopped = True
+        self._async_cancel_timer()
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_schedule_renewal(self) -> None:
+        self._async_cancel_timer()
+        if self._stopped:
+            return
+        if (expires_at := self.expires_at) is None:
+            return
+        delay = max(expires_at - TOKEN_RENEWAL_MARGIN - time.time(), 0)
+        self._unsub_timer = async_call_later(self.hass, delay, self._async_timer_fired)
+
+    async def _async_timer_fired(self, _now) -> None:
+        self._unsub_timer = None
+        try:
+            await self.async_renew()
+        except Exception as err:  # noqa: BLE001
+            # Requests renew the tokens again when they are refused
+            _LOGGER.warning(f"Failed to renew the evnex session tokens: {err}")
+
+    async def async_ensure_valid(self) -> None:
+        """Renew the tokens first if they are about to expire."""
+        if self._renewal is not None or self._expiring():
+            await self.async_renew()
+
+    async def async_renew(self, refused_token: str | None = None) -> None:
+        """Renew the tokens, sharing a renewal already in progress.
+
+        refused_token is the access token of a refused request, the renewal is
+        skipped if the tokens have been renewed since it was sent.
+        """
+        if refused_token is not None and refused_token != self.client.access_token:
+            return
+        if self._renewal is None:
+            self._renewal = self.hass.async_create_task(
+                self._async_renew(), f"{__name__} renewal", eager_start=False
+            )
+            self._renewal.add_done_callback(self._async_renewal_done)
+        await asyncio.shield(self._renewal)
+
+    @callback
+    def _async_renewal_done(self, _task: asyncio.Task) -> None:
+        self._renewal = None
+
+    async def _async_renew(self) -> None:
+        try:
+            await self._async_renew_with_refresh_token()
+        except NotAuthorizedException as err:
+            _LOGGER.debug(f"Refresh token refused ({err}), logging in again")
+            await self.hass.async_add_executor_job(self.client.authenticate)
+        self.renewals += 1
+        if self._stopped:
+            return
+        self._on_renewed()
+        self._async_schedule_renewal()
+
+    async def _async_renew_with_refresh_token(self) -> None:
+        """Renew the access and id tokens with Cognito's REFRESH_TOKEN_AUTH flow."""
+        cognito = self.client.cognito
+        if not cognito.refresh_token:
+            raise NotAuthorizedException("No refresh token")
+        _LOGGER.debug("Renewing the evnex session tokens")
+        response = await self._http_client.post(
+            f"https://cognito-idp.{cognito.user_pool_region}.amazonaws.com/",
+            headers={
+                "Content-Type": "application/x-amz-json-1.1",
+                "X-Amz-Target": "AWSCognitoIdentityProviderService.InitiateAuth",
+            },
+            json={
+                "AuthFlow": "REFRESH_TOKEN_AUTH",
+                "ClientId": cognito.client_id,
+                "AuthParameters": {"REFRESH_TOKEN": cognito.refresh_token},
+            },
+        )
+        if response.status_code == httpx.codes.BAD_REQUEST:
+            error = response.json()
+            if error.get("__type", "").endswith("NotAuthorizedException"):
+                raise NotAuthorizedException(error.get("message"))
+        response.raise_for_status()
+
+        result = response.json()["AuthenticationResult"]
+        cognito.access_token = result["AccessToken"]
+        cognito.id_token = result["IdToken"]
+        if "RefreshToken" in result:
+            cognito.refresh_token = result["RefreshToken"]
+        cognito.token_type = result.get("TokenType")
@@ -0,0 +1,85 @@
+"""Circuit breaker for Evnex API calls which keep failing the same way."""
+
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop making a call which keeps failing, and probe it now and then.
+
+    - closed: calls are made. After `failure_threshold` consecutive failures
+      the breaker opens.
+    - open: calls are skipped for the cooldown, after which the breaker is
+      half-open.
+    - half-open: a single probe call is made. Success closes the breaker,
+      failure opens it again with the cooldown doubled, up to `max_cooldown`.
+      A probe which ends any other way, e.g. with an unrelated error or by
+      being cancelled, must be released with release_probe().
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        cooldown: float = 300,
+        max_cooldown: float = 1800,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.cooldown = cooldown
+        self._state = CLOSED
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            return HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if the call should be made now."""
+        state = self.state
+        if state == HALF_OPEN and self._state == OPEN:
+            # Let this call through as the probe, and skip others until it ends
+            _LOGGER.debug(f"Probing {self.name} again")
+            self._state = HALF_OPEN
+            return True
+        return state == CLOSED
+
+    def record_success(self) -> None:
+        if self._state != CLOSED:
+            _LOGGER.info(f"{self.name} has recovered")
+        self._state = CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+
+    def release_probe(self) -> None:
+        """Reopen the breaker after a probe which ended without an outcome.
+
+        The cooldown isn't extended, so the next call is the probe.
+        """
+        if self._state == HALF_OPEN:
+            _LOGGER.debug(f"Probe of {self.name} ended without an outcome")
+            self._state = OPEN
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._state == HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+        elif self.failures < self.failure_threshold:
+            return
+        _LOGGER.warning(
+            f"{self.name} failed {self.failures} times in a row, "
+            f"skipping it for {self.cooldown:.0f}s"
+        )
+        self._state = OPEN
+        self._opened_at = time.monotonic()
@@ -6,27 +6,28 @@ from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .entity import EvnexChargerEntity
+from .entity import EvnexChargerEntity, async_setup_charger_entities
 from evnex.api import Evnex
 
-from evnex.schema.user import EvnexUserDetail
-
-from evnex.schema.charge_points import EvnexChargePoint
-
-from .const import DATA_CLIENT, DATA_COORDINATOR, DOMAIN, CHARGER_SESSION_READY_STATES
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from .const import (
+    CHARGER_SESSION_READY_STATES,
+    DATA_ACCOUNT_COORDINATOR,
+    DATA_CLIENT,
+    DOMAIN,
+)
+from .coordinator import EvnexChargePointCoordinator
+from .ratelimit import command_priority
+from .snapshot import connector_part
 
 _LOGGER = logging.getLogger(__name__)
 
 
 def _is_charger_session_ready(
-    coordinator: DataUpdateCoordinator, charger_id: str, connector_id: str
+    coordinator: EvnexChargePointCoordinator, charger_id: str, connector_id: str
 ) -> bool:
-    connector_brief = coordinator.data.get("connector_brief").get(
-        (charger_id, connector_id)
-    )
+    connector_brief = coordinator.data.connectors.get(connector_id)
 
-    if coordinator.data["charge_point_details"][charger_id].networkStatus != "ONLINE":
+    if not coordinator.data.online:
         return False
 
     if connector_brief is not None:
@@ -39,7 +40,7 @@ class EvnexButtonSensorEntityDescription(ButtonEntityDescription):
     """Describes Mammotion button sensor entity."""
 
     press_fn: Callable[[Evnex, str, str], Awaitable[None]]
-    available: Callable[[DataUpdateCoordinator, str, str], bool]
+    available: Callable[[EvnexChargePointCoordinator, str, str], bool]
 
 
 EVNEX_BUTTONS: tuple[EvnexButtonSensorEntityDescription, ...] = (
@@ -62,48 +63,41 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Evnex button sensor entity."""
 
-    entities: list = []
     hass_data = hass.data[DOMAIN][config_entry.entry_id]
     evnex_api_client = hass_data[DATA_CLIENT]
-    coordinator = hass_data[DATA_COORDINATOR]
-    if not coordinator.data or not coordinator.data.get("user"):
+    account_coordinator = hass_data[DATA_ACCOUNT_COORDINATOR]
+    if not account_coordinator.data:
         _LOGGER.warning(
             "Button setup: Coordinator data or user data not available yet."
         )
         return
-    user_detail: EvnexUserDetail = coordinator.data["user"]
-    all_org_charge_points_data: dict[str, list[EvnexChargePoint]] = (
-        coordinator.data.get("charge_points", {})
-    )
 
-    for org_brief in user_detail.organisations:
-        org_id = org_brief.id
-        charge_points_in_org = all_org_charge_points_data.get(org_id, [])
-
-        # This is EvnexChargePoint (v2 schema)
-        for charge_point_obj in charge_points_in_org:
-            charger_id = charge_point_obj.id
-            entities.extend(
-                EvnexChargerButtonEntity(
-                    evnex_api_client,
-                    coordinator,
-                    entity_description,
-                    charger_id,
-                    org_id,
-                )
-                for entity_description in EVNEX_BUTTONS
+    entities = async_setup_charger_entities(
+        hass,
+        config_entry,
+        async_add_entities,
+        lambda coordinator, charger: [
+            EvnexChargerButtonEntity(
+                evnex_api_client,
+                coordinator,
+                entity_description,
+                charger.charger_id,
+                charger.org_id,
             )
-
+            for entity_description in EVNEX_BUTTONS
+        ],
+    )
     async_add_entities(entities)
 
 
 class EvnexChargerButtonEntity(EvnexChargerEntity, ButtonEntity):
     entity_description: EvnexButtonSensorEntityDescription
+    _snapshot_part = connector_part("1")
 
     def __init__(
         self,
         api_client,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         entity_description: EvnexButtonSensorEntityDescription,
         charger_id: str,
         org_id,
@@ -123,8 +117,11 @@ class EvnexChargerButtonEntity(EvnexChargerEntity, ButtonEntity):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self.entity_description.press_fn(self.evnex, self.charger_id, self.org_id)
-        await self.coordinator.async_refresh()
+        with command_priority():
+            await self.entity_description.press_fn(
+                self.evnex, self.charger_id, self.org_id
+            )
+        await self.coordinator.async_request_command_refresh()
 
     @property
     def available(self) -> bool:
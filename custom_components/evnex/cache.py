@@ -0,0 +1,138 @@
+"""Caches which avoid re-downloading evnex data that cannot have changed."""
+
+import logging
+import time
+from datetime import date, datetime, timezone
+
+from evnex.schema.org import EvnexOrgInsightEntry
+from evnex.schema.v3.charge_points import (
+    EvnexChargePointDetail,
+    EvnexChargePointSession,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of sessions kept per charge point, newest first
+MAX_CACHED_SESSIONS = 50
+# Re-download the session history at least this often, in seconds
+SESSION_HISTORY_MAX_AGE = 3600
+# Number of days of org insights exposed, the last one being the current day
+INSIGHT_DAYS = 7
+
+_OLDEST = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _session_start(session: EvnexChargePointSession) -> datetime:
+    start_date = session.attributes.startDate if session.attributes else None
+    if start_date is None:
+        return _OLDEST
+    if start_date.tzinfo is None:
+        return start_date.replace(tzinfo=timezone.utc)
+    return start_date
+
+
+def _connector_states(detail: EvnexChargePointDetail) -> tuple:
+    return tuple(
+        (connector.connectorId, connector.ocppStatus) for connector in detail.connectors
+    )
+
+
+class SessionHistoryCache:
+    """Session history of a single charge point, keyed by session id.
+
+    Finished sessions never change, so once the history has been downloaded
+    it only needs to be fetched again while a session is active, or when a
+    connector has changed state since the last download (a session may have
+    started or finished).
+    """
+
+    def __init__(self, max_sessions: int = MAX_CACHED_SESSIONS) -> None:
+        self.max_sessions = max_sessions
+        self._sessions: dict[str, EvnexChargePointSession] = {}
+        self._newest_first: list[EvnexChargePointSession] = []
+        self._connector_states: tuple | None = None
+        self._fetched_at: float | None = None
+
+    @property
+    def sessions(self) -> list[EvnexChargePointSession]:
+        """Cached sessions, newest first."""
+        return self._newest_first
+
+    @property
+    def has_active_session(self) -> bool:
+        return any(
+            session.attributes and session.attributes.endDate is None
+            for session in self._newest_first
+        )
+
+    def needs_refresh(self, detail: EvnexChargePointDetail | None) -> bool:
+        """Return True if the history may differ from the cached copy."""
+        if self._fetched_at is None or detail is None:
+            return True
+        if time.monotonic() - self._fetched_at > SESSION_HISTORY_MAX_AGE:
+            return True
+        return (
+            self.has_active_session
+            or _connector_states(detail) != self._connector_states
+        )
+
+    def merge(
+        self,
+        sessions: list[EvnexChargePointSession],
+        detail: EvnexChargePointDetail,
+    ) -> list[EvnexChargePointSession]:
+        """Merge freshly downloaded sessions into the cache."""
+        for session in sessions:
+            self._sessions[session.id] = session
+
+        self._newest_first = sorted(
+            self._sessions.values(), key=_session_start, reverse=True
+        )[: self.max_sessions]
+        if len(self._sessions) > self.max_sessions:
+            self._sessions = {session.id: session for session in self._newest_first}
+
+        self._connector_states = _connector_states(detail)
+        self._fetched_at = time.monotonic()
+        return self._newest_first
+
+
+class OrgInsightsCache:
+    """Daily insights of a single org.
+
+    Completed days never change, so they are kept until they fall out of the
+    window and only the current day is fetched again. When the local day rolls
+    over the whole window is fetched once, to pick up the final figures of
+    the day that just completed.
+    """
+
+    def __init__(self, days: int = INSIGHT_DAYS) -> None:
+        self.days = days
+        self._entries: list[EvnexOrgInsightEntry] = []  # oldest first
+        self._day: date | None = None
+
+    @property
+    def insights(self) -> list[EvnexOrgInsightEntry]:
+        return list(self._entries)
+
+    def needs_full_fetch(self, today: date) -> bool:
+        return not self._entries or self._day != today
+
+    def replace(
+        self, entries: list[EvnexOrgInsightEntry], today: date
+    ) -> list[EvnexOrgInsightEntry]:
+        """Replace the whole window with freshly fetched insights."""
+        self._entries = list(entries)[-self.days :]
+        self._day = today
+        return self.insights
+
+    def update_current_day(self, entries: list[EvnexOrgInsightEntry]) -> bool:
+        """Replace the current day, returning False if it is not the cached day."""
+        if not entries or not self._entries:
+            return False
+        current = entries[-1]
+        if current.startDate != self._entries[-1].startDate:
+            _LOGGER.debug("Org insights day rolled over, invalidating cache")
+            self._day = None
+            return False
+        self._entries[-1] = current
+        return True
@@ -8,7 +8,7 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
@@ -16,7 +16,25 @@ from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
 from evnex.api import Evnex
 from evnex.errors import NotAuthorizedException
 
-from .const import DOMAIN
+from .const import (
+    CONF_ACCOUNT_SCAN_INTERVAL,
+    CONF_ACTIVE_SCAN_INTERVAL,
+    CONF_CHARGE_POINT_SCAN_INTERVAL,
+    CONF_INSIGHTS_SCAN_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_OFFLINE_MAX_SCAN_INTERVAL,
+    CONF_REQUEST_BURST,
+    CONF_REQUESTS_PER_MINUTE,
+    DEFAULT_ACCOUNT_SCAN_INTERVAL,
+    DEFAULT_ACTIVE_SCAN_INTERVAL,
+    DEFAULT_CHARGE_POINT_SCAN_INTERVAL,
+    DEFAULT_INSIGHTS_SCAN_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_OFFLINE_MAX_SCAN_INTERVAL,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DOMAIN,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +68,8 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     # If the authentication is wrong:
     # InvalidAuth
 
-    unique_id = user_data.id
+    # The client parses the id as a UUID, entries keep it as a string
+    unique_id = str(user_data.id)
 
     # Return info that you want to store in the config entry.
     return {
@@ -58,7 +77,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         CONF_PASSWORD: data[CONF_PASSWORD],
         "unique_id": unique_id,
         "title": user_data.name,
-        "user_id": user_data.id,
+        "user_id": unique_id,
         "default_org_id": evnex_client.org_id,
     }
 
@@ -69,6 +88,14 @@ class EvnexConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore
     VERSION = 1
     MINOR_VERSION = 2
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> EvnexOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return EvnexOptionsFlowHandler()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -90,6 +117,10 @@ class EvnexConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore
             logger.exception("Unexpected exception")
             errors["base"] = "unknown"
         else:
+            # An account is only set up once, its chargers have a single set
+            # of entities
+            await self.async_set_unique_id(info["unique_id"])
+            self._abort_if_unique_id_configured()
             return self.async_create_entry(
                 title=info["title"],
                 data={
@@ -105,6 +136,82 @@ class EvnexConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore
         )
 
 
+class EvnexOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Evnex options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                    vol.Required(
+                        CONF_REQUESTS_PER_MINUTE,
+                        default=options.get(
+                            CONF_REQUESTS_PER_MINUTE,
+                            DEFAULT_REQUESTS_PER_MINUTE,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_REQUEST_BURST,
+                        default=options.get(
+                            CONF_REQUEST_BURST,
+                            DEFAULT_REQUEST_BURST,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_ACTIVE_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_ACTIVE_SCAN_INTERVAL,
+                            DEFAULT_ACTIVE_SCAN_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                    vol.Required(
+                        CONF_CHARGE_POINT_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_CHARGE_POINT_SCAN_INTERVAL,
+                            DEFAULT_CHARGE_POINT_SCAN_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=15)),
+                    vol.Required(
+                        CONF_OFFLINE_MAX_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_OFFLINE_MAX_SCAN_INTERVAL,
+                            DEFAULT_OFFLINE_MAX_SCAN_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_ACCOUNT_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_ACCOUNT_SCAN_INTERVAL,
+                            DEFAULT_ACCOUNT_SCAN_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                    vol.Required(
+                        CONF_INSIGHTS_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_INSIGHTS_SCAN_INTERVAL,
+                            DEFAULT_INSIGHTS_SCAN_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                }
+            ),
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
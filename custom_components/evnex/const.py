@@ -16,16 +16,53 @@ PLATFORMS = [Platform.SENSOR, Platform.SWITCH, Platform.NUMBER, Platform.BUTTON]
 # Configuration and options
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_ACCOUNT_SCAN_INTERVAL = "account_scan_interval"  # minutes
+CONF_INSIGHTS_SCAN_INTERVAL = "insights_scan_interval"  # minutes
+CONF_CHARGE_POINT_SCAN_INTERVAL = "charge_point_scan_interval"  # seconds, idle
+CONF_ACTIVE_SCAN_INTERVAL = "active_scan_interval"  # seconds
+CONF_OFFLINE_MAX_SCAN_INTERVAL = "offline_max_scan_interval"  # minutes
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"  # per account
+CONF_REQUEST_BURST = "request_burst"  # per account
 
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_ACCOUNT_SCAN_INTERVAL = 60
+DEFAULT_INSIGHTS_SCAN_INTERVAL = 15
+DEFAULT_CHARGE_POINT_SCAN_INTERVAL = 300
+DEFAULT_ACTIVE_SCAN_INTERVAL = 30
+DEFAULT_OFFLINE_MAX_SCAN_INTERVAL = 60
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_REQUEST_BURST = 10
+
+# Legacy session token file, migrated into TOKEN_STORAGE_KEY
 TOKEN_FILE_NAME = "evnex_session.json"
+TOKEN_STORAGE_KEY = f"{DOMAIN}.session_tokens"
+TOKEN_STORAGE_VERSION = 1
+# Last coordinator data of each config entry, see restore.py
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_STORAGE_VERSION = 1
+# Identifier (id or slug) that works for each org, see orgs.py
+ORG_IDENTIFIER_STORAGE_KEY = f"{DOMAIN}.org_identifiers"
+ORG_IDENTIFIER_STORAGE_VERSION = 1
 
 # Internal
 DATA_CLIENT = "evnex-client"
-DATA_COORDINATOR = "coordinator"
+DATA_ACCOUNT_COORDINATOR = "account-coordinator"
+DATA_INSIGHTS_COORDINATOR = "insights-coordinator"
+DATA_CHARGE_POINT_COORDINATORS = "charge-point-coordinators"
+DATA_TOKEN_STORE = "token-store"
+DATA_RATE_LIMITER = "rate-limiter"
+DATA_API_TELEMETRY = "api-telemetry"
+DATA_TRACE_RECORDER = "trace-recorder"
+DATA_RATE_LIMITED_CLIENTS = "rate-limited-clients"
+DATA_ORG_IDS = "org-ids"
+DATA_POLLER_REGISTRY = "poller-registry"
+DATA_ORG_IDENTIFIER_STORE = "org-identifier-store"
 
 # Coordinator Data Keys
 
 # Signals
-DATA_UPDATED = "evnex_data_updated"
+# Sent with the ids of the charge points whose topology changed, by entry id
+SIGNAL_TOPOLOGY_UPDATED = "evnex_topology_updated_{}"
 
 CHARGER_SESSION_READY_STATES = ["SUSPENDED_EVSE", "CHARGING"]
@@ -0,0 +1,631 @@
+"""Data update coordinators for the evnex integration.
+
+Polling is split into tiers:
+
+- The account coordinator (slow tier) fetches the user, their orgs and each
+  org's charge point list. These rarely change.
+- The org insights coordinator fetches the daily org insights. Completed days
+  are cached, so only the current day is fetched on each interval.
+- One charge point coordinator per charge point (fast tier) fetches the live
+  connector meter and status data, override and sessions of that charge
+  point. Its interval is chosen by the ChargePointPollScheduler.
+
+A failed or slow fetch for one charge point therefore only affects the
+entities of that charge point.
+"""
+
+import abc
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, TypeVar
+
+from evnex.api import Evnex
+from evnex.errors import NotAuthorizedException
+from evnex.schema.charge_points import EvnexChargePoint, EvnexChargePointOverrideConfig
+from evnex.schema.org import EvnexOrgBrief, EvnexOrgInsightEntry
+from evnex.schema.user import EvnexUserDetail
+from evnex.schema.v3.charge_points import EvnexChargePointDetail
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+from homeassistant.util import dt as dt_util
+from httpx import HTTPStatusError, ReadTimeout
+
+from .auth import EvnexTokenManager
+from .breaker import CircuitBreaker
+from .cache import OrgInsightsCache, SessionHistoryCache
+from .const import DOMAIN
+from .orgs import ORG_ID, ORG_SLUG, EvnexOrgIdentifierStore
+from .scheduler import ChargePointPollScheduler
+from .snapshot import (
+    CHARGER,
+    AccountSnapshot,
+    ChargePointSnapshot,
+    OrgInsightsSnapshot,
+)
+from .topology import EMPTY_TOPOLOGY, EvnexTopology
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+_DataT = TypeVar("_DataT")
+
+# Seconds to wait after a command before re-fetching the charge point, giving
+# it time to act on the command. Commands sent meanwhile share the one fetch.
+COMMAND_REFRESH_DELAY = 2
+# While a command is unconfirmed its charge point is polled at this interval,
+# for at most CONVERGENCE_TIMEOUT seconds
+CONVERGENCE_POLL_INTERVAL = timedelta(seconds=5)
+CONVERGENCE_TIMEOUT = 30
+# Consecutive override timeouts after which the override isn't fetched for
+# OVERRIDE_COOLDOWN seconds, doubling up to OVERRIDE_MAX_COOLDOWN while the
+# endpoint keeps timing out
+OVERRIDE_FAILURE_THRESHOLD = 3
+OVERRIDE_COOLDOWN = 300
+OVERRIDE_MAX_COOLDOWN = 1800
+# Seconds for which the results of a refresh that failed to re-authenticate
+# are reused by the next refresh
+RESUME_MAX_AGE = 120
+
+
+@dataclass
+class CommandExpectation:
+    """A state a charge point is expected to report after a command."""
+
+    confirmed: Callable[[ChargePointSnapshot], bool]
+    on_done: Callable[[bool], None]
+    deadline: float
+
+
+class EvnexDataUpdateCoordinator(DataUpdateCoordinator[_DataT], abc.ABC):
+    """Base coordinator whose API calls are retried once after re-authenticating."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        evnex_client: Evnex,
+        request_semaphore: asyncio.Semaphore,
+        token_manager: EvnexTokenManager,
+        name: str,
+        update_interval: timedelta,
+    ) -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            update_interval=update_interval,
+            config_entry=entry,
+        )
+        self.evnex = evnex_client
+        self._request_semaphore = request_semaphore
+        self.token_manager = token_manager
+        # True while the data is a snapshot saved before Home Assistant restarted
+        self.restored = False
+        # When each API call of the current refresh completed and its result,
+        # and the same for a refresh which failed to re-authenticate
+        self._progress: dict[Hashable, tuple[float, Any]] = {}
+        self._resumable: dict[Hashable, tuple[float, Any]] = {}
+        # Seconds taken by the last refresh, successful or not
+        self.last_refresh_duration: float | None = None
+        # Called after every successful refresh, see async_add_refresh_callback()
+        self._refresh_callbacks: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_set_restored_data(self, data: _DataT) -> None:
+        """Start from data saved before a restart, until a refresh succeeds."""
+        self.data = data
+        self.restored = True
+
+    @callback
+    def async_add_refresh_callback(
+        self, refresh_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call refresh_callback after every successful refresh.
+
+        Unlike a listener, refresh_callback doesn't update an entity, so it
+        isn't counted in the state writes and doesn't keep the coordinator
+        polling. Returns a function removing it.
+        """
+        self._refresh_callbacks.append(refresh_callback)
+
+        @callback
+        def remove_refresh_callback() -> None:
+            self._refresh_callbacks.remove(refresh_callback)
+
+        return remove_refresh_callback
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        if self.last_update_success:
+            self.restored = False
+            for refresh_callback in list(self._refresh_callbacks):
+                refresh_callback()
+
+    async def _async_call(self, api_call, *args, **kwargs):
+        """Await a single Evnex API call while holding the request semaphore.
+
+        A call refused for its session token is retried once after renewing
+        the tokens, leaving the other calls of the refresh alone. A call which
+        succeeded in a refresh that then failed to re-authenticate isn't made
+        again by the next refresh.
+        """
+        key = (api_call.__name__, args, tuple(sorted(kwargs.items())))
+        if key in self._resumable:
+            self._progress[key] = self._resumable.pop(key)
+            return self._progress[key][1]
+
+        await self.token_manager.async_ensure_valid()
+        access_token = self.evnex.access_token
+        try:
+            async with self._request_semaphore:
+                result = await api_call(*args, **kwargs)
+        except NotAuthorizedException:
+            _LOGGER.debug("Refreshing auth and trying again")
+            await self.token_manager.async_renew(access_token)
+            async with self._request_semaphore:
+                result = await api_call(*args, **kwargs)
+        self._progress[key] = (time.monotonic(), result)
+        return result
+
+    @abc.abstractmethod
+    async def _async_fetch(self) -> _DataT:
+        """Fetch this tier's data from the Evnex API."""
+
+    async def _async_update_data(self) -> _DataT:
+        """Fetch data from EVNEX API"""
+        now = time.monotonic()
+        self._resumable = {
+            key: progress
+            for key, progress in self._resumable.items()
+            if now - progress[0] <= RESUME_MAX_AGE
+        }
+        if self._resumable:
+            _LOGGER.debug(
+                f"Resuming the failed refresh of {self.name}, "
+                f"{len(self._resumable)} results kept"
+            )
+        self._progress = {}
+        start = time.monotonic()
+        try:
+            data = await self._async_fetch()
+        except NotAuthorizedException:
+            _LOGGER.warning(
+                "EVNEX Session Token is invalid and failed attempt to re-login"
+            )
+            # Only the calls which didn't complete are made by the next refresh
+            self._resumable = self._progress
+            raise
+        except Exception as err:
+            _LOGGER.exception(
+                f"Unhandled exception while updating evnex info {err=} {type(err)}"
+            )
+            self._resumable = {}
+            raise UpdateFailed from err
+        finally:
+            self._progress = {}
+            self.last_refresh_duration = time.monotonic() - start
+        self._resumable = {}
+        return data
+
+
+class EvnexAccountCoordinator(EvnexDataUpdateCoordinator[AccountSnapshot]):
+    """Slow tier: user, orgs and charge point lists."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        evnex_client: Evnex,
+        request_semaphore: asyncio.Semaphore,
+        token_manager: EvnexTokenManager,
+        update_interval: timedelta,
+        org_identifiers: EvnexOrgIdentifierStore,
+    ) -> None:
+        super().__init__(
+            hass,
+            entry,
+            evnex_client,
+            request_semaphore,
+            token_manager,
+            name=f"{DOMAIN}_account",
+            update_interval=update_interval,
+        )
+        self.org_identifiers = org_identifiers
+        # Orgs, charge points and connectors which entities are set up for
+        self.topology: EvnexTopology = EMPTY_TOPOLOGY
+
+    @callback
+    def async_update_topology(
+        self, charge_points: Mapping[str, ChargePointSnapshot | None]
+    ) -> EvnexTopology:
+        """Index the topology of the account and its charge point snapshots.
+
+        The current topology is kept, rather than replaced by an equal one,
+        when nothing changed.
+        """
+        topology = EvnexTopology.build(self.data, charge_points, self.topology)
+        if topology != self.topology:
+            self.topology = topology
+        return self.topology
+
+    async def _async_get_org_charge_points(
+        self, org: EvnexOrgBrief
+    ) -> list[EvnexChargePoint]:
+        _LOGGER.info(
+            f"Getting evnex charge points for '{org.name}' (Org ID: {org.id}, Slug: {org.slug})"
+        )
+        # Try the identifier which worked last, and the other only if it fails
+        identifiers = {ORG_ID: org.id, ORG_SLUG: org.slug}
+        identifier = self.org_identifiers.get(org.id)
+        try:
+            return await self._async_call(
+                self.evnex.get_org_charge_points, identifiers[identifier]
+            )
+        except HTTPStatusError:
+            fallback = ORG_SLUG if identifier == ORG_ID else ORG_ID
+            _LOGGER.info(f"Org {identifier} not supported switching to {fallback}")
+            charge_points = await self._async_call(
+                self.evnex.get_org_charge_points, identifiers[fallback]
+            )
+        self.org_identifiers.async_set(org.id, fallback)
+        return charge_points
+
+    async def _async_fetch(self) -> AccountSnapshot:
+        _LOGGER.info("Getting evnex user detail")
+        account: EvnexUserDetail = await self._async_call(self.evnex.get_user_detail)
+
+        # Fetch every org concurrently, then assemble the results in org order.
+        org_charge_points = await asyncio.gather(
+            *(self._async_get_org_charge_points(org) for org in account.organisations)
+        )
+        return AccountSnapshot(
+            account,
+            charge_points_by_org={
+                org.id: list(charge_points)
+                for org, charge_points in zip(account.organisations, org_charge_points)
+            },
+        )
+
+
+class EvnexOrgInsightsCoordinator(EvnexDataUpdateCoordinator[OrgInsightsSnapshot]):
+    """Daily org insights, only re-fetching the current day each interval."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        evnex_client: Evnex,
+        request_semaphore: asyncio.Semaphore,
+        token_manager: EvnexTokenManager,
+        update_interval: timedelta,
+        account_coordinator: EvnexAccountCoordinator,
+        org_ids: set[str] | None = None,
+    ) -> None:
+        super().__init__(
+            hass,
+            entry,
+            evnex_client,
+            request_semaphore,
+            token_manager,
+            name=f"{DOMAIN}_org_insights",
+            update_interval=update_interval,
+        )
+        self.account_coordinator = account_coordinator
+        # Orgs to poll, None for every org of the account
+        self.org_ids = org_ids
+        self._caches: dict[str, OrgInsightsCache] = {}
+
+    async def _async_get_org_insights(
+        self, org: EvnexOrgBrief, today: date, tz_offset: int | float
+    ) -> list[EvnexOrgInsightEntry]:
+        cache = self._caches.setdefault(org.id, OrgInsightsCache())
+
+        if not cache.needs_full_fetch(today):
+            _LOGGER.debug(f"Getting evnex org insights for {org.name} (today)")
+            insights = await self._async_call(
+                self.evnex.get_org_insight, days=1, org_id=org.id, tz_offset=tz_offset
+            )
+            if cache.update_current_day(insights):
+                return cache.insights
+
+        _LOGGER.debug(f"Getting evnex org insights for {org.name}")
+        insights = await self._async_call(
+            self.evnex.get_org_insight,
+            days=cache.days,
+            org_id=org.id,
+            tz_offset=tz_offset,
+        )
+        return cache.replace(insights, today)
+
+    async def _async_fetch(self) -> OrgInsightsSnapshot:
+        # Days are split on Home Assistant's local time
+        now = dt_util.now()
+        tz_offset = now.utcoffset().total_seconds() / 3600
+        if tz_offset.is_integer():
+            tz_offset = int(tz_offset)
+
+        orgs: list[EvnexOrgBrief] = [
+            org
+            for org in self.account_coordinator.data.org_briefs.values()
+            if self.org_ids is None or org.id in self.org_ids
+        ]
+        for org_id in self._caches.keys() - {org.id for org in orgs}:
+            del self._caches[org_id]
+
+        org_insights = await asyncio.gather(
+            *(self._async_get_org_insights(org, now.date(), tz_offset) for org in orgs)
+        )
+        return OrgInsightsSnapshot(
+            {org.id: daily_insights for org, daily_insights in zip(orgs, org_insights)}
+        )
+
+
+class EvnexChargePointCoordinator(EvnexDataUpdateCoordinator[ChargePointSnapshot]):
+    """Fast tier for a single charge point: connector data, override and sessions."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        evnex_client: Evnex,
+        request_semaphore: asyncio.Semaphore,
+        token_manager: EvnexTokenManager,
+        account_coordinator: EvnexAccountCoordinator,
+        scheduler: ChargePointPollScheduler,
+        charger_id: str,
+    ) -> None:
+        super().__init__(
+            hass,
+            entry,
+            evnex_client,
+            request_semaphore,
+            token_manager,
+            name=f"{DOMAIN}_charge_point_{charger_id}",
+            update_interval=scheduler.idle_interval,
+        )
+        self.account_coordinator = account_coordinator
+        self.scheduler = scheduler
+        self.charger_id = charger_id
+        self._session_history = SessionHistoryCache()
+        # The override endpoint often times out, stop waiting on it for a while
+        # when it keeps doing so and show the last override known instead
+        self._override_breaker = CircuitBreaker(
+            f"Charge point override of '{self.charge_point_name}'",
+            failure_threshold=OVERRIDE_FAILURE_THRESHOLD,
+            cooldown=OVERRIDE_COOLDOWN,
+            max_cooldown=OVERRIDE_MAX_COOLDOWN,
+        )
+        self._last_override: EvnexChargePointOverrideConfig | None = None
+        self._command_refresh = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=COMMAND_REFRESH_DELAY,
+            immediate=False,
+            function=self.async_refresh,
+        )
+
+        # Unconfirmed commands, by the key of the entity that sent them
+        self._expectations: dict[Hashable, CommandExpectation] = {}
+        # Interval chosen by the scheduler, ignoring unconfirmed commands
+        self._polling_interval: timedelta = scheduler.idle_interval
+
+        # Snapshot parts changed by the last refresh, None to notify everyone
+        self._changed_parts: frozenset | None = None
+        self._notified_success: bool | None = None
+        # Entity state writes made and avoided, in total and on the last refresh
+        self.state_writes = 0
+        self.state_writes_avoided = 0
+        self.last_state_writes_avoided = 0
+
+    @property
+    def charge_point_name(self) -> str:
+        charge_point = self.account_coordinator.data.charge_point_brief.get(
+            self.charger_id
+        )
+        return charge_point.name if charge_point else self.charger_id
+
+    async def async_request_command_refresh(self) -> None:
+        """Re-fetch only this charge point shortly after a command was sent."""
+        await self._command_refresh.async_call()
+
+    async def async_expect(
+        self,
+        key: Hashable,
+        confirmed: Callable[[ChargePointSnapshot], bool],
+        on_done: Callable[[bool], None],
+    ) -> None:
+        """Poll this charge point until it confirms the result of a command.
+
+        The charge point is polled every CONVERGENCE_POLL_INTERVAL until
+        confirmed(snapshot) holds, or CONVERGENCE_TIMEOUT passes, then
+        on_done is called with the outcome. A pending expectation with the
+        same key is replaced without being called.
+        """
+        self._expectations[key] = CommandExpectation(
+            confirmed, on_done, time.monotonic() + CONVERGENCE_TIMEOUT
+        )
+        await self._command_refresh.async_call()
+
+    @callback
+    def async_cancel_expectation(self, key: Hashable) -> None:
+        """Forget the pending expectation with key, without calling it."""
+        self._expectations.pop(key, None)
+
+    def _next_update_interval(self) -> timedelta:
+        if self._expectations:
+            return min(self._polling_interval, CONVERGENCE_POLL_INTERVAL)
+        return self._polling_interval
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Settle the expectations the refresh confirmed or that timed out."""
+        super()._async_refresh_finished()
+        if not self._expectations:
+            return
+
+        now = time.monotonic()
+        for key, expectation in list(self._expectations.items()):
+            if self.last_update_success and expectation.confirmed(self.data):
+                confirmed = True
+            elif now >= expectation.deadline:
+                confirmed = False
+            else:
+                continue
+            del self._expectations[key]
+            expectation.on_done(confirmed)
+
+        # Back to the scheduler's interval once every command is settled
+        update_interval = self._next_update_interval()
+        if update_interval != self.update_interval:
+            self.update_interval = update_interval
+            if self._listeners:
+                self._schedule_refresh()
+
+    async def async_shutdown(self) -> None:
+        await super().async_shutdown()
+        self._command_refresh.async_shutdown()
+        self._expectations.clear()
+
+    async def _async_get_detail_and_override(self):
+        _LOGGER.debug(f"Getting evnex charge point data for '{self.charge_point_name}'")
+        api_v3_response = await self._async_call(
+            self.evnex.get_charge_point_detail_v3,
+            charge_point_id=self.charger_id,
+        )
+        charge_point_detail: EvnexChargePointDetail = api_v3_response.data.attributes
+
+        # Only get the charge point override if the charge point is online!
+        if charge_point_detail.networkStatus != "ONLINE":
+            _LOGGER.debug(
+                "Not getting charge point override as charge point is not ONLINE"
+            )
+            return charge_point_detail, None, False
+
+        if not self._override_breaker.allow_request():
+            _LOGGER.debug(
+                f"Using the last known override for '{self.charge_point_name}'"
+            )
+            return charge_point_detail, self._last_override, True
+
+        _LOGGER.debug(
+            f"Getting evnex charge point override for '{self.charge_point_name}'"
+        )
+        # Don't block data update if a read timeout encountered
+        try:
+            charge_point_override: EvnexChargePointOverrideConfig = (
+                await self._async_call(
+                    self.evnex.get_charge_point_override,
+                    charge_point_id=self.charger_id,
+                )
+            )
+        except ReadTimeout:
+            _LOGGER.warning("Read timeout prevented getting charge point override")
+            self._override_breaker.record_failure()
+            return charge_point_detail, self._last_override, True
+        except BaseException:
+            # Not a timeout of the override endpoint, but a probe must not be
+            # left in flight or the override would never be fetched again
+            self._override_breaker.release_probe()
+            raise
+        self._override_breaker.record_success()
+        self._last_override = charge_point_override
+        return charge_point_detail, charge_point_override, False
+
+    async def _async_get_sessions(self):
+        _LOGGER.debug(
+            f"Getting evnex charge point sessions for '{self.charge_point_name}'"
+        )
+        return await self._async_call(
+            self.evnex.get_charge_point_sessions,
+            charge_point_id=self.charger_id,
+        )
+
+    async def _async_fetch(self) -> ChargePointSnapshot:
+        previous_detail = self.data.detail if self.data else None
+        if self._session_history.needs_refresh(previous_detail):
+            # Likely to change, fetch alongside the charge point detail
+            (
+                (charge_point_detail, charge_point_override, override_stale),
+                charge_point_sessions,
+            ) = await asyncio.gather(
+                self._async_get_detail_and_override(), self._async_get_sessions()
+            )
+        else:
+            (
+                charge_point_detail,
+                charge_point_override,
+                override_stale,
+            ) = await self._async_get_detail_and_override()
+            charge_point_sessions = None
+            if self._session_history.needs_refresh(charge_point_detail):
+                charge_point_sessions = await self._async_get_sessions()
+
+        if charge_point_sessions is not None:
+            charge_point_sessions = self._session_history.merge(
+                charge_point_sessions, charge_point_detail
+            )
+        else:
+            _LOGGER.debug(
+                f"Using cached sessions for '{self.charge_point_name}', no connector changed state"
+            )
+            charge_point_sessions = self._session_history.sessions
+
+        snapshot = ChargePointSnapshot(
+            self.charger_id,
+            charge_point_detail,
+            charge_point_override,
+            charge_point_sessions,
+            override_stale=override_stale,
+        )
+        self._polling_interval = self.scheduler.record_poll(
+            self.charger_id, charge_point_detail
+        )
+        update_interval = self._next_update_interval()
+        # Everything may differ from a snapshot saved before a restart
+        changed_parts = None if self.restored else snapshot.changes_since(self.data)
+        if changed_parts is not None and update_interval != self.update_interval:
+            # Shown by the network status sensor
+            changed_parts |= {CHARGER}
+        self._changed_parts = changed_parts
+        self.update_interval = update_interval
+        return snapshot
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners whose part of the snapshot changed.
+
+        Listeners registered without a context are always updated, as are all
+        listeners when the refresh failed or recovered.
+        """
+        changed_parts, self._changed_parts = self._changed_parts, None
+        notify_all = (
+            changed_parts is None
+            or not self.last_update_success
+            or self.last_update_success != self._notified_success
+        )
+        self._notified_success = self.last_update_success
+
+        writes = avoided = 0
+        for update_callback, context in list(self._listeners.values()):
+            if notify_all or context is None or context in changed_parts:
+                update_callback()
+                writes += 1
+            else:
+                avoided += 1
+
+        self.state_writes += writes
+        self.state_writes_avoided += avoided
+        self.last_state_writes_avoided = avoided
+        if avoided:
+            _LOGGER.debug(
+                f"Skipped {avoided} of {writes + avoided} state writes for "
+                f"'{self.charge_point_name}', changed: {sorted(map(str, changed_parts))}"
+            )
@@ -0,0 +1,89 @@
+"""Diagnostics support for evnex."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_ACCOUNT_COORDINATOR,
+    DATA_API_TELEMETRY,
+    DATA_CHARGE_POINT_COORDINATORS,
+    DATA_INSIGHTS_COORDINATOR,
+    DATA_RATE_LIMITER,
+    DOMAIN,
+)
+from .coordinator import EvnexChargePointCoordinator, EvnexDataUpdateCoordinator
+
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    "user_id",
+    "id_token",
+    "access_token",
+    "refresh_token",
+}
+
+
+def _coordinator_diagnostics(coordinator: EvnexDataUpdateCoordinator) -> dict:
+    diagnostics = {
+        "last_update_success": coordinator.last_update_success,
+        "last_refresh_duration": coordinator.last_refresh_duration,
+        "update_interval": coordinator.update_interval.total_seconds()
+        if coordinator.update_interval
+        else None,
+        "restored": coordinator.restored,
+    }
+    if isinstance(coordinator, EvnexChargePointCoordinator):
+        diagnostics["state_writes"] = coordinator.state_writes
+        diagnostics["state_writes_avoided"] = coordinator.state_writes_avoided
+    return diagnostics
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    hass_data = hass.data[DOMAIN][entry.entry_id]
+    account_coordinator: EvnexDataUpdateCoordinator = hass_data[
+        DATA_ACCOUNT_COORDINATOR
+    ]
+    evnex = account_coordinator.evnex
+    token_manager = account_coordinator.token_manager
+
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinators": {
+            "account": _coordinator_diagnostics(account_coordinator),
+            "insights": _coordinator_diagnostics(hass_data[DATA_INSIGHTS_COORDINATOR]),
+            "charge_points": {
+                charger_id: _coordinator_diagnostics(coordinator)
+                for charger_id, coordinator in hass_data[
+                    DATA_CHARGE_POINT_COORDINATORS
+                ].items()
+            },
+        },
+        "client": {
+            "responses_parsed": evnex.responses_parsed,
+            "responses_reused": evnex.responses_reused,
+            "token_expires_at": token_manager.expires_at,
+            "token_renewals": token_manager.renewals,
+        },
+    }
+    # Entries sharing another entry's account have no limiter or telemetry
+    if rate_limiter := hass_data.get(DATA_RATE_LIMITER):
+        diagnostics["rate_limiter"] = {
+            "queue_depth": rate_limiter.queue_depth,
+            "requests": rate_limiter.requests,
+            "queued_requests": rate_limiter.queued,
+            "throttled_requests": rate_limiter.throttled,
+            "paused_for": rate_limiter.paused_for,
+        }
+    if telemetry := hass_data.get(DATA_API_TELEMETRY):
+        diagnostics["api"] = telemetry.as_dict()
+    return diagnostics
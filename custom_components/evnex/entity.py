@@ -1,52 +1,79 @@
 import logging
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any
+
 from evnex.schema.charge_points import (
     EvnexChargePoint,
 )
 from evnex.schema.v3.charge_points import (
     EvnexChargePointConnector,
+    EvnexChargePointConnectorMeter,
     EvnexChargePointDetail,
+    EvnexChargePointSession,
 )
 from evnex.schema.org import EvnexOrgBrief
 
 from evnex.models import parse_model
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_platform
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, NAME
+from .const import (
+    DATA_ACCOUNT_COORDINATOR,
+    DATA_CHARGE_POINT_COORDINATORS,
+    DOMAIN,
+    NAME,
+    SIGNAL_TOPOLOGY_UPDATED,
+)
+from .coordinator import (
+    EvnexAccountCoordinator,
+    EvnexChargePointCoordinator,
+    EvnexOrgInsightsCoordinator,
+)
+from .ratelimit import command_priority
+from .snapshot import ChargePointSnapshot, connector_part
+from .topology import ChargerInfo, ConnectorInfo
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class EvnexOrgEntity(CoordinatorEntity):
+class EvnexOrgEntity(
+    CoordinatorEntity[EvnexAccountCoordinator | EvnexOrgInsightsCoordinator]
+):
     """Base Entity for an Evnex Org Sensor"""
 
     _attr_has_entity_name = True
 
     def __init__(
-        self, coordinator: DataUpdateCoordinator, org_id: str | None = None
+        self,
+        coordinator: EvnexAccountCoordinator | EvnexOrgInsightsCoordinator,
+        org_id: str | None = None,
     ) -> None:
         """Initialize an Evnex Org"""
         super().__init__(coordinator)
+        topology = (
+            coordinator.topology
+            if isinstance(coordinator, EvnexAccountCoordinator)
+            else coordinator.account_coordinator.topology
+        )
         if org_id is None:
-            # Ensure user and organisations data is present
-            if coordinator.data.get("user") and coordinator.data["user"].organisations:
-                org_id = coordinator.data["user"].organisations[0].id
+            # Default to the first org of the user
+            if topology.orgs:
+                org_id = next(iter(topology.orgs))
             else:
                 # Fallback or raise error if org_id cannot be determined,
                 raise ValueError("Cannot determine default evnex organization ID")
         self.org_id = org_id
-        if (
-            not coordinator.data
-            or not coordinator.data.get("org_briefs")
-            or self.org_id not in coordinator.data["org_briefs"]
-        ):
+        if self.org_id not in topology.orgs:
             _LOGGER.error(
-                f"Organization brief for ID {self.org_id} not found in coordinator data. Available org_briefs: {coordinator.data.get('org_briefs')}"
+                f"Organization brief for ID {self.org_id} not found in coordinator data. Available orgs: {list(topology.orgs)}"
             )
-        self.org_brief: EvnexOrgBrief = coordinator.data["org_briefs"][org_id]
+        self.org_brief: EvnexOrgBrief = topology.orgs[org_id].brief
 
         self.device_name = self.org_brief.name
         self.device_id = self.org_brief.id
@@ -64,55 +91,35 @@ class EvnexOrgEntity(CoordinatorEntity):
         )
 
 
-class EvnexChargerEntity(CoordinatorEntity):
+class EvnexChargerEntity(CoordinatorEntity[EvnexChargePointCoordinator]):
     """Base Entity for a specific evnex charger"""
 
     _attr_has_entity_name = True
+    # Part of the charge point snapshot this entity reads, None to be updated
+    # on every refresh
+    _snapshot_part: Hashable | None = None
+    # State shown until the charge point confirms a command, see
+    # _async_send_command()
+    _optimistic_state: Any = None
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
         key: str | None = None,
     ) -> None:
         """Initialize the ChargePoint entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=self._snapshot_part)
         self.org_id = org_id
-        if not coordinator.data or charger_id not in coordinator.data.get(
-            "charge_point_brief", {}
-        ):
+        charger = coordinator.account_coordinator.topology.chargers.get(charger_id)
+        if charger is None:
             _LOGGER.error(
                 f"Charge point brief for ID {charger_id} (org {org_id}) not found."
             )
             raise ValueError(f"Charge point brief for ID {charger_id} not found.")
-        self.charge_point_brief: EvnexChargePoint = coordinator.data[
-            "charge_point_brief"
-        ][charger_id]
-
-        self.connector_brief_by_id = {}
-        charge_point_detail_v3_data = coordinator.data.get(
-            "charge_point_details", {}
-        ).get(charger_id)
-        if charge_point_detail_v3_data and charge_point_detail_v3_data.connectors:
-            for connector_v3_brief in charge_point_detail_v3_data.connectors:
-                self.connector_brief_by_id[connector_v3_brief.connectorId] = (
-                    connector_v3_brief
-                )
-
-        self.charge_point_detail: EvnexChargePointDetail = coordinator.data[
-            "charge_point_details"
-        ][charger_id]
-
-        if charger_id not in coordinator.data.get("charge_point_sessions", {}):
-            _LOGGER.warning(
-                f"Charge point sessions for charger {charger_id} (org {org_id}) not found, defaulting to empty list."
-            )
-            self.charge_point_sessions = []
-        else:
-            self.charge_point_sessions = coordinator.data["charge_point_sessions"][
-                charger_id
-            ]
+        self.charger: ChargerInfo = charger
+        self.charge_point_brief: EvnexChargePoint = charger.brief
 
         self.device_name = self.charge_point_brief.name
         self.charger_id = charger_id
@@ -153,15 +160,60 @@ class EvnexChargerEntity(CoordinatorEntity):
             suggested_area="Garage",
         )
 
-    @property
-    def charger_status(self) -> EvnexChargePointDetail:
-        return self.coordinator.data.get("charge_point_details", {}).get(
-            self.charger_id
+    async def _async_send_command(
+        self,
+        command: Awaitable,
+        optimistic_state: Any,
+        confirmed: Callable[[ChargePointSnapshot], bool],
+    ) -> None:
+        """Send a command, showing optimistic_state until the charger confirms it.
+
+        The state reported by the charger is shown again if the command fails
+        or isn't confirmed in time.
+        """
+        self._optimistic_state = optimistic_state
+        self.async_write_ha_state()
+        try:
+            with command_priority():
+                await command
+        except Exception:
+            self._optimistic_state = None
+            self.async_write_ha_state()
+            raise
+        await self.coordinator.async_expect(
+            self.unique_id, confirmed, self._async_command_settled
         )
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Forget the command awaiting confirmation, the coordinator outlives us."""
+        await super().async_will_remove_from_hass()
+        self.coordinator.async_cancel_expectation(self.unique_id)
+        self._optimistic_state = None
+
+    @callback
+    def _async_command_settled(self, confirmed: bool) -> None:
+        if not confirmed:
+            _LOGGER.warning(
+                f"{self.entity_id} did not report the requested state in time, "
+                "showing the reported state"
+            )
+        self._optimistic_state = None
+        self.async_write_ha_state()
+
+    @property
+    def charger_status(self) -> EvnexChargePointDetail | None:
+        return self.coordinator.data.detail if self.coordinator.data else None
+
+    @property
+    def charge_point_sessions(self) -> list[EvnexChargePointSession]:
+        """Sessions of this charger, newest first."""
+        return self.coordinator.data.sessions if self.coordinator.data else []
+
     @property
     def technical_info(self) -> EvnexChargePoint:
-        return self.coordinator.data.get("charge_point_brief", {}).get(self.charger_id)
+        return self.coordinator.account_coordinator.data.charge_point_brief.get(
+            self.charger_id
+        )
 
 
 class EvnexChargePointConnectorEntity(EvnexChargerEntity):
@@ -171,7 +223,7 @@ class EvnexChargePointConnectorEntity(EvnexChargerEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
         connector_id: str = "1",
@@ -182,14 +234,108 @@ class EvnexChargePointConnectorEntity(EvnexChargerEntity):
         self._attr_translation_key = key
         self._attr_unique_id = f"{self.charger_id}_{connector_id}_{key}"
         self.connector_id = connector_id
+        if self._snapshot_part is None:
+            self.coordinator_context = connector_part(connector_id)
 
-        self.connector_brief: EvnexChargePointConnector | None = (
-            self.connector_brief_by_id.get(self.connector_id)
-        )
-
-        if not self.connector_brief:
+        self.connector: ConnectorInfo | None = self.charger.connectors.get(connector_id)
+        if self.connector is None:
             _LOGGER.warning(
-                f"Connector ID {self.connector_id} for charger {charger_id} (org {org_id}) not found "
-                f"in self.connector_brief_by_id. Available IDs: {list(self.connector_brief_by_id.keys())}. "
+                f"Connector ID {self.connector_id} for charger {charger_id} (org {org_id}) not found. "
+                f"Available IDs: {list(self.charger.connectors)}. "
                 f"Entity may be unavailable."
             )
+
+    @property
+    def connector_brief(self) -> EvnexChargePointConnector | None:
+        return self.coordinator.data.connectors.get(self.connector_id)
+
+    @property
+    def connector_meter(self) -> EvnexChargePointConnectorMeter | None:
+        return self.coordinator.data.meters.get(self.connector_id)
+
+
+@callback
+def async_setup_charger_entities(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    create_entities: Callable[
+        [EvnexChargePointCoordinator, ChargerInfo], Iterable[EvnexChargerEntity]
+    ],
+) -> list[EvnexChargerEntity]:
+    """Return the entities of the charge points in the topology, to be added.
+
+    create_entities(coordinator, charger) creates the entities of a platform
+    for a charge point and its connectors. When the topology of charge points
+    changes, the entities which appeared are added with async_add_entities.
+    Entities are only removed from Home Assistant and the entity registry
+    when their charge point or connector is gone, never because a capability
+    isn't in the topology any more.
+    """
+    hass_data = hass.data[DOMAIN][config_entry.entry_id]
+    account_coordinator = hass_data[DATA_ACCOUNT_COORDINATOR]
+    charge_point_coordinators = hass_data[DATA_CHARGE_POINT_COORDINATORS]
+    platform_domain = entity_platform.async_get_current_platform().domain
+    # Entities set up, by charge point and unique id
+    entities_by_charger: dict[str, dict[str, EvnexChargerEntity]] = {}
+
+    def charger_entities(charger: ChargerInfo) -> dict[str, EvnexChargerEntity]:
+        coordinator = charge_point_coordinators.get(charger.charger_id)
+        if coordinator is None:
+            # Provided by the entry of another account which polls the charger
+            return {}
+        return {
+            entity.unique_id: entity for entity in create_entities(coordinator, charger)
+        }
+
+    for charger_id, charger in account_coordinator.topology.chargers.items():
+        if entities := charger_entities(charger):
+            entities_by_charger[charger_id] = entities
+
+    def is_gone(entity: EvnexChargerEntity, charger: ChargerInfo | None) -> bool:
+        if charger is None:
+            return True
+        return (
+            isinstance(entity, EvnexChargePointConnectorEntity)
+            and entity.connector_id not in charger.connectors
+        )
+
+    @callback
+    def async_topology_updated(changed_charger_ids: set[str]) -> None:
+        topology = account_coordinator.topology
+        entity_registry = er.async_get(hass)
+        to_add: list[EvnexChargerEntity] = []
+        for charger_id in changed_charger_ids:
+            previous = entities_by_charger.pop(charger_id, {})
+            charger = topology.chargers.get(charger_id)
+            current = charger_entities(charger) if charger is not None else {}
+            kept: dict[str, EvnexChargerEntity] = {}
+            for unique_id, entity in previous.items():
+                if not is_gone(entity, charger):
+                    kept[unique_id] = entity
+                # Removing the registry entry removes the entity too
+                elif entity_id := entity_registry.async_get_entity_id(
+                    platform_domain, DOMAIN, unique_id
+                ):
+                    _LOGGER.debug(f"Removing {entity_id}, gone from the evnex account")
+                    entity_registry.async_remove(entity_id)
+            to_add.extend(
+                entity for unique_id, entity in current.items() if unique_id not in kept
+            )
+            if entities := {**current, **kept}:
+                entities_by_charger[charger_id] = entities
+        if to_add:
+            async_add_entities(to_add)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_TOPOLOGY_UPDATED.format(config_entry.entry_id),
+            async_topology_updated,
+        )
+    )
+    return [
+        entity
+        for entities in entities_by_charger.values()
+        for entity in entities.values()
+    ]
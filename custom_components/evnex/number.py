@@ -11,18 +11,21 @@ from homeassistant.components.number import (
     NumberEntityDescription,
     RestoreNumber,
 )
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DATA_UPDATED, DATA_CLIENT, DATA_COORDINATOR, DOMAIN
-from .entity import EvnexChargePointConnectorEntity
+from .const import (
+    DATA_ACCOUNT_COORDINATOR,
+    DATA_CLIENT,
+    DOMAIN,
+)
+from .coordinator import EvnexChargePointCoordinator
+from .entity import EvnexChargePointConnectorEntity, async_setup_charger_entities
+from .topology import ChargerInfo
+from .ratelimit import command_priority
 from evnex.api import Evnex
 from evnex.schema.charge_points import EvnexChargePointLoadSchedule
-from evnex.schema.v3.charge_points import (
-    EvnexChargePointDetail as EvnexChargePointDetailV3,
-)
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,6 +38,46 @@ class EvnexNumberDescription(NumberEntityDescription):
     initial_value: float | None = None
 
 
+def _charger_numbers(
+    evnex_api_client: Evnex,
+    coordinator: EvnexChargePointCoordinator,
+    charger: ChargerInfo,
+) -> list[NumberEntity]:
+    """Create the maximum current sliders of a charger's connectors."""
+    entities: list[NumberEntity] = []
+    charger_id = charger.charger_id
+    if not charger.connectors:
+        _LOGGER.debug(
+            f"No V3 connector details for charger {charger_id} in org {charger.org_id} for number entities."
+        )
+    for connector_id, connector in charger.connectors.items():
+        if connector.max_amperage is None:
+            _LOGGER.debug(
+                f"Max amperage not available for charger {charger_id} connector {connector_id}"
+            )
+            continue
+        description = EvnexNumberDescription(
+            key=f"connector_{connector_id}_maximum_current",  # Unique key
+            icon="mdi:speedometer",  # Changed icon
+            initial_value=float(connector.max_amperage),
+            native_min_value=0.0,  # Common minimum for EVSEs
+            native_max_value=float(connector.max_amperage),
+            native_step=1.0,
+            # mode=NumberMode.SLIDER, # Optional: if you want a slider
+        )
+        entities.append(
+            EvnexNumber(
+                evnex_api_client,
+                coordinator,
+                charger_id,
+                charger.org_id,
+                connector_id,
+                description,
+            )
+        )
+    return entities
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -42,61 +85,24 @@ async def async_setup_entry(
 ) -> None:
     """Set up the number sliders."""
 
-    entities = []
     evnex_api_client = hass.data[DOMAIN][config_entry.entry_id][DATA_CLIENT]
-    coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_COORDINATOR]
-    if not coordinator.data or not coordinator.data.get("user"):
+    account_coordinator = hass.data[DOMAIN][config_entry.entry_id][
+        DATA_ACCOUNT_COORDINATOR
+    ]
+    if not account_coordinator.data:
         _LOGGER.warning(
             "Number setup: Coordinator data or user data not available yet."
         )
         return
-    user_detail = coordinator.data["user"]
-    all_org_charge_points_data = coordinator.data.get("charge_points_by_org", {})
-
-    for org_brief in user_detail.organisations:
-        org_id = org_brief.id
-        charge_points_in_org = all_org_charge_points_data.get(org_id, [])
-
-        for charge_point_obj in charge_points_in_org:
-            charger_id = charge_point_obj.id
-            charge_point_detail_v3: EvnexChargePointDetailV3 | None = (
-                coordinator.data.get("charge_point_details", {}).get(charger_id)
-            )
-
-            if charge_point_detail_v3 and charge_point_detail_v3.connectors:
-                for connector_v3_brief in charge_point_detail_v3.connectors:
-                    connector_id = connector_v3_brief.connectorId
-                    # connector_v3_brief is the EvnexChargePointConnector object
-
-                    if connector_v3_brief.maxAmperage is not None:
-                        description = EvnexNumberDescription(
-                            key=f"connector_{connector_id}_maximum_current",  # Unique key
-                            icon="mdi:speedometer",  # Changed icon
-                            initial_value=float(connector_v3_brief.maxAmperage),
-                            native_min_value=0.0,  # Common minimum for EVSEs
-                            native_max_value=float(connector_v3_brief.maxAmperage),
-                            native_step=1.0,
-                            # mode=NumberMode.SLIDER, # Optional: if you want a slider
-                        )
-                        entities.append(
-                            EvnexNumber(
-                                evnex_api_client,
-                                coordinator,
-                                charger_id,
-                                org_id,
-                                connector_id,
-                                description,
-                            )
-                        )
-                    else:
-                        _LOGGER.debug(
-                            f"Max amperage not available for charger {charger_id} connector {connector_id}"
-                        )
-            else:
-                _LOGGER.debug(
-                    f"No V3 connector details for charger {charger_id} in org {org_id} for number entities."
-                )
 
+    entities = async_setup_charger_entities(
+        hass,
+        config_entry,
+        async_add_entities,
+        lambda coordinator, charger: _charger_numbers(
+            evnex_api_client, coordinator, charger
+        ),
+    )
     if entities:
         async_add_entities(entities)
 
@@ -134,21 +140,11 @@ class EvnexNumber(EvnexChargePointConnectorEntity, RestoreNumber, NumberEntity):
         await super().async_added_to_hass()
         if restored := await self.async_get_last_number_data():
             self._attr_native_value = restored.native_value
-        async_dispatcher_connect(
-            self.hass, DATA_UPDATED, self._schedule_immediate_update
-        )
-
-    @callback
-    def _schedule_immediate_update(self) -> None:
-        self.async_schedule_update_ha_state(True)
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        if (
-            not self.charge_point_brief
-            or self.charge_point_brief.networkStatus == "OFFLINE"
-        ):
+        if not self.charger_status or self.charger_status.networkStatus == "OFFLINE":
             return False
         return super().available
 
@@ -157,18 +153,28 @@ class EvnexNumber(EvnexChargePointConnectorEntity, RestoreNumber, NumberEntity):
         num_value = float(value)
         _LOGGER.info(f"Setting current to {num_value}A")
 
-        resp = await self.evnex.set_charger_load_profile(
-            self.charger_id,
-            charging_profile_periods=[{"limit": num_value, "start": 0}],
-            enabled=True,
-            duration=86400,
-            units="A",
-        )
-
-        if isinstance(resp, EvnexChargePointLoadSchedule):
-            self._attr_native_value = num_value
+        # The load profile isn't reported back by polling, so show the new
+        # value straight away and only revert it if the request fails.
+        previous_value = self._attr_native_value
+        self._attr_native_value = num_value
+        self.async_write_ha_state()
+        try:
+            with command_priority():
+                resp = await self.evnex.set_charger_load_profile(
+                    self.charger_id,
+                    charging_profile_periods=[{"limit": num_value, "start": 0}],
+                    enabled=True,
+                    duration=86400,
+                    units="A",
+                )
+        except Exception:
+            self._attr_native_value = previous_value
             self.async_write_ha_state()
-        else:
+            raise
+
+        if not isinstance(resp, EvnexChargePointLoadSchedule):
             _LOGGER.warning(f"Failed request: {resp}")
+            self._attr_native_value = previous_value
+            self.async_write_ha_state()
 
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_request_command_refresh()
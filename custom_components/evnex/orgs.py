@@ -0,0 +1,74 @@
+"""Persistence of the identifier each org's charge points are fetched by.
+
+Charge points are fetched by org id, but some orgs are only found by their
+slug. Which of the two works for an org is remembered here, across restarts,
+so the one that fails isn't tried on every refresh.
+"""
+
+import asyncio
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_ORG_IDENTIFIER_STORE,
+    DOMAIN,
+    ORG_IDENTIFIER_STORAGE_KEY,
+    ORG_IDENTIFIER_STORAGE_VERSION,
+)
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+ORG_ID = "id"
+ORG_SLUG = "slug"
+
+# Coalesce the identifiers found by several entries into a single write
+ORG_IDENTIFIER_SAVE_DELAY = 10
+
+
+class EvnexOrgIdentifierStore:
+    """Identifier that works for each org, ORG_ID or ORG_SLUG, keyed by org id."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, str]] = Store(
+            hass,
+            ORG_IDENTIFIER_STORAGE_VERSION,
+            ORG_IDENTIFIER_STORAGE_KEY,
+            atomic_writes=True,
+        )
+        self._identifiers: dict[str, str] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        async with self._load_lock:
+            if self._loaded:
+                return
+            if (stored := await self._store.async_load()) is not None:
+                self._identifiers = stored
+            self._loaded = True
+
+    def get(self, org_id: str) -> str:
+        """Return the identifier to try first for an org."""
+        return self._identifiers.get(org_id, ORG_ID)
+
+    @callback
+    def async_set(self, org_id: str, identifier: str) -> None:
+        """Schedule the identifier that worked for an org to be persisted."""
+        if self.get(org_id) == identifier:
+            return
+        _LOGGER.debug(f"Fetching the charge points of org {org_id} by {identifier}")
+        self._identifiers[org_id] = identifier
+        self._store.async_delay_save(
+            lambda: self._identifiers, ORG_IDENTIFIER_SAVE_DELAY
+        )
+
+
+@callback
+def async_get_org_identifier_store(hass: HomeAssistant) -> EvnexOrgIdentifierStore:
+    """Return the org identifier store shared by all evnex config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_ORG_IDENTIFIER_STORE not in domain_data:
+        domain_data[DATA_ORG_IDENTIFIER_STORE] = EvnexOrgIdentifierStore(hass)
+    return domain_data[DATA_ORG_IDENTIFIER_STORE]
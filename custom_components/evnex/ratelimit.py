@@ -0,0 +1,314 @@
+"""Rate limiting of the requests made to the Evnex API.
+
+Every Evnex client of an account sends its requests through a single
+RateLimitedTransport, so that the refresh loop, commands and several config
+entries for the same login share one request budget. Requests wait in
+priority order for a token from the account's EvnexRateLimiter, commands
+ahead of polling, and a 429 response pauses the whole account until its
+Retry-After has passed.
+
+The HTTP client of an account is closed once every config entry using it
+has been unloaded.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+
+import httpx
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.httpx_client import create_async_httpx_client
+from homeassistant.util.ssl import SSL_ALPN_HTTP11, client_context
+
+from .api import ConditionalRequestTransport
+from .const import DATA_RATE_LIMITED_CLIENTS, DOMAIN
+from .telemetry import ApiTelemetry, ApiTelemetryTransport
+from .trace import RecordingTransport, TraceRecorder
+
+_LOGGER = logging.getLogger(__name__)
+
+# Pause used when a 429 response has no usable Retry-After header, in seconds
+DEFAULT_RETRY_AFTER = 30
+# Longest pause honoured from a Retry-After header, in seconds
+MAX_RETRY_AFTER = 600
+
+
+class RequestPriority(IntEnum):
+    """Order in which queued requests are sent, lowest first."""
+
+    COMMAND = 0
+    POLL = 1
+
+
+_request_priority: ContextVar[RequestPriority] = ContextVar(
+    "evnex_request_priority", default=RequestPriority.POLL
+)
+
+
+@contextlib.contextmanager
+def command_priority() -> Iterator[None]:
+    """Send the API requests made within this block ahead of polling."""
+    token = _request_priority.set(RequestPriority.COMMAND)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Seconds to wait before the next request, from a 429 response."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return DEFAULT_RETRY_AFTER
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class EvnexRateLimiter:
+    """Token bucket shared by the API requests of one account.
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens per
+    second. A request takes a token, or queues until one is available; queued
+    requests are released by priority, then in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+        # Counters
+        self.requests = 0
+        self.queued = 0
+        self.throttled = 0
+
+    @callback
+    def configure(self, rate: float, burst: int) -> None:
+        """Change the budget, e.g. after the options of an entry changed."""
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.burst = burst
+        self._tokens = min(self._tokens, burst)
+        self._release()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a token."""
+        return sum(not future.done() for _, _, future in self._queue)
+
+    @property
+    def queue_depth_by_priority(self) -> dict[str, int]:
+        depths = {priority.name.lower(): 0 for priority in RequestPriority}
+        for priority, _, future in self._queue:
+            if not future.done():
+                depths[RequestPriority(priority).name.lower()] += 1
+        return depths
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds left before requests are sent again after a 429 response."""
+        return max(self._paused_until - time.monotonic(), 0.0)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self, now: float) -> bool:
+        if now < self._paused_until:
+            return False
+        self._refill(now)
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def acquire(self, priority: RequestPriority) -> None:
+        """Wait until a request of the given priority may be sent."""
+        self.requests += 1
+        if not self.queue_depth and self._try_take(time.monotonic()):
+            return
+
+        self.queued += 1
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), future))
+        self._schedule_wakeup()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The token was handed over as we were cancelled, pass it on
+                self._tokens += 1
+                self._release()
+            raise
+
+    @callback
+    def throttle(self, retry_after: float) -> None:
+        """Hold every request back for retry_after seconds."""
+        self.throttled += 1
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + retry_after)
+        self._tokens = 0.0
+        self._updated = now
+        _LOGGER.warning(
+            f"Evnex API rate limit reached, pausing requests for {retry_after:.0f}s"
+        )
+        self._schedule_wakeup()
+
+    @callback
+    def _release(self) -> None:
+        """Hand tokens to queued requests, highest priority first."""
+        now = time.monotonic()
+        while self._queue:
+            _, _, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if not self._try_take(now):
+                break
+            heapq.heappop(self._queue)
+            future.set_result(None)
+        self._schedule_wakeup()
+
+    @callback
+    def _schedule_wakeup(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        if not self._queue:
+            return
+        now = time.monotonic()
+        if now < self._paused_until:
+            delay = self._paused_until - now
+        else:
+            self._refill(now)
+            delay = max((1 - self._tokens) / self.rate, 0.0)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """HTTP transport which sends every request through an EvnexRateLimiter."""
+
+    def __init__(
+        self, limiter: EvnexRateLimiter, transport: httpx.AsyncBaseTransport
+    ) -> None:
+        self.limiter = limiter
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire(_request_priority.get())
+        response = await self._transport.handle_async_request(request)
+        if response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+            self.limiter.throttle(_retry_after(response))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+@dataclass
+class EvnexHttpClient:
+    """HTTP client of an account, and the layers of its transport."""
+
+    client: httpx.AsyncClient
+    limiter: EvnexRateLimiter
+    telemetry: ApiTelemetry
+    recorder: TraceRecorder
+    transport: httpx.AsyncBaseTransport
+    # Request budget (rate, burst) of each entry using the client, in the
+    # order they got it; the first one owns the client and sets the budget
+    budgets: dict[str, tuple[float, int]] = field(default_factory=dict)
+
+    @callback
+    def _async_apply_owner_budget(self) -> None:
+        if self.budgets:
+            self.limiter.configure(*next(iter(self.budgets.values())))
+
+
+@callback
+def async_create_rate_limited_client(
+    hass: HomeAssistant,
+    account: str,
+    rate: float,
+    burst: int,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> EvnexHttpClient:
+    """Create the HTTP client of an account, for its entries to use.
+
+    transport replaces the network, e.g. with a ReplayTransport.
+    """
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(
+            verify=client_context(alpn_protocols=SSL_ALPN_HTTP11)
+        )
+    limiter = EvnexRateLimiter(rate, burst)
+    telemetry = ApiTelemetry()
+    recorder = TraceRecorder()
+    transport = RateLimitedTransport(
+        limiter,
+        ConditionalRequestTransport(
+            ApiTelemetryTransport(telemetry, RecordingTransport(recorder, transport))
+        ),
+    )
+    client = create_async_httpx_client(hass, transport=transport)
+    http_client = EvnexHttpClient(client, limiter, telemetry, recorder, transport)
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_RATE_LIMITED_CLIENTS, {})[
+        account.casefold()
+    ] = http_client
+    return http_client
+
+
+@callback
+def async_get_rate_limited_client(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    account: str,
+    rate: float,
+    burst: int,
+) -> EvnexHttpClient:
+    """Return the HTTP client shared by an account's entries.
+
+    The budget of the entry which owns the client, the first to get it,
+    applies to the whole account. The client is closed when the last entry
+    using it is unloaded.
+    """
+    clients = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_RATE_LIMITED_CLIENTS, {})
+    key = account.casefold()
+    http_client: EvnexHttpClient | None = clients.get(key)
+    if http_client is None:
+        http_client = async_create_rate_limited_client(hass, account, rate, burst)
+    http_client.budgets[entry.entry_id] = (rate, burst)
+    http_client._async_apply_owner_budget()
+
+    async def async_release() -> None:
+        http_client.budgets.pop(entry.entry_id, None)
+        if http_client.budgets:
+            http_client._async_apply_owner_budget()
+            return
+        if clients.get(key) is http_client:
+            del clients[key]
+        # Home Assistant only lets the client itself be closed at shutdown,
+        # closing its transport releases the connections
+        await http_client.transport.aclose()
+
+    entry.async_on_unload(async_release)
+    return http_client
@@ -0,0 +1,106 @@
+"""Pollers shared between config entries which overlap.
+
+The same Evnex account can be added more than once, and the users of
+different accounts can share an org. Rather than each config entry polling
+everything it can see, pollers are registered here under what they poll:
+
+- ACCOUNT: the account pipeline (client, account and insights coordinators)
+  of a user id,
+- ORG: the insights coordinator polling an org,
+- CHARGE_POINT: the coordinator polling a charge point.
+
+The first entry to register a poller owns it and provides its entities,
+later entries subscribe to it instead of polling the same data again. A
+shared poller is tied to its owner's config entry, so when the owner is
+unloaded, or stops polling a charge point which left its account, its
+subscribers are reloaded to take over.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_POLLER_REGISTRY, DOMAIN
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+ACCOUNT = "account"
+ORG = "org"
+CHARGE_POINT = "charge_point"
+
+
+@dataclass
+class _Registration:
+    poller: Any
+    owner: str
+    subscribers: set[str] = field(default_factory=set)
+
+
+class EvnexPollerRegistry:
+    """Pollers of every evnex config entry, by kind and id."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._registrations: dict[tuple[str, str], _Registration] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    def lock(self, kind: str, key: str) -> asyncio.Lock:
+        """Lock to hold while looking up and registering a poller."""
+        return self._locks.setdefault((kind, key), asyncio.Lock())
+
+    @callback
+    def async_subscribe(self, kind: str, key: str, entry_id: str) -> Any | None:
+        """Return the poller registered by another entry, None if there is none."""
+        registration = self._registrations.get((kind, key))
+        if registration is None or registration.owner == entry_id:
+            return None
+        _LOGGER.debug(
+            f"Entry {entry_id} shares the {kind} poller of {key} "
+            f"with entry {registration.owner}"
+        )
+        registration.subscribers.add(entry_id)
+        return registration.poller
+
+    @callback
+    def async_register(self, kind: str, key: str, entry_id: str, poller: Any) -> None:
+        self._registrations[(kind, key)] = _Registration(poller, entry_id)
+
+    @callback
+    def async_unregister(self, kind: str, key: str, entry_id: str) -> None:
+        """Forget a poller an entry no longer polls, reloading its subscribers."""
+        registration = self._registrations.get((kind, key))
+        if registration is None or registration.owner != entry_id:
+            return
+        del self._registrations[(kind, key)]
+        self._async_reload(registration.subscribers)
+
+    @callback
+    def async_release(self, entry_id: str) -> None:
+        """Forget an entry's pollers and subscriptions, reloading its subscribers."""
+        to_reload: set[str] = set()
+        for key, registration in list(self._registrations.items()):
+            registration.subscribers.discard(entry_id)
+            if registration.owner == entry_id:
+                del self._registrations[key]
+                to_reload |= registration.subscribers
+        self._async_reload(to_reload)
+
+    @callback
+    def _async_reload(self, to_reload: set[str]) -> None:
+        if self.hass.is_stopping:
+            return
+        for subscriber in to_reload:
+            _LOGGER.debug(f"Reloading entry {subscriber} to take over shared pollers")
+            self.hass.config_entries.async_schedule_reload(subscriber)
+
+
+@callback
+def async_get_poller_registry(hass: HomeAssistant) -> EvnexPollerRegistry:
+    """Return the poller registry shared by all evnex config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_POLLER_REGISTRY not in domain_data:
+        domain_data[DATA_POLLER_REGISTRY] = EvnexPollerRegistry(hass)
+    return domain_data[DATA_POLLER_REGISTRY]
@@ -0,0 +1,162 @@
+"""Persistence of the last coordinator data, for a warm start.
+
+The account, insights and charge point snapshots of a config entry are saved
+(with a delay, so at most every SNAPSHOT_SAVE_DELAY seconds) whenever a
+refresh succeeds. On the next start the entry's entities are set up from
+them straight away, and the first live refresh runs in the background.
+"""
+
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from evnex.schema.charge_points import EvnexChargePoint, EvnexChargePointOverrideConfig
+from evnex.schema.org import EvnexOrgInsightEntry
+from evnex.schema.user import EvnexUserDetail
+from evnex.schema.v3.charge_points import (
+    EvnexChargePointDetail,
+    EvnexChargePointSession,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from pydantic import BaseModel, ValidationError
+
+from .const import SNAPSHOT_STORAGE_KEY, SNAPSHOT_STORAGE_VERSION
+from .snapshot import AccountSnapshot, ChargePointSnapshot, OrgInsightsSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to wait after a refresh before saving, coalescing refreshes
+SNAPSHOT_SAVE_DELAY = 300
+# Number of sessions saved per charge point, newest first
+RESTORED_SESSIONS = 10
+
+
+@dataclass
+class RestoredData:
+    """Snapshots of a config entry as last saved."""
+
+    account: AccountSnapshot
+    insights: OrgInsightsSnapshot
+    charge_points: dict[str, ChargePointSnapshot]
+
+
+def _dump(model: BaseModel | None) -> dict | None:
+    if model is None:
+        return None
+    # Fields left unset default to None even where None isn't valid, e.g. the
+    # cost of an EvnexCost sent with an amount, so they can't be saved as null
+    return model.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def _serialize(
+    account: AccountSnapshot,
+    insights: OrgInsightsSnapshot | None,
+    charge_points: Mapping[str, ChargePointSnapshot],
+) -> dict:
+    return {
+        "account": {
+            "user": _dump(account.user),
+            "charge_points_by_org": {
+                org_id: [_dump(charge_point) for charge_point in charge_points]
+                for org_id, charge_points in account.charge_points_by_org.items()
+            },
+        },
+        "insights": {
+            org_id: [_dump(entry) for entry in entries]
+            for org_id, entries in (insights.org_insights if insights else {}).items()
+        },
+        "charge_points": {
+            charger_id: {
+                "detail": _dump(snapshot.detail),
+                "override": _dump(snapshot.override),
+                "sessions": [
+                    _dump(session) for session in snapshot.sessions[:RESTORED_SESSIONS]
+                ],
+            }
+            for charger_id, snapshot in charge_points.items()
+        },
+    }
+
+
+def _deserialize(data: dict) -> RestoredData:
+    account = data["account"]
+    return RestoredData(
+        account=AccountSnapshot(
+            EvnexUserDetail.model_validate(account["user"]),
+            charge_points_by_org={
+                org_id: [
+                    EvnexChargePoint.model_validate(charge_point)
+                    for charge_point in charge_points
+                ]
+                for org_id, charge_points in account["charge_points_by_org"].items()
+            },
+        ),
+        insights=OrgInsightsSnapshot(
+            {
+                org_id: [
+                    EvnexOrgInsightEntry.model_validate(entry) for entry in entries
+                ]
+                for org_id, entries in data["insights"].items()
+            }
+        ),
+        charge_points={
+            charger_id: ChargePointSnapshot(
+                charger_id,
+                EvnexChargePointDetail.model_validate(charge_point["detail"]),
+                EvnexChargePointOverrideConfig.model_validate(charge_point["override"])
+                if charge_point["override"] is not None
+                else None,
+                [
+                    EvnexChargePointSession.model_validate(session)
+                    for session in charge_point["sessions"]
+                ],
+            )
+            for charger_id, charge_point in data["charge_points"].items()
+        },
+    )
+
+
+class EvnexSnapshotStore:
+    """Last good snapshots of a single config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        # Serializing the snapshots is left to the executor
+        self._store: Store[dict] = Store(
+            hass,
+            SNAPSHOT_STORAGE_VERSION,
+            f"{SNAPSHOT_STORAGE_KEY}.{entry_id}",
+            atomic_writes=True,
+            serialize_in_event_loop=False,
+        )
+
+    async def async_load(self) -> RestoredData | None:
+        """Return the saved snapshots, None if there are none usable."""
+        if (data := await self._store.async_load()) is None:
+            return None
+        try:
+            return _deserialize(data)
+        except (KeyError, TypeError, ValidationError) as err:
+            _LOGGER.warning(f"Ignoring the saved evnex data, it can't be read: {err}")
+            return None
+
+    @callback
+    def async_schedule_save(
+        self,
+        account: AccountSnapshot,
+        insights: OrgInsightsSnapshot | None,
+        charge_points: Mapping[str, ChargePointSnapshot],
+    ) -> None:
+        """Save the snapshots after a delay.
+
+        The snapshots are taken now, on the event loop, as the coordinators
+        replace them meanwhile; only serializing them is left to the executor.
+        """
+        charge_points = dict(charge_points)
+        self._store.async_delay_save(
+            lambda: _serialize(account, insights, charge_points),
+            SNAPSHOT_SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
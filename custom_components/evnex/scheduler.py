@@ -0,0 +1,70 @@
+"""Adaptive polling intervals for evnex charge points."""
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
+from evnex.schema.v3.charge_points import EvnexChargePointDetail
+
+from .const import CHARGER_SESSION_READY_STATES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ChargePointPollState:
+    """Polling state of a single charge point."""
+
+    interval: timedelta
+    offline_polls: int = 0
+
+
+class ChargePointPollScheduler:
+    """Pick a polling interval for each charge point from its reported state.
+
+    - Charge points with a connector in one of the CHARGER_SESSION_READY_STATES
+      are polled at the active interval.
+    - Online charge points without an active session are polled at the idle
+      interval.
+    - Offline charge points back off exponentially from the idle interval up
+      to the offline maximum.
+    """
+
+    def __init__(
+        self,
+        active_interval: timedelta,
+        idle_interval: timedelta,
+        offline_max_interval: timedelta,
+    ) -> None:
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.offline_max_interval = max(offline_max_interval, idle_interval)
+        self._states: dict[str, ChargePointPollState] = {}
+
+    def record_poll(self, charger_id: str, detail: EvnexChargePointDetail) -> timedelta:
+        """Record a completed poll and return the interval until the next one."""
+        state = self._states.setdefault(
+            charger_id, ChargePointPollState(interval=self.idle_interval)
+        )
+
+        if detail.networkStatus != "ONLINE":
+            state.offline_polls += 1
+            state.interval = min(
+                self.idle_interval * 2 ** (state.offline_polls - 1),
+                self.offline_max_interval,
+            )
+        else:
+            state.offline_polls = 0
+            if any(
+                connector.ocppStatus in CHARGER_SESSION_READY_STATES
+                for connector in detail.connectors
+            ):
+                state.interval = self.active_interval
+            else:
+                state.interval = self.idle_interval
+
+        _LOGGER.debug(
+            f"Next poll of charge point {charger_id} in {state.interval} "
+            f"({detail.networkStatus})"
+        )
+        return state.interval
@@ -3,8 +3,6 @@
 import datetime
 import logging
 
-from evnex.schema.v3.charge_points import EvnexChargePointSession
-
 from homeassistant.const import UnitOfElectricCurrent, UnitOfTemperature
 
 from homeassistant.components.sensor import (
@@ -15,23 +13,47 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    EntityCategory,
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfPower,
     UnitOfFrequency,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
-from .entity import EvnexChargePointConnectorEntity, EvnexOrgEntity, EvnexChargerEntity
-from .const import DATA_COORDINATOR, DOMAIN
+from .entity import (
+    EvnexChargePointConnectorEntity,
+    EvnexChargerEntity,
+    EvnexOrgEntity,
+    async_setup_charger_entities,
+)
+from .const import (
+    DATA_ACCOUNT_COORDINATOR,
+    DATA_API_TELEMETRY,
+    DATA_INSIGHTS_COORDINATOR,
+    DATA_ORG_IDS,
+    DATA_RATE_LIMITER,
+    DOMAIN,
+)
+from .coordinator import (
+    EvnexAccountCoordinator,
+    EvnexChargePointCoordinator,
+    EvnexOrgInsightsCoordinator,
+)
+from .ratelimit import EvnexRateLimiter
+from .telemetry import ApiTelemetry
+from .snapshot import CHARGER, SESSIONS
+from .topology import ChargerInfo
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# How often the rate limiter and API telemetry sensors write their state
+API_SENSOR_UPDATE_INTERVAL = datetime.timedelta(seconds=30)
+
 MAX_SESSIONS_IN_ATTRIBUTES = 10  # Configurable: Number of recent sessions to store
 
 
@@ -46,7 +68,7 @@ class EvnexOrgWidePowerUsageSensorToday(EvnexOrgEntity, SensorEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexOrgInsightsCoordinator,
         org_id: str,
     ) -> None:
         """Initialize the current sensor."""
@@ -58,16 +80,14 @@ class EvnexOrgWidePowerUsageSensorToday(EvnexOrgEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        org_insights = self.coordinator.data.get("org_insights", {}).get(self.org_id)
-        if org_insights and len(org_insights) > 0:
-            return org_insights[-1].powerUsage
+        if today := self.coordinator.data.today.get(self.org_id):
+            return today.powerUsage
         return None
 
     @property
     def last_reset(self):
-        org_insights = self.coordinator.data.get("org_insights", {}).get(self.org_id)
-        if org_insights and len(org_insights) > 0:
-            return org_insights[-1].startDate
+        if today := self.coordinator.data.today.get(self.org_id):
+            return today.startDate
         return None
 
 
@@ -80,7 +100,7 @@ class EvnexOrgWideChargeSessionsCountSensor(EvnexOrgEntity, SensorEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexOrgInsightsCoordinator,
         org_id: str,
     ) -> None:
         """Initialize the current sensor."""
@@ -92,14 +112,15 @@ class EvnexOrgWideChargeSessionsCountSensor(EvnexOrgEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        org_insights = self.coordinator.data.get("org_insights", {}).get(self.org_id)
-        if org_insights and len(org_insights) > 0:
-            return org_insights[-1].sessions
+        if today := self.coordinator.data.today.get(self.org_id):
+            return today.sessions
         return None
 
     @property
     def last_reset(self):
-        return self.coordinator.data["org_insights"][self.org_id][-1].startDate
+        if today := self.coordinator.data.today.get(self.org_id):
+            return today.startDate
+        return None
 
 
 class EvnexOrgTierSensor(EvnexOrgEntity, SensorEntity):
@@ -109,7 +130,7 @@ class EvnexOrgTierSensor(EvnexOrgEntity, SensorEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexAccountCoordinator,
         org_id: str,
     ) -> None:
         """Initialize the current sensor."""
@@ -126,14 +147,111 @@ class EvnexOrgTierSensor(EvnexOrgEntity, SensorEntity):
         return None
 
 
+class EvnexApiRateLimiterSensor(EvnexOrgEntity, SensorEntity):
+    """Base of the sensors showing the account's rate limiter and telemetry.
+
+    Neither is a coordinator, so these sensors write their state every
+    API_SENSOR_UPDATE_INTERVAL as well as when the account is refreshed.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: EvnexAccountCoordinator,
+        limiter: EvnexRateLimiter,
+        telemetry: ApiTelemetry,
+    ) -> None:
+        super().__init__(coordinator=coordinator)
+        self.limiter = limiter
+        self.telemetry = telemetry
+        # One limiter per account, whichever org its device is
+        self._attr_unique_id = (
+            f"{coordinator.data.user.id}_{self.entity_description.key}"
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_interval_update, API_SENSOR_UPDATE_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_interval_update(self, _now: datetime.datetime) -> None:
+        self.async_write_ha_state()
+
+
+class EvnexApiRequestQueueSensor(EvnexApiRateLimiterSensor):
+    entity_description = SensorEntityDescription(
+        key="api_request_queue",
+        state_class=SensorStateClass.MEASUREMENT,
+    )
+
+    @property
+    def native_value(self) -> int:
+        return self.limiter.queue_depth
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            **self.limiter.queue_depth_by_priority,
+            "requests": self.limiter.requests,
+            "queued_requests": self.limiter.queued,
+            "paused_for": round(self.limiter.paused_for),
+        }
+
+
+class EvnexApiThrottledRequestsSensor(EvnexApiRateLimiterSensor):
+    entity_description = SensorEntityDescription(
+        key="api_throttled_requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    )
+
+    @property
+    def native_value(self) -> int:
+        return self.limiter.throttled
+
+
+class EvnexApiCallsSensor(EvnexApiRateLimiterSensor):
+    entity_description = SensorEntityDescription(
+        key="api_calls_per_hour",
+        native_unit_of_measurement="calls/h",
+        state_class=SensorStateClass.MEASUREMENT,
+    )
+
+    @property
+    def native_value(self) -> int:
+        return self.telemetry.calls_last_hour
+
+    @property
+    def extra_state_attributes(self):
+        total = self.telemetry.total
+        evnex = self.coordinator.evnex
+        return {
+            "calls": total.calls,
+            "errors": total.errors,
+            "timeouts": total.timeouts,
+            "not_modified": total.not_modified,
+            "bytes_received": total.bytes_received,
+            "latency_mean": round(total.latency_mean, 3)
+            if total.latency_mean is not None
+            else None,
+            "responses_parsed": evnex.responses_parsed,
+            "responses_reused": evnex.responses_reused,
+        }
+
+
 class EvnexChargerNetworkStatusSensor(EvnexChargerEntity, SensorEntity):
+    _snapshot_part = CHARGER
     entity_description = SensorEntityDescription(
         key="charger_network_status",
     )
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
     ) -> None:
@@ -147,12 +265,64 @@ class EvnexChargerNetworkStatusSensor(EvnexChargerEntity, SensorEntity):
 
     @property
     def native_value(self):
-        if self.charge_point_brief:
-            return str.lower(self.charge_point_brief.networkStatus)
+        if self.charger_status:
+            return str.lower(self.charger_status.networkStatus)
         return None
 
+    @property
+    def extra_state_attributes(self):
+        """Expose the chosen polling interval, and if the data predates a restart."""
+        interval = self.coordinator.update_interval
+        return {
+            "poll_interval": interval.total_seconds() if interval else None,
+            "restored": self.coordinator.restored,
+        }
+
+
+class EvnexChargerRefreshDurationSensor(EvnexChargerEntity, SensorEntity):
+    entity_description = SensorEntityDescription(
+        key="charger_last_refresh_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    )
+
+    def __init__(
+        self,
+        coordinator: EvnexChargePointCoordinator,
+        charger_id: str,
+        org_id: str,
+        telemetry: ApiTelemetry,
+    ) -> None:
+        super().__init__(
+            coordinator=coordinator,
+            charger_id=charger_id,
+            org_id=org_id,
+            key=self.entity_description.key,
+        )
+        self.telemetry = telemetry
+
+    @property
+    def native_value(self) -> float | None:
+        return self.coordinator.last_refresh_duration
+
+    @property
+    def extra_state_attributes(self):
+        """Expose the charger's API requests and the state writes avoided."""
+        stats = self.telemetry.charge_points.get(self.charger_id)
+        return {
+            "api_calls": stats.calls if stats else 0,
+            "api_errors": stats.errors if stats else 0,
+            "api_timeouts": stats.timeouts if stats else 0,
+            "state_writes": self.coordinator.state_writes,
+            "state_writes_avoided": self.coordinator.state_writes_avoided,
+        }
+
 
 class EvnexChargerSessionEnergy(EvnexChargerEntity, SensorEntity):
+    _snapshot_part = SESSIONS
     entity_description = SensorEntityDescription(
         key="session_energy",
         device_class=SensorDeviceClass.ENERGY,
@@ -163,7 +333,7 @@ class EvnexChargerSessionEnergy(EvnexChargerEntity, SensorEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
     ) -> None:
@@ -177,11 +347,8 @@ class EvnexChargerSessionEnergy(EvnexChargerEntity, SensorEntity):
 
     @property
     def native_value(self):
-        sessions = self.coordinator.data.get("charge_point_sessions", {}).get(
-            self.charger_id
-        )
-        if sessions and len(sessions) > 0:
-            latest_session: EvnexChargePointSession = sessions[0]
+        latest_session = self.coordinator.data.latest_session
+        if latest_session is not None:
             if (
                 latest_session.attributes and latest_session.attributes.endDate is None
             ):  # Active session
@@ -191,6 +358,7 @@ class EvnexChargerSessionEnergy(EvnexChargerEntity, SensorEntity):
 
 
 class EvnexChargerSessionCost(EvnexChargerEntity, SensorEntity):
+    _snapshot_part = SESSIONS
     entity_description = SensorEntityDescription(
         key="session_cost",
         state_class=SensorStateClass.TOTAL,
@@ -199,7 +367,7 @@ class EvnexChargerSessionCost(EvnexChargerEntity, SensorEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
     ) -> None:
@@ -213,11 +381,8 @@ class EvnexChargerSessionCost(EvnexChargerEntity, SensorEntity):
 
     @property
     def native_value(self):
-        sessions = self.coordinator.data.get("charge_point_sessions", {}).get(
-            self.charger_id
-        )
-        if sessions and len(sessions) > 0:
-            latest_session: EvnexChargePointSession = sessions[0]
+        latest_session = self.coordinator.data.latest_session
+        if latest_session is not None:
             if (
                 latest_session.attributes and latest_session.attributes.endDate is None
             ):  # Active session
@@ -230,6 +395,8 @@ class EvnexChargerSessionCost(EvnexChargerEntity, SensorEntity):
 
 
 class EvnexChargerSessionTime(EvnexChargerEntity, SensorEntity):
+    # Counts up with the clock during a session, update on every refresh
+    _snapshot_part = None
     entity_description = SensorEntityDescription(
         key="session_time",
         native_unit_of_measurement=UnitOfTime.SECONDS,
@@ -238,7 +405,7 @@ class EvnexChargerSessionTime(EvnexChargerEntity, SensorEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
     ) -> None:
@@ -252,11 +419,8 @@ class EvnexChargerSessionTime(EvnexChargerEntity, SensorEntity):
 
     @property
     def native_value(self):
-        sessions = self.coordinator.data.get("charge_point_sessions", {}).get(
-            self.charger_id
-        )
-        if sessions and len(sessions) > 0:
-            latest_session: EvnexChargePointSession = sessions[0]
+        latest_session = self.coordinator.data.latest_session
+        if latest_session is not None:
             if latest_session.attributes and latest_session.attributes.startDate:
                 start_date = latest_session.attributes.startDate
                 if latest_session.attributes.endDate is None:
@@ -275,6 +439,7 @@ class EvnexChargerSessionTime(EvnexChargerEntity, SensorEntity):
 
 
 class EvnexChargerLastSessionStartTime(EvnexChargerEntity, SensorEntity):
+    _snapshot_part = SESSIONS
     entity_description = SensorEntityDescription(
         key="session_start_time",
         device_class=SensorDeviceClass.TIMESTAMP,
@@ -287,11 +452,8 @@ class EvnexChargerLastSessionStartTime(EvnexChargerEntity, SensorEntity):
 
     @property
     def native_value(self):
-        sessions = self.coordinator.data.get("charge_point_sessions", {}).get(
-            self.charger_id
-        )
-        if sessions and len(sessions) > 0:
-            latest_session: EvnexChargePointSession = sessions[0]
+        latest_session = self.coordinator.data.latest_session
+        if latest_session is not None:
             if latest_session.attributes and latest_session.attributes.startDate:
                 return latest_session.attributes.startDate
         return None
@@ -300,6 +462,9 @@ class EvnexChargerLastSessionStartTime(EvnexChargerEntity, SensorEntity):
 class EvnexChargerSessionHistorySensor(EvnexChargerEntity, SensorEntity):
     """Sensor to expose recent charging session history."""
 
+    # The active session's duration counts up, update on every refresh
+    _snapshot_part = None
+
     entity_description = SensorEntityDescription(
         key="charger_session_history",
     )
@@ -326,8 +491,8 @@ class EvnexChargerSessionHistorySensor(EvnexChargerEntity, SensorEntity):
 
     def _get_formatted_sessions(self) -> list[dict]:
         """Helper to get and format recent sessions."""
-        # self.charge_point_sessions is already available from EvnexChargerEntity,
-        # populated with List[EvnexChargePointSession]
+        # self.charge_point_sessions is available from EvnexChargerEntity,
+        # a List[EvnexChargePointSession] newest first
 
         if not self.charge_point_sessions:
             return []
@@ -396,11 +561,8 @@ class EvnexChargePortConnectorStatusSensor(
 
     @property
     def native_value(self):
-        self.connector_brief = self.coordinator.data.get("connector_brief").get(
-            (self.charger_id, self.connector_id)
-        )
-        if self.connector_brief:
-            return str.lower(self.connector_brief.ocppStatus)
+        if connector_brief := self.connector_brief:
+            return str.lower(connector_brief.ocppStatus)
         return None
 
     @property
@@ -455,13 +617,8 @@ class EvnexChargePortConnectorVoltageSensor(
 
     @property
     def native_value(self):
-        self.connector_brief = self.coordinator.data.get("connector_brief").get(
-            (self.charger_id, self.connector_id)
-        )
-        if self.connector_brief and self.connector_brief.meter:
-            return getattr(
-                self.connector_brief.meter, f"voltage{str.capitalize(self.line)}N"
-            )
+        if meter := self.connector_meter:
+            return getattr(meter, f"voltage{str.capitalize(self.line)}N")
         return None
 
 
@@ -477,7 +634,7 @@ class EvnexChargePortConnectorCurrentSensor(
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
         connector_id: str = "1",
@@ -495,13 +652,8 @@ class EvnexChargePortConnectorCurrentSensor(
 
     @property
     def native_value(self):
-        self.connector_brief = self.coordinator.data.get("connector_brief").get(
-            (self.charger_id, self.connector_id)
-        )
-        if self.connector_brief and self.connector_brief.meter:
-            return getattr(
-                self.connector_brief.meter, f"current{str.capitalize(self.line)}"
-            )
+        if meter := self.connector_meter:
+            return getattr(meter, f"current{str.capitalize(self.line)}")
         return None
 
 
@@ -517,7 +669,7 @@ class EvnexChargePortConnectorPowerSensor(
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
         connector_id: str = "1",
@@ -533,15 +685,9 @@ class EvnexChargePortConnectorPowerSensor(
 
     @property
     def native_value(self):
-        self.connector_brief = self.coordinator.data.get("connector_brief").get(
-            (self.charger_id, self.connector_id)
-        )
-        if (
-            self.connector_brief
-            and self.connector_brief.meter
-            and self.connector_brief.meter.power is not None
-        ):
-            return self.connector_brief.meter.power / 1000
+        meter = self.connector_meter
+        if meter and meter.power is not None:
+            return meter.power / 1000
         return None
 
 
@@ -557,7 +703,7 @@ class EvnexChargePortConnectorFrequencySensor(
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
         connector_id: str = "1",
@@ -573,11 +719,8 @@ class EvnexChargePortConnectorFrequencySensor(
 
     @property
     def native_value(self):
-        self.connector_brief = self.coordinator.data.get("connector_brief").get(
-            (self.charger_id, self.connector_id)
-        )
-        if self.connector_brief and self.connector_brief.meter:
-            return self.connector_brief.meter.frequency
+        if meter := self.connector_meter:
+            return meter.frequency
         return None
 
 
@@ -593,7 +736,7 @@ class EvnexChargePortConnectorTemperatureSensor(
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EvnexChargePointCoordinator,
         charger_id: str,
         org_id: str,
         connector_id: str = "1",
@@ -609,18 +752,74 @@ class EvnexChargePortConnectorTemperatureSensor(
 
     @property
     def native_value(self):
-        self.connector_brief = self.coordinator.data.get("connector_brief").get(
-            (self.charger_id, self.connector_id)
-        )
-        if (
-            self.connector_brief
-            and self.connector_brief.meter
-            and self.connector_brief.meter.temperature is not None
-        ):
-            return self.connector_brief.meter.temperature
+        meter = self.connector_meter
+        if meter and meter.temperature is not None:
+            return meter.temperature
         return None
 
 
+def _charger_sensors(
+    coordinator: EvnexChargePointCoordinator,
+    charger: ChargerInfo,
+    telemetry: ApiTelemetry,
+) -> list[SensorEntity]:
+    """Create the sensors of a charger and its connectors."""
+    charger_id = charger.charger_id
+    org_id_for_charger = charger.org_id
+
+    # Charger-level sensors
+    entities: list[SensorEntity] = [
+        EvnexChargerNetworkStatusSensor(coordinator, charger_id, org_id_for_charger),
+        EvnexChargerRefreshDurationSensor(
+            coordinator, charger_id, org_id_for_charger, telemetry
+        ),
+        EvnexChargerSessionEnergy(coordinator, charger_id, org_id_for_charger),
+        EvnexChargerSessionCost(coordinator, charger_id, org_id_for_charger),
+        EvnexChargerSessionTime(coordinator, charger_id, org_id_for_charger),
+        EvnexChargerLastSessionStartTime(coordinator, charger_id, org_id_for_charger),
+        EvnexChargerSessionHistorySensor(coordinator, charger_id, org_id_for_charger),
+    ]
+
+    # Connector-level sensors
+    for connector_id, connector in charger.connectors.items():
+        entities.append(
+            EvnexChargePortConnectorStatusSensor(
+                coordinator, charger_id, org_id_for_charger, connector_id
+            )
+        )
+        entities.extend(
+            EvnexChargePortConnectorVoltageSensor(
+                coordinator, charger_id, org_id_for_charger, connector_id, phase
+            )
+            for phase in connector.voltage_phases
+        )
+        entities.extend(
+            EvnexChargePortConnectorCurrentSensor(
+                coordinator, charger_id, org_id_for_charger, connector_id, phase
+            )
+            for phase in connector.current_phases
+        )
+
+        if connector.has_temperature:
+            entities.append(
+                EvnexChargePortConnectorTemperatureSensor(
+                    coordinator, charger_id, org_id_for_charger, connector_id
+                )
+            )
+
+        entities.append(
+            EvnexChargePortConnectorPowerSensor(
+                coordinator, charger_id, org_id_for_charger, connector_id
+            )
+        )
+        entities.append(
+            EvnexChargePortConnectorFrequencySensor(
+                coordinator, charger_id, org_id_for_charger, connector_id
+            )
+        )
+    return entities
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -629,146 +828,58 @@ async def async_setup_entry(
     """Set up the sensor platform."""
 
     # client = hass.data[DOMAIN][config_entry.entry_id][DATA_CLIENT]
-    coordinator = hass.data[DOMAIN][config_entry.entry_id][DATA_COORDINATOR]
+    hass_data = hass.data[DOMAIN][config_entry.entry_id]
+    account_coordinator: EvnexAccountCoordinator = hass_data[DATA_ACCOUNT_COORDINATOR]
+    insights_coordinator: EvnexOrgInsightsCoordinator = hass_data[
+        DATA_INSIGHTS_COORDINATOR
+    ]
 
     entities: list[SensorEntity] = []
-    if not coordinator.data:
+    if not account_coordinator.data:
         _LOGGER.warning("Coordinator data not available for sensor setup")
         return
 
-    charge_point_to_org_map = coordinator.data.get("charge_point_to_org_map", {})
-
     # Org Sensors
     # This Sensor shows org wide weekly summary of powerUsage, charging sessions, cost
-    for org_id in coordinator.data.get("org_briefs", {}).keys():
-        entities.append(
-            EvnexOrgWidePowerUsageSensorToday(coordinator=coordinator, org_id=org_id)
-        )
-        entities.append(
-            EvnexOrgWideChargeSessionsCountSensor(
-                coordinator=coordinator, org_id=org_id
-            )
-        )
-        entities.append(EvnexOrgTierSensor(coordinator=coordinator, org_id=org_id))
-
-    # Charger and Connector Sensors
-    for charger_id, charger_brief_obj in coordinator.data.get(
-        "charge_point_brief", {}
-    ).items():
-        org_id_for_charger = charge_point_to_org_map.get(charger_id)
-        if org_id_for_charger is None:
-            _LOGGER.warning(
-                f"Charger {charger_id} does not have an associated organization ID."
-            )
+    for org_id in account_coordinator.topology.orgs:
+        if org_id not in hass_data[DATA_ORG_IDS]:
+            # Provided, tier included, by the entry of another account which
+            # polls the org: org entities have a single unique id per org
             continue
-
-        # Charger-level sensors
         entities.append(
-            EvnexChargerNetworkStatusSensor(coordinator, charger_id, org_id_for_charger)
-        )
-        entities.append(
-            EvnexChargerSessionEnergy(coordinator, charger_id, org_id_for_charger)
-        )
-        entities.append(
-            EvnexChargerSessionCost(coordinator, charger_id, org_id_for_charger)
-        )
-        entities.append(
-            EvnexChargerSessionTime(coordinator, charger_id, org_id_for_charger)
+            EvnexOrgWidePowerUsageSensorToday(
+                coordinator=insights_coordinator, org_id=org_id
+            )
         )
         entities.append(
-            EvnexChargerLastSessionStartTime(
-                coordinator, charger_id, org_id_for_charger
+            EvnexOrgWideChargeSessionsCountSensor(
+                coordinator=insights_coordinator, org_id=org_id
             )
         )
-
         entities.append(
-            EvnexChargerSessionHistorySensor(
-                coordinator, charger_id, org_id_for_charger
-            )
+            EvnexOrgTierSensor(coordinator=account_coordinator, org_id=org_id)
         )
 
-        # Connector-level sensors
-        charge_point_detail_v3 = coordinator.data.get("charge_point_details", {}).get(
-            charger_id
+    # Only the entry which polls the account has its rate limiter
+    if rate_limiter := hass_data.get(DATA_RATE_LIMITER):
+        telemetry = hass_data[DATA_API_TELEMETRY]
+        for sensor_class in (
+            EvnexApiRequestQueueSensor,
+            EvnexApiThrottledRequestsSensor,
+            EvnexApiCallsSensor,
+        ):
+            entities.append(sensor_class(account_coordinator, rate_limiter, telemetry))
+
+    # Charger and Connector Sensors, following the charge points of the account
+    entities.extend(
+        async_setup_charger_entities(
+            hass,
+            config_entry,
+            async_add_entities,
+            lambda coordinator, charger: _charger_sensors(
+                coordinator, charger, hass_data[DATA_API_TELEMETRY]
+            ),
         )
-        if charge_point_detail_v3 and charge_point_detail_v3.connectors:
-            for connector_detail_v3 in charge_point_detail_v3.connectors:
-                connector_id = connector_detail_v3.connectorId
-
-                entities.append(
-                    EvnexChargePortConnectorStatusSensor(
-                        coordinator, charger_id, org_id_for_charger, connector_id
-                    )
-                )
-                entities.append(
-                    EvnexChargePortConnectorVoltageSensor(
-                        coordinator, charger_id, org_id_for_charger, connector_id
-                    )
-                )
-                if connector_detail_v3.meter.voltageL2N is not None:
-                    entities.append(
-                        EvnexChargePortConnectorVoltageSensor(
-                            coordinator,
-                            charger_id,
-                            org_id_for_charger,
-                            connector_id,
-                            "l2",
-                        )
-                    )
-                if connector_detail_v3.meter.voltageL3N is not None:
-                    entities.append(
-                        EvnexChargePortConnectorVoltageSensor(
-                            coordinator,
-                            charger_id,
-                            org_id_for_charger,
-                            connector_id,
-                            "l3",
-                        )
-                    )
-
-                entities.append(
-                    EvnexChargePortConnectorCurrentSensor(
-                        coordinator, charger_id, org_id_for_charger, connector_id
-                    )
-                )
-                if connector_detail_v3.meter.currentL2 is not None:
-                    entities.append(
-                        EvnexChargePortConnectorCurrentSensor(
-                            coordinator,
-                            charger_id,
-                            org_id_for_charger,
-                            connector_id,
-                            "l2",
-                        )
-                    )
-
-                if connector_detail_v3.meter.currentL3 is not None:
-                    entities.append(
-                        EvnexChargePortConnectorCurrentSensor(
-                            coordinator,
-                            charger_id,
-                            org_id_for_charger,
-                            connector_id,
-                            "l3",
-                        )
-                    )
-
-                if connector_detail_v3.meter.temperature is not None:
-                    entities.append(
-                        EvnexChargePortConnectorTemperatureSensor(
-                            coordinator, charger_id, org_id_for_charger, connector_id
-                        )
-                    )
-
-                entities.append(
-                    EvnexChargePortConnectorPowerSensor(
-                        coordinator, charger_id, org_id_for_charger, connector_id
-                    )
-                )
-                entities.append(
-                    EvnexChargePortConnectorFrequencySensor(
-                        coordinator, charger_id, org_id_for_charger, connector_id
-                    )
-                )
+    )
 
     async_add_entities(entities)
@@ -0,0 +1,204 @@
+"""Services of the evnex integration.
+
+evnex.start_trace and evnex.stop_trace record the API traffic of the evnex
+config entries to a trace in the config directory, see trace.py.
+
+evnex.profile_refresh runs one refresh cycle of the evnex config entries
+under cProfile: the account tier, then the insights and charge point tiers,
+including the entity state writes each refresh fans out to. The profile is
+written to the config directory with a summary of its top functions.
+
+cProfile only sees the event loop thread, which is where the parsing and
+the state writes happen. Network waits show up as time in the selector,
+and executor jobs as time awaiting their futures.
+"""
+
+import asyncio
+import logging
+import time
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DATA_ACCOUNT_COORDINATOR,
+    DATA_CHARGE_POINT_COORDINATORS,
+    DATA_INSIGHTS_COORDINATOR,
+    DATA_TRACE_RECORDER,
+    DOMAIN,
+)
+from .coordinator import EvnexDataUpdateCoordinator
+from .trace import TraceRecorder, write_trace
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+SERVICE_START_TRACE = "start_trace"
+SERVICE_STOP_TRACE = "stop_trace"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_TOP = "top"
+DEFAULT_TOP = 30
+
+PROFILE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_TOP, default=DEFAULT_TOP): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+    }
+)
+
+TRACE_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+# Only one profiler can be active at a time
+_PROFILE_LOCK = asyncio.Lock()
+
+
+def _entries_data(hass: HomeAssistant, entry_id: str | None) -> list[dict]:
+    """Return the data of the loaded entries a service call is about."""
+    entries_data = [
+        hass.data[DOMAIN][entry.entry_id]
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+        and (entry_id is None or entry.entry_id == entry_id)
+    ]
+    if not entries_data:
+        raise ServiceValidationError(f"No loaded evnex config entry {entry_id or ''}")
+    return entries_data
+
+
+def _trace_recorders(hass: HomeAssistant, entry_id: str | None) -> list[TraceRecorder]:
+    # Entries sharing an account share its recorder, and have none of their own
+    recorders = {
+        id(recorder): recorder
+        for entry_data in _entries_data(hass, entry_id)
+        if (recorder := entry_data.get(DATA_TRACE_RECORDER)) is not None
+    }
+    return list(recorders.values())
+
+
+def _coordinators_to_profile(
+    hass: HomeAssistant, entry_id: str | None
+) -> tuple[list[EvnexDataUpdateCoordinator], list[EvnexDataUpdateCoordinator]]:
+    """Return the account coordinators and the others of the entries to profile."""
+    # Entries sharing an account share its coordinators, refresh them once
+    accounts: dict[int, EvnexDataUpdateCoordinator] = {}
+    others: dict[int, EvnexDataUpdateCoordinator] = {}
+    for entry_data in _entries_data(hass, entry_id):
+        account_coordinator = entry_data[DATA_ACCOUNT_COORDINATOR]
+        accounts[id(account_coordinator)] = account_coordinator
+        for coordinator in (
+            entry_data[DATA_INSIGHTS_COORDINATOR],
+            *entry_data[DATA_CHARGE_POINT_COORDINATORS].values(),
+        ):
+            others[id(coordinator)] = coordinator
+    return list(accounts.values()), list(others.values())
+
+
+def _write_profile(profile, prof_path: str, summary_path: str, top: int) -> None:
+    """Write the profile and its summary, in the executor."""
+    import io
+    import pstats
+
+    profile.dump_stats(prof_path)
+    summary = io.StringIO()
+    stats = pstats.Stats(profile, stream=summary).strip_dirs()
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    with open(summary_path, "w") as summary_file:
+        summary_file.write(summary.getvalue())
+
+
+async def _async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+    hass = call.hass
+    accounts, others = _coordinators_to_profile(
+        hass, call.data.get(ATTR_CONFIG_ENTRY_ID)
+    )
+
+    # Imported here so that profiling costs nothing until it is used
+    import cProfile
+
+    async with _PROFILE_LOCK:
+        profile = cProfile.Profile()
+        start = time.monotonic()
+        profile.enable()
+        try:
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in accounts)
+            )
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in others)
+            )
+        finally:
+            profile.disable()
+        duration = time.monotonic() - start
+
+    name = f"evnex_profile_{int(time.time())}"
+    prof_path = hass.config.path(f"{name}.prof")
+    summary_path = hass.config.path(f"{name}.txt")
+    await hass.async_add_executor_job(
+        _write_profile, profile, prof_path, summary_path, call.data[ATTR_TOP]
+    )
+    _LOGGER.info(
+        f"Profiled a refresh of {len(accounts) + len(others)} coordinators "
+        f"taking {duration:.2f}s, written to {prof_path} and {summary_path}"
+    )
+    return {
+        "duration": round(duration, 3),
+        "coordinators": len(accounts) + len(others),
+        "profile": prof_path,
+        "summary": summary_path,
+    }
+
+
+async def _async_start_trace(call: ServiceCall) -> None:
+    for recorder in _trace_recorders(call.hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+        recorder.start()
+    _LOGGER.info("Recording the evnex API traffic")
+
+
+async def _async_stop_trace(call: ServiceCall) -> ServiceResponse:
+    hass = call.hass
+    traces = []
+    for index, recorder in enumerate(
+        _trace_recorders(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+    ):
+        if not recorder.recording:
+            continue
+        entries = recorder.stop()
+        path = hass.config.path(f"evnex_trace_{int(time.time())}_{index}.jsonl.gz")
+        await hass.async_add_executor_job(write_trace, path, entries)
+        _LOGGER.info(f"Wrote {len(entries)} evnex API requests to {path}")
+        traces.append({"path": path, "requests": len(entries)})
+    return {"traces": traces}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the evnex integration."""
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_TRACE, _async_start_trace, schema=TRACE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_TRACE,
+        _async_stop_trace,
+        schema=TRACE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        _async_profile_refresh,
+        schema=PROFILE_REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
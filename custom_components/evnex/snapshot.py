@@ -0,0 +1,230 @@
+"""Typed snapshots of the data fetched by the evnex coordinators.
+
+A new snapshot is built on every refresh and its indexes are computed once
+there, so entity properties only need attribute and dict lookups.
+
+Snapshots also answer to the string keys of the dicts previously used as
+coordinator data (e.g. ``data["charge_point_details"][charger_id]``). This
+compatibility view is kept during the transition and should not be used by
+new code.
+
+ChargePointSnapshot.changes_since() compares two snapshots of a charge point
+by part, so that only the entities reading a changed part are notified.
+"""
+
+from collections.abc import Hashable
+from typing import Any, ClassVar
+
+from evnex.schema.charge_points import EvnexChargePoint, EvnexChargePointOverrideConfig
+from evnex.schema.org import EvnexOrgBrief, EvnexOrgInsightEntry
+from evnex.schema.user import EvnexUserDetail
+from evnex.schema.v3.charge_points import (
+    EvnexChargePointConnector,
+    EvnexChargePointConnectorMeter,
+    EvnexChargePointDetail,
+    EvnexChargePointSession,
+)
+
+# Parts of a charge point snapshot that entities subscribe to, see
+# ChargePointSnapshot.changes_since()
+CHARGER = "charger"
+OVERRIDE = "override"
+SESSIONS = "sessions"
+
+# Fields which change on every report without changing what entities show
+_CONNECTOR_IGNORED_FIELDS = {"updatedDate": True, "meter": {"updatedDate"}}
+
+
+def connector_part(connector_id: str) -> Hashable:
+    """Snapshot part holding the status and meter of a single connector."""
+    return ("connector", connector_id)
+
+
+def _connector_state(connector: EvnexChargePointConnector) -> dict:
+    return connector.model_dump(exclude=_CONNECTOR_IGNORED_FIELDS)
+
+
+class _LegacyKeys:
+    """Read-only mapping access to a snapshot by its old data keys."""
+
+    __slots__ = ()
+
+    # Old data key -> attribute name
+    _legacy_keys: ClassVar[dict[str, str]] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, self._legacy_keys[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._legacy_keys
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._legacy_keys:
+            return default
+        return self[key]
+
+
+class AccountSnapshot(_LegacyKeys):
+    """User, orgs and charge point lists of an account."""
+
+    __slots__ = (
+        "user",
+        "org_briefs",
+        "charge_points_by_org",
+        "charge_point_brief",
+        "charge_point_to_org_map",
+    )
+
+    _legacy_keys = {
+        "user": "user",
+        "org_briefs": "org_briefs",
+        "charge_points_by_org": "charge_points_by_org",
+        "charge_points": "charge_points_by_org",
+        "charge_point_brief": "charge_point_brief",
+        "charge_point_to_org_map": "charge_point_to_org_map",
+    }
+
+    def __init__(
+        self,
+        user: EvnexUserDetail,
+        charge_points_by_org: dict[str, list[EvnexChargePoint]],
+    ) -> None:
+        self.user = user
+        self.org_briefs: dict[str, EvnexOrgBrief] = {
+            org.id: org for org in user.organisations
+        }
+        self.charge_points_by_org = charge_points_by_org
+        self.charge_point_brief: dict[str, EvnexChargePoint] = {}
+        self.charge_point_to_org_map: dict[str, str] = {}
+        for org_id, charge_points in charge_points_by_org.items():
+            for charge_point in charge_points:
+                self.charge_point_brief[charge_point.id] = charge_point
+                self.charge_point_to_org_map[charge_point.id] = org_id
+
+
+class OrgInsightsSnapshot(_LegacyKeys):
+    """Daily insights of every org, oldest day first."""
+
+    __slots__ = ("org_insights", "today")
+
+    _legacy_keys = {"org_insights": "org_insights"}
+
+    def __init__(self, org_insights: dict[str, list[EvnexOrgInsightEntry]]) -> None:
+        self.org_insights = org_insights
+        self.today: dict[str, EvnexOrgInsightEntry] = {
+            org_id: insights[-1]
+            for org_id, insights in org_insights.items()
+            if insights
+        }
+
+
+class ChargePointSnapshot(_LegacyKeys):
+    """Live detail, override and sessions of a single charge point."""
+
+    __slots__ = (
+        "charger_id",
+        "detail",
+        "override",
+        "override_stale",
+        "sessions",
+        "connectors",
+        "meters",
+        "latest_session",
+    )
+
+    _legacy_keys = {
+        "charge_point_details": "_legacy_details",
+        "charge_point_override": "_legacy_override",
+        "charge_point_sessions": "_legacy_sessions",
+        "connector_brief": "_legacy_connector_brief",
+    }
+
+    def __init__(
+        self,
+        charger_id: str,
+        detail: EvnexChargePointDetail,
+        override: EvnexChargePointOverrideConfig | None,
+        sessions: list[EvnexChargePointSession],
+        override_stale: bool = False,
+    ) -> None:
+        self.charger_id = charger_id
+        self.detail = detail
+        self.override = override
+        # True when the override couldn't be fetched and is the last one known
+        self.override_stale = override_stale
+        self.sessions = sessions  # newest first
+        self.connectors: dict[str, EvnexChargePointConnector] = {
+            connector.connectorId: connector for connector in detail.connectors
+        }
+        self.meters: dict[str, EvnexChargePointConnectorMeter] = {
+            connector_id: connector.meter
+            for connector_id, connector in self.connectors.items()
+            if connector.meter is not None
+        }
+        self.latest_session: EvnexChargePointSession | None = (
+            sessions[0] if sessions else None
+        )
+
+    @property
+    def online(self) -> bool:
+        return self.detail.networkStatus == "ONLINE"
+
+    def changes_since(
+        self, previous: "ChargePointSnapshot | None"
+    ) -> frozenset[Hashable] | None:
+        """Return the parts which differ from a previous snapshot.
+
+        None means that every entity of the charge point may be affected, as
+        happens on the first refresh or when the network status changes (it
+        decides the availability of most entities).
+        """
+        if (
+            previous is None
+            or previous.detail.networkStatus != self.detail.networkStatus
+            or previous.connectors.keys() != self.connectors.keys()
+        ):
+            return None
+
+        changed: set[Hashable] = set()
+        if (
+            previous.override != self.override
+            or previous.override_stale != self.override_stale
+        ):
+            changed.add(OVERRIDE)
+        # The session history cache hands back the same list when unchanged
+        if (
+            previous.sessions is not self.sessions
+            and previous.sessions != self.sessions
+        ):
+            changed.add(SESSIONS)
+        # The client hands back the same detail when its response is unchanged
+        if previous.detail is self.detail:
+            return frozenset(changed)
+        for connector_id, connector in self.connectors.items():
+            if _connector_state(connector) != _connector_state(
+                previous.connectors[connector_id]
+            ):
+                changed.add(connector_part(connector_id))
+        return frozenset(changed)
+
+    @property
+    def _legacy_details(self) -> dict[str, EvnexChargePointDetail]:
+        return {self.charger_id: self.detail}
+
+    @property
+    def _legacy_override(self) -> dict[str, EvnexChargePointOverrideConfig | None]:
+        return {self.charger_id: self.override}
+
+    @property
+    def _legacy_sessions(self) -> dict[str, list[EvnexChargePointSession]]:
+        return {self.charger_id: self.sessions}
+
+    @property
+    def _legacy_connector_brief(self) -> dict[tuple, EvnexChargePointConnector]:
+        return {
+            (self.charger_id, connector_id): connector
+            for connector_id, connector in self.connectors.items()
+        }
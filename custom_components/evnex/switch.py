@@ -7,20 +7,21 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 
-from .const import DATA_CLIENT, DATA_COORDINATOR, DOMAIN
+from .const import (
+    DATA_ACCOUNT_COORDINATOR,
+    DATA_CLIENT,
+    DOMAIN,
+)
+from .coordinator import EvnexChargePointCoordinator
 from .entity import (
     EvnexChargePointConnectorEntity,
     EvnexChargerEntity,
+    async_setup_charger_entities,
 )
+from .snapshot import OVERRIDE, ChargePointSnapshot
+from .topology import ChargerInfo
 from evnex.api import Evnex
-from evnex.schema.v3.charge_points import (
-    EvnexChargePointConnector,
-    EvnexChargePointDetail as EvnexChargePointDetailV3,
-)
-
-from evnex.schema.user import EvnexUserDetail
-
-from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.v3.charge_points import EvnexChargePointConnector
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,7 +30,7 @@ _LOGGER = logging.getLogger(__name__)
 class EvnexSwitchEntityDescription(SwitchEntityDescription):
     """Class to describe a Evnex Switch entity."""
 
-    is_on_func: Callable[[dict[str, Any], str], bool]
+    is_on_func: Callable[[ChargePointSnapshot], bool]
     on_func: Callable[[Evnex, str], Awaitable[None]]
     off_func: Callable[[Evnex, str], Awaitable[None]]
 
@@ -37,9 +38,7 @@ class EvnexSwitchEntityDescription(SwitchEntityDescription):
 EVNEX_SWITCHES: tuple[EvnexSwitchEntityDescription, ...] = (
     EvnexSwitchEntityDescription(
         key="charger_charge_now",
-        is_on_func=lambda data, charger_id: data.get("charge_point_override", {})
-        .get(charger_id)
-        .chargeNow,
+        is_on_func=lambda data: data.override is not None and data.override.chargeNow,
         on_func=lambda evnex_api, charge_point_id: evnex_api.set_charge_point_override(
             charge_point_id=charge_point_id, charge_now=True
         ),
@@ -52,6 +51,7 @@ EVNEX_SWITCHES: tuple[EvnexSwitchEntityDescription, ...] = (
 
 class EvnexChargerSwitch(EvnexChargerEntity, SwitchEntity):
     entity_description: EvnexSwitchEntityDescription
+    _snapshot_part = OVERRIDE
 
     def __init__(
         self,
@@ -75,31 +75,40 @@ class EvnexChargerSwitch(EvnexChargerEntity, SwitchEntity):
     @property
     def is_on(self):
         """Return true if switch is on."""
-        if (
-            self.coordinator.data["charge_point_details"][self.charger_id].networkStatus
-            == "OFFLINE"
-        ):
+        if self._optimistic_state is not None:
+            return self._optimistic_state
+        if self.coordinator.data.detail.networkStatus == "OFFLINE":
             return False
-        return self.entity_description.is_on_func(
-            self.coordinator.data, self.charger_id
-        )
+        return self.entity_description.is_on_func(self.coordinator.data)
+
+    @property
+    def extra_state_attributes(self):
+        return {"override_stale": self.coordinator.data.override_stale}
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Charge now."""
-        await self.entity_description.on_func(self.evnex, self.charger_id)
-        await self.coordinator.async_request_refresh()
+        await self._async_send_command(
+            self.entity_description.on_func(self.evnex, self.charger_id),
+            optimistic_state=True,
+            # A stale override predates the command
+            confirmed=lambda data: (
+                not data.override_stale and self.entity_description.is_on_func(data)
+            ),
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Don't charge now."""
-        await self.entity_description.off_func(self.evnex, self.charger_id)
-        await self.coordinator.async_request_refresh()
+        await self._async_send_command(
+            self.entity_description.off_func(self.evnex, self.charger_id),
+            optimistic_state=False,
+            confirmed=lambda data: (
+                not data.override_stale and not self.entity_description.is_on_func(data)
+            ),
+        )
 
     @property
     def available(self) -> bool:
-        return (
-            self.coordinator.data["charge_point_details"][self.charger_id].networkStatus
-            == "ONLINE"
-        )
+        return self.coordinator.data.online
 
 
 class EvnexChargerAvailabilitySwitch(EvnexChargePointConnectorEntity, SwitchEntity):
@@ -123,38 +132,84 @@ class EvnexChargerAvailabilitySwitch(EvnexChargePointConnectorEntity, SwitchEnti
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        charger_brief = self.coordinator.data.get("charge_point_brief", {}).get(
-            self.charger_id
-        )
-        if not charger_brief or charger_brief.networkStatus == "OFFLINE":
+        charger_status = self.charger_status
+        if not charger_status or charger_status.networkStatus == "OFFLINE":
             return False
         return super().available  # Rely on CoordinatorEntity.available
 
     @property
     def is_on(self):
+        if self._optimistic_state is not None:
+            return self._optimistic_state
         brief: EvnexChargePointConnector = self.connector_brief
         return brief is not None and brief.ocppStatus == "AVAILABLE"
 
+    def _is_inoperative(self, data: ChargePointSnapshot) -> bool:
+        connector = data.connectors.get(self.connector_id)
+        return connector is not None and connector.ocppStatus == "UNAVAILABLE"
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Change to available ie Operative."""
         _LOGGER.info("Enabling 'Availability' switch")
-
-        await self.evnex.enable_charger(
-            org_id=self.org_id,
-            charge_point_id=self.charger_id,
-            connector_id=self.connector_id,
+        await self._async_send_command(
+            self.evnex.enable_charger(
+                org_id=self.org_id,
+                charge_point_id=self.charger_id,
+                connector_id=self.connector_id,
+            ),
+            optimistic_state=True,
+            # Operative connectors may also be preparing, charging etc.
+            confirmed=lambda data: not self._is_inoperative(data),
         )
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Change to unavailable ie Inoperative."""
         _LOGGER.info("Disabling 'Availability' switch")
-        await self.evnex.disable_charger(
-            org_id=self.org_id,
-            charge_point_id=self.charger_id,
-            connector_id=self.connector_id,
+        await self._async_send_command(
+            self.evnex.disable_charger(
+                org_id=self.org_id,
+                charge_point_id=self.charger_id,
+                connector_id=self.connector_id,
+            ),
+            optimistic_state=False,
+            confirmed=self._is_inoperative,
+        )
+
+
+def _charger_switches(
+    evnex_api_client: Evnex,
+    coordinator: EvnexChargePointCoordinator,
+    charger: ChargerInfo,
+) -> list[SwitchEntity]:
+    """Create the switches of a charger and its connectors."""
+    entities: list[SwitchEntity] = [
+        EvnexChargerSwitch(
+            evnex_api_client,
+            coordinator,
+            charger.charger_id,
+            charger.org_id,
+            entity_description,
+        )
+        for entity_description in EVNEX_SWITCHES
+    ]
+
+    # Iterate through connectors of this charger
+    if not charger.connectors:
+        _LOGGER.debug(
+            f"No V3 connector details found for charger {charger.charger_id} in org {charger.org_id} "
+            f"when setting up availability switches."
+        )
+    for connector_id in charger.connectors:
+        entities.append(
+            EvnexChargerAvailabilitySwitch(
+                evnex_api_client,
+                coordinator,
+                charger.charger_id,
+                charger.org_id,
+                connector_id,
+            )
         )
-        await self.coordinator.async_request_refresh()
+    return entities
 
 
 async def async_setup_entry(
@@ -163,60 +218,20 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the switches."""
-    entities = []
     hass_data = hass.data[DOMAIN][config_entry.entry_id]
     evnex_api_client = hass_data[DATA_CLIENT]
-    coordinator = hass_data[DATA_COORDINATOR]
-    if not coordinator.data or not coordinator.data.get("user"):
+    account_coordinator = hass_data[DATA_ACCOUNT_COORDINATOR]
+    if not account_coordinator.data:
         _LOGGER.warning(
             "Switch setup: Coordinator data or user data not available yet."
         )
         return
-    user_detail: EvnexUserDetail = coordinator.data["user"]
-    all_org_charge_points_data: dict[str, list[EvnexChargePoint]] = (
-        coordinator.data.get("charge_points", {})
+    entities = async_setup_charger_entities(
+        hass,
+        config_entry,
+        async_add_entities,
+        lambda coordinator, charger: _charger_switches(
+            evnex_api_client, coordinator, charger
+        ),
     )
-
-    for org_brief in user_detail.organisations:
-        org_id = org_brief.id
-        charge_points_in_org = all_org_charge_points_data.get(org_id, [])
-
-        # This is EvnexChargePoint (v2 schema)
-        for charge_point_obj in charge_points_in_org:
-            charger_id = charge_point_obj.id
-
-            for entity_description in EVNEX_SWITCHES:
-                entities.append(
-                    EvnexChargerSwitch(
-                        evnex_api_client,
-                        coordinator,
-                        charger_id,
-                        org_id,
-                        entity_description,
-                    )
-                )
-
-            charge_point_detail_v3: EvnexChargePointDetailV3 | None = (
-                coordinator.data.get("charge_point_details", {}).get(charger_id)
-            )
-
-            # Iterate through connectors of this charger
-            if charge_point_detail_v3 and charge_point_detail_v3.connectors:
-                for connector_detail_v3 in charge_point_detail_v3.connectors:
-                    connector_id = connector_detail_v3.connectorId
-                    entities.append(
-                        EvnexChargerAvailabilitySwitch(
-                            evnex_api_client,
-                            coordinator,
-                            charger_id,
-                            org_id,
-                            connector_id,
-                        )
-                    )
-            else:
-                _LOGGER.debug(
-                    f"No V3 connector details found for charger {charger_id} in org {org_id} "
-                    f"when setting up availability switches."
-                )
-
     async_add_entities(entities)
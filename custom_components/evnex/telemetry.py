@@ -0,0 +1,176 @@
+"""Telemetry of the requests made to the Evnex API.
+
+ApiTelemetryTransport sits right above the network in every account's
+HTTP transport, below the rate limiter and the ETag cache, so it measures
+the requests actually sent: their latency, result and body size. They are
+counted by endpoint, with ids in the URL replaced by placeholders, and by
+charge point.
+"""
+
+import bisect
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import httpx
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Window over which calls_last_hour counts requests, in seconds
+CALL_RATE_WINDOW = 3600
+
+# Path segments followed by an id, and the placeholder replacing the id
+_ID_SEGMENTS = {
+    "organisations": "{org_id}",
+    "charge-points": "{charge_point_id}",
+}
+
+
+def endpoint_of(request: httpx.Request) -> tuple[str, str | None]:
+    """Return the endpoint of a request and the charge point it is about."""
+    segments = request.url.path.split("/")
+    charge_point_id = None
+    for index in range(1, len(segments)):
+        placeholder = _ID_SEGMENTS.get(segments[index - 1])
+        if placeholder is not None and segments[index]:
+            if placeholder == "{charge_point_id}":
+                charge_point_id = segments[index]
+            segments[index] = placeholder
+    return f"{request.method} {'/'.join(segments)}", charge_point_id
+
+
+@dataclass
+class RequestStats:
+    """Requests of one endpoint or charge point."""
+
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    not_modified: int = 0
+    bytes_received: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+    # Requests per LATENCY_BUCKETS bucket, the last for anything slower
+    latency_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    @property
+    def latency_mean(self) -> float | None:
+        return self.latency_total / self.calls if self.calls else None
+
+    def record(
+        self,
+        latency: float,
+        response: httpx.Response | None,
+        timed_out: bool = False,
+    ) -> None:
+        self.calls += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        if timed_out:
+            self.timeouts += 1
+        elif response is None or response.is_error:
+            self.errors += 1
+        else:
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                self.not_modified += 1
+            self.bytes_received += len(response.content)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "not_modified": self.not_modified,
+            "bytes_received": self.bytes_received,
+            "latency_mean": round(self.latency_mean, 3)
+            if self.latency_mean is not None
+            else None,
+            "latency_max": round(self.latency_max, 3),
+            "latency_histogram": dict(
+                zip(
+                    [f"le_{bound}" for bound in LATENCY_BUCKETS] + ["inf"],
+                    self.latency_histogram,
+                )
+            ),
+        }
+
+
+class ApiTelemetry:
+    """Request statistics of an account, in total, by endpoint and charge point."""
+
+    def __init__(self) -> None:
+        self.total = RequestStats()
+        self.endpoints: dict[str, RequestStats] = {}
+        self.charge_points: dict[str, RequestStats] = {}
+        self._call_times: deque[float] = deque()
+
+    @property
+    def calls_last_hour(self) -> int:
+        self._expire(time.monotonic())
+        return len(self._call_times)
+
+    def _expire(self, now: float) -> None:
+        while self._call_times and now - self._call_times[0] > CALL_RATE_WINDOW:
+            self._call_times.popleft()
+
+    def record(
+        self,
+        request: httpx.Request,
+        latency: float,
+        response: httpx.Response | None,
+        timed_out: bool = False,
+    ) -> None:
+        endpoint, charge_point_id = endpoint_of(request)
+        stats = [self.total, self.endpoints.setdefault(endpoint, RequestStats())]
+        if charge_point_id is not None:
+            stats.append(self.charge_points.setdefault(charge_point_id, RequestStats()))
+        for request_stats in stats:
+            request_stats.record(latency, response, timed_out)
+
+        now = time.monotonic()
+        self._call_times.append(now)
+        self._expire(now)
+
+    def as_dict(self) -> dict:
+        return {
+            "calls_last_hour": self.calls_last_hour,
+            "total": self.total.as_dict(),
+            "endpoints": {
+                endpoint: stats.as_dict() for endpoint, stats in self.endpoints.items()
+            },
+            "charge_points": {
+                charge_point_id: stats.as_dict()
+                for charge_point_id, stats in self.charge_points.items()
+            },
+        }
+
+
+class ApiTelemetryTransport(httpx.AsyncBaseTransport):
+    """HTTP transport recording every request in an ApiTelemetry."""
+
+    def __init__(
+        self, telemetry: ApiTelemetry, transport: httpx.AsyncBaseTransport
+    ) -> None:
+        self.telemetry = telemetry
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        try:
+            response = await self._transport.handle_async_request(request)
+            # Every Evnex response is read in full, so read it here to time it
+            await response.aread()
+        except httpx.TimeoutException:
+            self.telemetry.record(request, time.monotonic() - start, None, True)
+            raise
+        except httpx.TransportError:
+            self.telemetry.record(request, time.monotonic() - start, None)
+            raise
+        self.telemetry.record(request, time.monotonic() - start, response)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
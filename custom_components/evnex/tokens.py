@@ -0,0 +1,115 @@
+"""Persistence of Evnex session tokens between restarts."""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_TOKEN_STORE,
+    DOMAIN,
+    TOKEN_FILE_NAME,
+    TOKEN_STORAGE_KEY,
+    TOKEN_STORAGE_VERSION,
+)
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Coalesce token changes from several entries into a single write
+TOKEN_SAVE_DELAY = 10
+
+
+def _read_legacy_token_file(path: str) -> Optional[dict]:
+    """Read the session tokens file used by earlier versions."""
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r") as spf:
+        try:
+            return json.load(spf)
+        except json.decoder.JSONDecodeError:
+            _LOGGER.error("Failed to decode JSON session data in %s", path)
+            return None
+
+
+class EvnexTokenStore:
+    """Session tokens for every config entry, keyed by entry id.
+
+    Tokens are kept in memory and written with an atomic, delayed save of a
+    private Home Assistant Store, and only when they differ from what was
+    last persisted.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._store: Store[dict[str, dict]] = Store(
+            hass,
+            TOKEN_STORAGE_VERSION,
+            TOKEN_STORAGE_KEY,
+            private=True,
+            atomic_writes=True,
+        )
+        self._tokens: dict[str, dict] = {}
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the stored tokens, migrating the legacy token file if present."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            if (stored := await self._store.async_load()) is not None:
+                self._tokens = stored
+            else:
+                legacy_file = self.hass.config.path(TOKEN_FILE_NAME)
+                if legacy := await self.hass.async_add_executor_job(
+                    _read_legacy_token_file, legacy_file
+                ):
+                    _LOGGER.info("Migrating session tokens from %s", legacy_file)
+                    self._tokens = legacy
+                    await self._store.async_save(self._tokens)
+                    await self.hass.async_add_executor_job(os.remove, legacy_file)
+            self._loaded = True
+
+    async def async_get(self, entry_id: str) -> Optional[dict]:
+        """Return the persisted tokens of a config entry."""
+        await self.async_load()
+        return self._tokens.get(entry_id)
+
+    @callback
+    def async_set(
+        self,
+        entry_id: str,
+        id_token=None,
+        refresh_token=None,
+        access_token=None,
+    ) -> None:
+        """Schedule the tokens of a config entry to be persisted if they changed."""
+        tokens = {
+            "id_token": id_token,
+            "refresh_token": refresh_token,
+            "access_token": access_token,
+        }
+        if self._tokens.get(entry_id) == tokens:
+            return
+        _LOGGER.info("Persisting session tokens")
+        self._tokens[entry_id] = tokens
+        self._store.async_delay_save(lambda: self._tokens, TOKEN_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Forget the tokens of a removed config entry."""
+        if self._tokens.pop(entry_id, None) is not None:
+            self._store.async_delay_save(lambda: self._tokens, TOKEN_SAVE_DELAY)
+
+
+@callback
+def async_get_token_store(hass: HomeAssistant) -> EvnexTokenStore:
+    """Return the token store shared by all evnex config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_TOKEN_STORE not in domain_data:
+        domain_data[DATA_TOKEN_STORE] = EvnexTokenStore(hass)
+    return domain_data[DATA_TOKEN_STORE]
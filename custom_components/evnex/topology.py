@@ -0,0 +1,178 @@
+"""Topology of an Evnex account: its orgs, their charge points and connectors.
+
+The platforms set up entities per org, charge point and connector, and which
+connector entities exist depends on what each connector can do (its phases,
+maximum current, temperature sensor). EvnexTopology indexes all of this once,
+from the account snapshot and the charge point snapshots, so that platform
+setup and entity constructors only need lookups.
+
+A topology is immutable. The account coordinator holds the current one and
+replaces it when the topology changes. The capabilities of a connector are
+read from its latest meter reading, which can be missing, so a new topology
+keeps every capability the previous one had: entities are only ever added
+for them, and only removed when their charge point or connector is gone.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+
+from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.org import EvnexOrgBrief
+from evnex.schema.v3.charge_points import EvnexChargePointConnector
+
+from .snapshot import AccountSnapshot, ChargePointSnapshot
+
+# Phases other than L1, which every connector reports
+_EXTRA_PHASES = ("l2", "l3")
+
+
+@dataclass(frozen=True)
+class ConnectorInfo:
+    """A connector of a charge point and what it can do."""
+
+    connector_id: str
+    power_type: str
+    max_amperage: float | None
+    max_voltage: float | None
+    # Phases with a voltage and current reported, L1 always included
+    voltage_phases: tuple[str, ...]
+    current_phases: tuple[str, ...]
+    has_temperature: bool
+
+    @classmethod
+    def from_connector(cls, connector: EvnexChargePointConnector) -> "ConnectorInfo":
+        meter = connector.meter
+        return cls(
+            connector_id=connector.connectorId,
+            power_type=connector.powerType,
+            max_amperage=connector.maxAmperage,
+            max_voltage=connector.maxVoltage,
+            voltage_phases=(
+                "l1",
+                *(
+                    phase
+                    for phase in _EXTRA_PHASES
+                    if getattr(meter, f"voltage{phase.capitalize()}N", None) is not None
+                ),
+            ),
+            current_phases=(
+                "l1",
+                *(
+                    phase
+                    for phase in _EXTRA_PHASES
+                    if getattr(meter, f"current{phase.capitalize()}", None) is not None
+                ),
+            ),
+            has_temperature=getattr(meter, "temperature", None) is not None,
+        )
+
+    def merged(self, previous: "ConnectorInfo") -> "ConnectorInfo":
+        """Return this connector with the capabilities previous had too."""
+        return replace(
+            self,
+            max_amperage=(
+                self.max_amperage
+                if self.max_amperage is not None
+                else previous.max_amperage
+            ),
+            max_voltage=(
+                self.max_voltage
+                if self.max_voltage is not None
+                else previous.max_voltage
+            ),
+            voltage_phases=_merge_phases(self.voltage_phases, previous.voltage_phases),
+            current_phases=_merge_phases(self.current_phases, previous.current_phases),
+            has_temperature=self.has_temperature or previous.has_temperature,
+        )
+
+
+def _merge_phases(
+    phases: tuple[str, ...], previous: tuple[str, ...]
+) -> tuple[str, ...]:
+    return (
+        "l1",
+        *(phase for phase in _EXTRA_PHASES if phase in phases or phase in previous),
+    )
+
+
+@dataclass(frozen=True)
+class ChargerInfo:
+    """A charge point of an org and its connectors."""
+
+    charger_id: str
+    org_id: str
+    connectors: Mapping[str, ConnectorInfo]
+    # The charge point as listed when the topology was built, not compared
+    # as its name and firmware don't change the topology
+    brief: EvnexChargePoint = field(compare=False)
+
+
+@dataclass(frozen=True)
+class OrgInfo:
+    """An org and the ids of its charge points."""
+
+    org_id: str
+    charger_ids: tuple[str, ...]
+    brief: EvnexOrgBrief = field(compare=False)
+
+
+@dataclass(frozen=True)
+class EvnexTopology:
+    """Orgs, charge points and connectors of an account, by id."""
+
+    orgs: Mapping[str, OrgInfo]
+    chargers: Mapping[str, ChargerInfo]
+
+    @classmethod
+    def build(
+        cls,
+        account: AccountSnapshot,
+        charge_points: Mapping[str, ChargePointSnapshot | None],
+        previous: "EvnexTopology | None" = None,
+    ) -> "EvnexTopology":
+        """Index an account's topology.
+
+        Only the charge points with a snapshot in charge_points are included,
+        the others are polled, and provided, by the entry of another account.
+        The connectors which were already in the previous topology keep the
+        capabilities they had in it.
+        """
+        chargers: dict[str, ChargerInfo] = {}
+        for charger_id, org_id in account.charge_point_to_org_map.items():
+            snapshot = charge_points.get(charger_id)
+            if snapshot is None:
+                continue
+            previous_charger = (
+                previous.chargers.get(charger_id) if previous is not None else None
+            )
+            connectors: dict[str, ConnectorInfo] = {}
+            for connector_id, connector in snapshot.connectors.items():
+                info = ConnectorInfo.from_connector(connector)
+                if previous_charger is not None and (
+                    previous_connector := previous_charger.connectors.get(connector_id)
+                ):
+                    info = info.merged(previous_connector)
+                connectors[connector_id] = info
+            chargers[charger_id] = ChargerInfo(
+                charger_id=charger_id,
+                org_id=org_id,
+                connectors=MappingProxyType(connectors),
+                brief=account.charge_point_brief[charger_id],
+            )
+        orgs = {
+            org_id: OrgInfo(
+                org_id=org_id,
+                charger_ids=tuple(
+                    charge_point.id
+                    for charge_point in account.charge_points_by_org.get(org_id, [])
+                    if charge_point.id in chargers
+                ),
+                brief=org_brief,
+            )
+            for org_id, org_brief in account.org_briefs.items()
+        }
+        return cls(orgs=MappingProxyType(orgs), chargers=MappingProxyType(chargers))
+
+
+EMPTY_TOPOLOGY = EvnexTopology(orgs=MappingProxyType({}), chargers=MappingProxyType({}))
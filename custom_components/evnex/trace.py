@@ -0,0 +1,203 @@
+"""Recording and replay of the traffic between the integration and Evnex.
+
+A TraceRecorder sits right above the network in every account's HTTP
+transport. It passes requests straight through until recording is started,
+with the evnex.start_trace service, and from then on keeps each request and
+its response until evnex.stop_trace writes them to a trace in the config
+directory. A trace is gzipped JSON lines: a header, then one line per
+request with its timing, status, a few headers and the bodies. The
+Authorization header is never recorded, and tokens and passwords in
+JSON bodies are scrubbed.
+
+ReplayTransport serves a trace back in place of the network, as fast as
+possible or at the recorded speed, so that the integration can be set up
+and refreshed offline against a real account's traffic. See the refresh
+benchmark's --replay option.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import time
+from collections import deque
+from typing import Any
+
+import httpx
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+# Requests kept per recording, later requests aren't recorded
+MAX_TRACE_ENTRIES = 50_000
+# Response headers kept in a trace
+TRACE_HEADERS = ("content-type", "etag", "retry-after")
+# JSON keys whose values are replaced in recorded bodies
+SCRUBBED_KEYS = frozenset(
+    {
+        "accesstoken",
+        "idtoken",
+        "refreshtoken",
+        "refresh_token",
+        "access_token",
+        "id_token",
+        "password",
+        "authorization",
+    }
+)
+SCRUBBED = "**SCRUBBED**"
+
+
+def _scrub(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: SCRUBBED if key.lower() in SCRUBBED_KEYS else _scrub(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_scrub(item) for item in value]
+    return value
+
+
+def _scrub_body(content: bytes) -> str | None:
+    """Return a body as text with its secrets scrubbed, None if it is empty."""
+    if not content:
+        return None
+    text = content.decode("utf-8", errors="replace")
+    try:
+        return json.dumps(_scrub(json.loads(text)), separators=(",", ":"))
+    except ValueError:
+        return text
+
+
+def write_trace(path: str, entries: list[dict]) -> None:
+    """Write a trace, in the executor."""
+    with gzip.open(path, "wt", encoding="utf-8") as trace_file:
+        trace_file.write(json.dumps({"version": TRACE_VERSION}) + "\n")
+        for entry in entries:
+            trace_file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+def load_trace(path: str) -> list[dict]:
+    """Read the requests of a trace, in the executor."""
+    with gzip.open(path, "rt", encoding="utf-8") as trace_file:
+        header = json.loads(trace_file.readline())
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {header.get('version')}")
+        return [json.loads(line) for line in trace_file if line.strip()]
+
+
+class TraceRecorder:
+    """Requests and responses of an account while recording is on."""
+
+    def __init__(self) -> None:
+        self.entries: list[dict] = []
+        self._started_at: float | None = None
+
+    @property
+    def recording(self) -> bool:
+        return self._started_at is not None
+
+    def start(self) -> None:
+        self.entries = []
+        self._started_at = time.monotonic()
+
+    def stop(self) -> list[dict]:
+        """Stop recording, returning the requests recorded."""
+        entries, self.entries = self.entries, []
+        self._started_at = None
+        return entries
+
+    def record(
+        self, request: httpx.Request, start: float, response: httpx.Response
+    ) -> None:
+        if self._started_at is None:
+            return
+        if len(self.entries) >= MAX_TRACE_ENTRIES:
+            _LOGGER.warning("The API trace is full, stopping the recording")
+            self._started_at = None
+            return
+        self.entries.append(
+            {
+                "at": round(start - self._started_at, 4),
+                "latency": round(time.monotonic() - start, 4),
+                "method": request.method,
+                "url": str(request.url),
+                "request_body": _scrub_body(request.content),
+                "status": response.status_code,
+                "headers": {
+                    name: response.headers[name]
+                    for name in TRACE_HEADERS
+                    if name in response.headers
+                },
+                "body": _scrub_body(response.content),
+            }
+        )
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """HTTP transport handing every request to a TraceRecorder."""
+
+    def __init__(
+        self, recorder: TraceRecorder, transport: httpx.AsyncBaseTransport
+    ) -> None:
+        self.recorder = recorder
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.recorder.recording:
+            return await self._transport.handle_async_request(request)
+        start = time.monotonic()
+        response = await self._transport.handle_async_request(request)
+        await response.aread()
+        self.recorder.record(request, start, response)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """HTTP transport answering requests from a trace instead of the network.
+
+    Each request gets the next recorded response for its method and URL, and
+    the last one again once they run out. A request whose query string was
+    never recorded, like insights over another number of days, gets the last
+    response recorded for its path. Requests the trace has no response for at
+    all are answered with a 404, which the Evnex client retries.
+    """
+
+    def __init__(self, entries: list[dict], realtime: bool = False) -> None:
+        self.realtime = realtime
+        self._responses: dict[tuple[str, str], deque[dict]] = {}
+        self._by_path: dict[tuple[str, str], dict] = {}
+        for entry in entries:
+            self._responses.setdefault((entry["method"], entry["url"]), deque()).append(
+                entry
+            )
+            path = httpx.URL(entry["url"]).copy_with(query=None)
+            self._by_path[(entry["method"], str(path))] = entry
+        self.unmatched = 0
+
+    def _next_response(self, request: httpx.Request) -> dict | None:
+        responses = self._responses.get((request.method, str(request.url)))
+        if responses:
+            return responses.popleft() if len(responses) > 1 else responses[0]
+        path = request.url.copy_with(query=None)
+        return self._by_path.get((request.method, str(path)))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._next_response(request)
+        if entry is None:
+            self.unmatched += 1
+            _LOGGER.debug(f"No recorded response for {request.method} {request.url}")
+            return httpx.Response(httpx.codes.NOT_FOUND, request=request)
+        if self.realtime:
+            await asyncio.sleep(entry["latency"])
+        body = entry["body"]
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=body.encode() if body is not None else b"",
+            request=request,
+        )
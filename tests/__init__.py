@@ -0,0 +1,32 @@
+"""Tests for the evnex integration."""
+
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from benchmarks.fake_evnex import FakeEvnex
+from custom_components.evnex.const import DOMAIN
+
+
+async def async_setup_evnex(
+    hass: HomeAssistant, evnex: FakeEvnex, user_id: str = "user"
+) -> MockConfigEntry:
+    """Set up a config entry served by a fake Evnex account."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=user_id,
+        data={
+            "username": f"{user_id}@example.com",
+            "password": "secret",
+            "user_id": user_id,
+            "default_org_id": None,
+        },
+        version=1,
+        minor_version=2,
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.evnex.EvnexClient", return_value=evnex):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry
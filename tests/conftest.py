@@ -0,0 +1,9 @@
+"""Fixtures shared by the tests of the evnex integration."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components in every test."""
+    yield
@@ -0,0 +1,95 @@
+"""Tests for the ETag revalidation and model reuse of the Evnex client."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from benchmarks.fake_evnex import FakeEvnex, charge_point_id
+from custom_components.evnex.api import ConditionalRequestTransport, EvnexClient
+
+CHARGE_POINT_ID = charge_point_id(0, 0)
+
+
+@pytest.fixture
+async def detail() -> dict:
+    """Body of the charge point detail response, served as it is changed."""
+    response = await FakeEvnex().get_charge_point_detail_v3(CHARGE_POINT_ID)
+    return response.model_dump(mode="json", by_alias=True)
+
+
+def evnex_client(transport: httpx.AsyncBaseTransport) -> EvnexClient:
+    with patch("evnex.api.Cognito") as cognito:
+        cognito.return_value.access_token = "access-token"
+        return EvnexClient(
+            "user@example.com",
+            "secret",
+            "id-token",
+            "refresh-token",
+            "access-token",
+            None,
+            httpx.AsyncClient(transport=transport),
+        )
+
+
+async def test_not_modified_replays_the_cached_body():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"data": []}, headers={"ETag": '"v1"'})
+
+    transport = ConditionalRequestTransport(httpx.MockTransport(handler))
+    client = httpx.AsyncClient(transport=transport)
+
+    first = await client.get("https://evnex.test/sessions")
+    second = await client.get("https://evnex.test/sessions")
+
+    assert "If-None-Match" not in requests[0].headers
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert transport.not_modified == 1
+
+
+async def test_response_without_etag_is_not_revalidated():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"data": []})
+
+    client = httpx.AsyncClient(
+        transport=ConditionalRequestTransport(httpx.MockTransport(handler))
+    )
+    await client.get("https://evnex.test/sessions")
+    await client.get("https://evnex.test/sessions")
+
+    assert all("If-None-Match" not in request.headers for request in requests)
+
+
+async def test_unchanged_response_reuses_the_parsed_model(detail):
+    client = evnex_client(
+        httpx.MockTransport(lambda request: httpx.Response(200, json=detail))
+    )
+
+    first = await client.get_charge_point_detail_v3(charge_point_id=CHARGE_POINT_ID)
+    second = await client.get_charge_point_detail_v3(charge_point_id=CHARGE_POINT_ID)
+
+    assert second is first
+    assert (client.responses_parsed, client.responses_reused) == (1, 1)
+
+
+async def test_changed_response_is_parsed_again(detail):
+    client = evnex_client(
+        httpx.MockTransport(lambda request: httpx.Response(200, json=detail))
+    )
+
+    first = await client.get_charge_point_detail_v3(charge_point_id=CHARGE_POINT_ID)
+    detail["data"]["attributes"]["firmware"] = "2.0.0"
+    second = await client.get_charge_point_detail_v3(charge_point_id=CHARGE_POINT_ID)
+
+    assert second is not first
+    assert second.data.attributes.firmware == "2.0.0"
+    assert (client.responses_parsed, client.responses_reused) == (2, 0)
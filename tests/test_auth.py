@@ -0,0 +1,138 @@
+"""Tests for the renewal of the session tokens before they expire."""
+
+import asyncio
+import base64
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+from homeassistant.core import HomeAssistant
+
+from custom_components.evnex.auth import (
+    TOKEN_RENEWAL_MARGIN,
+    EvnexTokenManager,
+    token_expiry,
+)
+
+
+def jwt(expiry: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": expiry}).encode())
+    return f"header.{payload.rstrip(b'=').decode()}.signature"
+
+
+class Client:
+    """Evnex client whose tokens expire at a given time."""
+
+    def __init__(self, expiry: float) -> None:
+        self.cognito = SimpleNamespace(
+            access_token=jwt(expiry),
+            id_token=jwt(expiry),
+            refresh_token="refresh-token",
+            user_pool_region="ap-southeast-2",
+            client_id="client-id",
+            token_type=None,
+        )
+        self.logins = 0
+
+    @property
+    def access_token(self) -> str:
+        return self.cognito.access_token
+
+    @property
+    def id_token(self) -> str:
+        return self.cognito.id_token
+
+    def authenticate(self) -> None:
+        self.logins += 1
+        self.cognito.access_token = self.cognito.id_token = jwt(time.time() + 3600)
+
+
+def cognito(requests: list, refused: bool = False) -> httpx.AsyncClient:
+    """HTTP client answering Cognito's refresh token flow."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        # Long enough for concurrent callers to find the renewal in progress
+        await asyncio.sleep(0.01)
+        if refused:
+            return httpx.Response(
+                400,
+                json={"__type": "NotAuthorizedException", "message": "expired"},
+            )
+        token = jwt(time.time() + 3600)
+        return httpx.Response(
+            200,
+            json={"AuthenticationResult": {"AccessToken": token, "IdToken": token}},
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_token_expiry():
+    assert token_expiry(jwt(1234)) == 1234
+    assert token_expiry("not-a-jwt") is None
+    assert token_expiry(None) is None
+
+
+async def test_renews_within_the_margin(hass: HomeAssistant):
+    requests, renewed = [], []
+    client = Client(time.time() + TOKEN_RENEWAL_MARGIN - 10)
+    manager = EvnexTokenManager(
+        hass, client, cognito(requests), lambda: renewed.append(1)
+    )
+
+    await manager.async_ensure_valid()
+
+    assert [request["AuthFlow"] for request in requests] == ["REFRESH_TOKEN_AUTH"]
+    assert renewed == [1]
+    assert manager.expires_at > time.time() + TOKEN_RENEWAL_MARGIN
+    manager.async_stop()
+
+
+async def test_valid_tokens_not_renewed(hass: HomeAssistant):
+    requests = []
+    client = Client(time.time() + TOKEN_RENEWAL_MARGIN + 60)
+    manager = EvnexTokenManager(hass, client, cognito(requests), lambda: None)
+
+    await manager.async_ensure_valid()
+
+    assert requests == []
+
+
+async def test_concurrent_callers_share_one_renewal(hass: HomeAssistant):
+    requests, renewed = [], []
+    client = Client(time.time() + 60)
+    manager = EvnexTokenManager(
+        hass, client, cognito(requests), lambda: renewed.append(1)
+    )
+
+    await asyncio.gather(*(manager.async_ensure_valid() for _ in range(5)))
+
+    assert len(requests) == 1
+    assert renewed == [1]
+    manager.async_stop()
+
+
+async def test_refusal_of_a_replaced_token_not_renewed(hass: HomeAssistant):
+    requests = []
+    client = Client(time.time() + 3600)
+    manager = EvnexTokenManager(hass, client, cognito(requests), lambda: None)
+
+    await manager.async_renew("replaced-token")
+
+    assert requests == []
+
+
+async def test_refused_refresh_token_logs_in_again(hass: HomeAssistant):
+    requests = []
+    client = Client(time.time() + 60)
+    manager = EvnexTokenManager(
+        hass, client, cognito(requests, refused=True), lambda: None
+    )
+
+    await manager.async_renew()
+
+    assert len(requests) == 1
+    assert client.logins == 1
+    manager.async_stop()
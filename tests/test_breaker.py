@@ -0,0 +1,82 @@
+"""Tests for the circuit breaker of the charge point override."""
+
+import pytest
+
+from custom_components.evnex import breaker
+from custom_components.evnex.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Monotonic clock of the breaker, moved on by setting clock[0]."""
+    now = [1000.0]
+    monkeypatch.setattr(breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def opened_breaker() -> CircuitBreaker:
+    circuit_breaker = CircuitBreaker(
+        "test", failure_threshold=2, cooldown=10, max_cooldown=40
+    )
+    circuit_breaker.record_failure()
+    circuit_breaker.record_failure()
+    return circuit_breaker
+
+
+def test_opens_after_threshold(clock):
+    circuit_breaker = CircuitBreaker("test", failure_threshold=2, cooldown=10)
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == CLOSED
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == OPEN
+    assert not circuit_breaker.allow_request()
+
+
+def test_half_open_allows_a_single_probe(clock):
+    circuit_breaker = opened_breaker()
+    clock[0] += 10
+    assert circuit_breaker.state == HALF_OPEN
+    assert circuit_breaker.allow_request()
+    assert not circuit_breaker.allow_request()
+
+
+def test_probe_success_closes(clock):
+    circuit_breaker = opened_breaker()
+    clock[0] += 10
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == CLOSED
+    assert circuit_breaker.cooldown == 10
+    assert circuit_breaker.allow_request()
+
+
+def test_probe_failure_reopens_with_longer_cooldown(clock):
+    circuit_breaker = opened_breaker()
+    for cooldown in (20, 40, 40):
+        clock[0] += circuit_breaker.cooldown
+        assert circuit_breaker.allow_request()
+        circuit_breaker.record_failure()
+        assert circuit_breaker.state == OPEN
+        assert circuit_breaker.cooldown == cooldown
+
+
+def test_released_probe_is_retried(clock):
+    circuit_breaker = opened_breaker()
+    clock[0] += 10
+    assert circuit_breaker.allow_request()
+    # e.g. the probe was cancelled, or failed with an unrelated error
+    circuit_breaker.release_probe()
+    assert circuit_breaker.cooldown == 10
+    assert circuit_breaker.allow_request()
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == CLOSED
+
+
+def test_release_without_probe_does_nothing(clock):
+    circuit_breaker = CircuitBreaker("test", failure_threshold=2, cooldown=10)
+    circuit_breaker.release_probe()
+    assert circuit_breaker.state == CLOSED
+    circuit_breaker = opened_breaker()
+    circuit_breaker.release_probe()
+    assert not circuit_breaker.allow_request()
@@ -0,0 +1,131 @@
+"""Tests for the caches of session history and org insights."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from evnex.schema.org import EvnexOrgInsightEntry
+
+from benchmarks.fake_evnex import FakeEvnex, charge_point_id
+from custom_components.evnex import cache
+from custom_components.evnex.cache import (
+    SESSION_HISTORY_MAX_AGE,
+    OrgInsightsCache,
+    SessionHistoryCache,
+)
+
+CHARGE_POINT_ID = charge_point_id(0, 0)
+TODAY = date(2025, 1, 8)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Monotonic clock of the caches, moved on by setting clock[0]."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+async def fetch(evnex: FakeEvnex):
+    """Detail and session history of the charge point."""
+    detail = await evnex.get_charge_point_detail_v3(CHARGE_POINT_ID)
+    return detail.data.attributes, await evnex.get_charge_point_sessions(
+        CHARGE_POINT_ID
+    )
+
+
+async def test_idle_history_not_fetched_again(clock):
+    evnex = FakeEvnex(status="AVAILABLE")
+    history = SessionHistoryCache()
+    detail, sessions = await fetch(evnex)
+    assert history.needs_refresh(detail)
+
+    history.merge(sessions, detail)
+    detail, _ = await fetch(evnex)
+
+    assert not history.needs_refresh(detail)
+    clock[0] += SESSION_HISTORY_MAX_AGE + 1
+    assert history.needs_refresh(detail)
+
+
+async def test_active_session_fetched_again(clock):
+    evnex = FakeEvnex(status="CHARGING")
+    history = SessionHistoryCache()
+    detail, sessions = await fetch(evnex)
+
+    history.merge(sessions, detail)
+
+    assert history.has_active_session
+    assert history.needs_refresh(detail)
+
+
+async def test_connector_state_change_fetched_again(clock):
+    evnex = FakeEvnex(status="AVAILABLE")
+    history = SessionHistoryCache()
+    detail, sessions = await fetch(evnex)
+    history.merge(sessions, detail)
+    evnex.status = "PREPARING"
+
+    detail, _ = await fetch(evnex)
+
+    assert history.needs_refresh(detail)
+
+
+async def test_merge_keeps_the_newest_sessions(clock):
+    evnex = FakeEvnex(status="AVAILABLE", sessions=6)
+    history = SessionHistoryCache(max_sessions=4)
+    detail, sessions = await fetch(evnex)
+
+    history.merge(sessions[3:], detail)
+    merged = history.merge(sessions[:4], detail)
+
+    assert [session.id for session in merged] == [
+        session.id for session in sessions[:4]
+    ]
+
+
+def insights(days: int, today: date, power_usage: float = 1000.0):
+    """Daily insights of the days up to and including today, oldest first."""
+    return [
+        EvnexOrgInsightEntry(
+            carbonOffset=1.0,
+            cost={"currency": "NZD", "amount": 1.0},
+            duration=3600,
+            powerUsage=power_usage,
+            sessions=1,
+            startDate=datetime.combine(
+                today - timedelta(days=days - 1 - day),
+                datetime.min.time(),
+                timezone.utc,
+            ),
+        )
+        for day in range(days)
+    ]
+
+
+def test_insights_fetched_in_full_once_a_day():
+    org_insights = OrgInsightsCache(days=7)
+    assert org_insights.needs_full_fetch(TODAY)
+
+    org_insights.replace(insights(7, TODAY), TODAY)
+
+    assert not org_insights.needs_full_fetch(TODAY)
+    assert org_insights.needs_full_fetch(TODAY + timedelta(days=1))
+
+
+def test_current_day_updated_in_place():
+    org_insights = OrgInsightsCache(days=7)
+    org_insights.replace(insights(7, TODAY), TODAY)
+
+    assert org_insights.update_current_day(insights(1, TODAY, power_usage=2000.0))
+
+    assert [entry.powerUsage for entry in org_insights.insights] == [1000.0] * 6 + [
+        2000.0
+    ]
+
+
+def test_day_rollover_invalidates_the_window():
+    org_insights = OrgInsightsCache(days=7)
+    org_insights.replace(insights(7, TODAY), TODAY)
+
+    assert not org_insights.update_current_day(insights(1, TODAY + timedelta(days=1)))
+    assert org_insights.needs_full_fetch(TODAY)
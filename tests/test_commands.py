@@ -0,0 +1,40 @@
+"""Tests for commands sent from charger entities."""
+
+from homeassistant.const import STATE_ON
+from homeassistant.helpers import entity_registry as er
+
+from benchmarks.fake_evnex import FakeEvnex, charge_point_id
+from custom_components.evnex.const import DATA_CHARGE_POINT_COORDINATORS, DOMAIN
+
+from . import async_setup_evnex
+
+
+async def test_removed_entity_forgets_its_command(hass):
+    evnex = FakeEvnex(chargers=1, status="AVAILABLE")
+    entry = await async_setup_evnex(hass, evnex)
+    charger_id = charge_point_id(0, 0)
+    coordinator = hass.data[DOMAIN][entry.entry_id][DATA_CHARGE_POINT_COORDINATORS][
+        charger_id
+    ]
+    entity_registry = er.async_get(hass)
+    entity_id = entity_registry.async_get_entity_id(
+        "switch", DOMAIN, f"{charger_id}_charger_charge_now"
+    )
+
+    async def ignore_override(charge_point_id, charge_now, connector_id=1):
+        return True
+
+    # The charger never confirms the command
+    evnex.set_charge_point_override = ignore_override
+    await hass.services.async_call(
+        "switch", "turn_on", {"entity_id": entity_id}, blocking=True
+    )
+    assert hass.states.get(entity_id).state == STATE_ON
+    assert coordinator._expectations
+
+    entity_registry.async_remove(entity_id)
+    await hass.async_block_till_done()
+    assert not coordinator._expectations
+    # Settling the remaining expectations doesn't touch the removed entity
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
@@ -0,0 +1,50 @@
+"""Tests for adding an evnex account."""
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant import config_entries
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from benchmarks.fake_evnex import FakeEvnex
+from custom_components.evnex.const import DOMAIN
+
+
+@pytest.fixture(autouse=True)
+def no_entry_setup():
+    """Leave out setting up the entries the flow creates."""
+    with (
+        patch("custom_components.evnex.async_setup_entry", return_value=True),
+        patch("custom_components.evnex.async_unload_entry", return_value=True),
+    ):
+        yield
+
+
+async def start_flow(hass, evnex: FakeEvnex):
+    evnex.org_id = "00000000-0000-4000-9000-000000000000"
+    with patch("custom_components.evnex.config_flow.Evnex", return_value=evnex):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        return await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"username": "user@example.com", "password": "secret"}
+        )
+
+
+async def test_account_is_added_with_its_user_id(hass):
+    result = await start_flow(hass, FakeEvnex())
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id == "00000000-0000-4000-a000-000000000000"
+    assert result["data"]["user_id"] == result["result"].unique_id
+
+
+async def test_account_is_only_added_once(hass):
+    MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="00000000-0000-4000-a000-000000000000",
+        data={"username": "User@example.com", "password": "secret"},
+    ).add_to_hass(hass)
+    result = await start_flow(hass, FakeEvnex())
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
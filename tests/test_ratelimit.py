@@ -0,0 +1,103 @@
+"""Tests for the request budget and HTTP client shared by an account."""
+
+import asyncio
+import time
+
+import httpx
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from benchmarks.fake_evnex import FakeEvnex
+from custom_components.evnex.const import DATA_RATE_LIMITED_CLIENTS, DOMAIN
+from custom_components.evnex.ratelimit import (
+    EvnexRateLimiter,
+    RateLimitedTransport,
+    RequestPriority,
+    async_get_rate_limited_client,
+    command_priority,
+)
+
+from . import async_setup_evnex
+
+
+async def test_commands_sent_ahead_of_polling():
+    limiter = EvnexRateLimiter(rate=50, burst=1)
+    await limiter.acquire(RequestPriority.POLL)
+    order = []
+
+    async def request(name: str, priority: RequestPriority) -> None:
+        await limiter.acquire(priority)
+        order.append(name)
+
+    polls = [
+        asyncio.create_task(request(f"poll{i}", RequestPriority.POLL)) for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    command = asyncio.create_task(request("command", RequestPriority.COMMAND))
+    await asyncio.gather(*polls, command)
+
+    assert order == ["command", "poll0", "poll1", "poll2"]
+    assert limiter.queue_depth == 0
+
+
+async def test_retry_after_pauses_the_account():
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0.2"}),
+        httpx.Response(200, json={}),
+    ]
+    limiter = EvnexRateLimiter(rate=100, burst=10)
+    client = httpx.AsyncClient(
+        transport=RateLimitedTransport(
+            limiter, httpx.MockTransport(lambda request: responses.pop(0))
+        )
+    )
+
+    assert (await client.get("https://evnex.test/first")).status_code == 429
+    assert limiter.throttled == 1
+    assert limiter.paused_for > 0.1
+
+    start = time.monotonic()
+    with command_priority():
+        assert (await client.get("https://evnex.test/second")).status_code == 200
+    assert time.monotonic() - start >= 0.19
+
+
+async def test_cancelled_request_leaves_the_queue():
+    limiter = EvnexRateLimiter(rate=1, burst=1)
+    await limiter.acquire(RequestPriority.POLL)
+    waiting = asyncio.create_task(limiter.acquire(RequestPriority.POLL))
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 1
+
+    waiting.cancel()
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 0
+
+
+async def test_budget_of_the_owning_entry(hass: HomeAssistant):
+    owner = MockConfigEntry(domain=DOMAIN)
+    other = MockConfigEntry(domain=DOMAIN)
+
+    http_client = async_get_rate_limited_client(hass, owner, "User", rate=1, burst=5)
+    assert async_get_rate_limited_client(hass, other, "user", rate=2, burst=9) is (
+        http_client
+    )
+
+    assert (http_client.limiter.rate, http_client.limiter.burst) == (1, 5)
+
+
+async def test_client_closed_after_last_unload(hass: HomeAssistant):
+    entry = await async_setup_evnex(hass, FakeEvnex())
+    http_client = hass.data[DOMAIN][DATA_RATE_LIMITED_CLIENTS]["user"]
+    closed = []
+
+    async def aclose() -> None:
+        closed.append(True)
+
+    http_client.transport.aclose = aclose
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert closed == [True]
+    assert "user" not in hass.data[DOMAIN][DATA_RATE_LIMITED_CLIENTS]
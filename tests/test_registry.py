@@ -0,0 +1,59 @@
+"""Tests for the pollers shared between config entries."""
+
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from benchmarks.fake_evnex import FakeEvnex
+from custom_components.evnex.const import DATA_CHARGE_POINT_COORDINATORS, DOMAIN
+from custom_components.evnex.registry import CHARGE_POINT, ORG, EvnexPollerRegistry
+
+from . import async_setup_evnex
+
+
+async def test_owner_release_reloads_subscribers(hass: HomeAssistant):
+    registry = EvnexPollerRegistry(hass)
+    poller = object()
+    registry.async_register(ORG, "org", "owner", poller)
+
+    assert registry.async_subscribe(ORG, "org", "owner") is None
+    assert registry.async_subscribe(ORG, "org", "subscriber") is poller
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        registry.async_release("owner")
+
+    reload.assert_called_once_with("subscriber")
+    assert registry.async_subscribe(ORG, "org", "subscriber") is None
+
+
+async def test_subscriber_release_reloads_nothing(hass: HomeAssistant):
+    registry = EvnexPollerRegistry(hass)
+    registry.async_register(CHARGE_POINT, "charger", "owner", object())
+    registry.async_subscribe(CHARGE_POINT, "charger", "subscriber")
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        registry.async_release("subscriber")
+        registry.async_unregister(CHARGE_POINT, "charger", "owner")
+
+    reload.assert_not_called()
+
+
+async def test_subscriber_takes_over_a_shared_org(hass: HomeAssistant):
+    owner_evnex, subscriber_evnex = FakeEvnex(), FakeEvnex()
+    owner = await async_setup_evnex(hass, owner_evnex, user_id="owner")
+    subscriber = await async_setup_evnex(hass, subscriber_evnex, user_id="subscriber")
+
+    assert hass.data[DOMAIN][subscriber.entry_id][DATA_CHARGE_POINT_COORDINATORS] == {}
+    assert subscriber_evnex.calls["get_charge_point_detail_v3"] == 0
+
+    with patch("custom_components.evnex.EvnexClient", return_value=subscriber_evnex):
+        assert await hass.config_entries.async_unload(owner.entry_id)
+        await hass.async_block_till_done()
+
+    assert subscriber.state is ConfigEntryState.LOADED
+    coordinators = hass.data[DOMAIN][subscriber.entry_id][
+        DATA_CHARGE_POINT_COORDINATORS
+    ]
+    assert len(coordinators) == subscriber_evnex.chargers
+    assert subscriber_evnex.calls["get_charge_point_detail_v3"] > 0
@@ -0,0 +1,59 @@
+"""Tests for saving and reloading the snapshots of a config entry."""
+
+import json
+
+from benchmarks.fake_evnex import FakeEvnex, charge_point_id
+from custom_components.evnex.restore import _deserialize, _serialize
+from custom_components.evnex.snapshot import (
+    AccountSnapshot,
+    ChargePointSnapshot,
+    OrgInsightsSnapshot,
+)
+
+
+async def fetch_snapshots(evnex: FakeEvnex):
+    user = await evnex.get_user_detail()
+    charge_points_by_org = {
+        org.id: await evnex.get_org_charge_points(org.id) for org in user.organisations
+    }
+    account = AccountSnapshot(user, charge_points_by_org)
+    insights = OrgInsightsSnapshot(
+        {org.id: await evnex.get_org_insight(7, org.id) for org in user.organisations}
+    )
+    charge_points = {}
+    for charger_id in account.charge_point_brief:
+        detail = await evnex.get_charge_point_detail_v3(charger_id)
+        charge_points[charger_id] = ChargePointSnapshot(
+            charger_id,
+            detail.data.attributes,
+            await evnex.get_charge_point_override(charger_id),
+            await evnex.get_charge_point_sessions(charger_id),
+        )
+    return account, insights, charge_points
+
+
+async def test_snapshots_survive_save_and_reload():
+    account, insights, charge_points = await fetch_snapshots(
+        FakeEvnex(orgs=2, chargers=2, connectors=2)
+    )
+    # Saved as JSON by the store
+    saved = json.loads(json.dumps(_serialize(account, insights, charge_points)))
+    restored = _deserialize(saved)
+
+    assert restored.account.user == account.user
+    assert restored.account.charge_point_brief == account.charge_point_brief
+    assert restored.account.charge_point_to_org_map == account.charge_point_to_org_map
+    assert restored.insights.org_insights == insights.org_insights
+    assert restored.charge_points.keys() == charge_points.keys()
+    snapshot = restored.charge_points[charge_point_id(1, 1)]
+    original = charge_points[charge_point_id(1, 1)]
+    assert snapshot.detail == original.detail
+    assert snapshot.override == original.override
+    assert snapshot.sessions == original.sessions
+    assert snapshot.changes_since(original) == frozenset()
+
+
+async def test_insights_are_optional():
+    account, _, charge_points = await fetch_snapshots(FakeEvnex())
+    restored = _deserialize(_serialize(account, None, charge_points))
+    assert restored.insights.org_insights == {}
@@ -0,0 +1,64 @@
+"""Tests for the parts of a charge point snapshot which changed."""
+
+from benchmarks.fake_evnex import FakeEvnex, charge_point_id
+from custom_components.evnex.snapshot import (
+    OVERRIDE,
+    SESSIONS,
+    ChargePointSnapshot,
+    connector_part,
+)
+
+CHARGE_POINT_ID = charge_point_id(0, 0)
+
+
+async def snapshot(evnex: FakeEvnex, **changes) -> ChargePointSnapshot:
+    """Snapshot of a fresh fetch, updatedDate differs on every one."""
+    detail = await evnex.get_charge_point_detail_v3(CHARGE_POINT_ID)
+    return ChargePointSnapshot(
+        CHARGE_POINT_ID,
+        detail.data.attributes,
+        changes.get("override", await evnex.get_charge_point_override(CHARGE_POINT_ID)),
+        changes.get("sessions", await evnex.get_charge_point_sessions(CHARGE_POINT_ID)),
+    )
+
+
+async def test_first_snapshot_changes_everything():
+    assert (await snapshot(FakeEvnex())).changes_since(None) is None
+
+
+async def test_updated_dates_ignored():
+    evnex = FakeEvnex(connectors=2)
+    previous = await snapshot(evnex)
+
+    assert (await snapshot(evnex)).changes_since(previous) == frozenset()
+
+
+async def test_connector_status_change():
+    evnex = FakeEvnex(connectors=2)
+    previous = await snapshot(evnex)
+    evnex.status = "AVAILABLE"
+
+    current = await snapshot(evnex, sessions=previous.sessions)
+
+    assert current.changes_since(previous) == {
+        connector_part("1"),
+        connector_part("2"),
+    }
+
+
+async def test_override_and_sessions_change():
+    evnex = FakeEvnex()
+    previous = await snapshot(evnex)
+
+    current = await snapshot(evnex, override=None, sessions=previous.sessions[1:])
+
+    assert current.changes_since(previous) == {OVERRIDE, SESSIONS}
+
+
+async def test_network_status_change_changes_everything():
+    evnex = FakeEvnex()
+    previous = await snapshot(evnex)
+    current = await snapshot(evnex)
+    current.detail.networkStatus = "OFFLINE"
+
+    assert current.changes_since(previous) is None
@@ -0,0 +1,56 @@
+"""Tests for the persistence of the session tokens."""
+
+import json
+import os
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.evnex.const import TOKEN_FILE_NAME, TOKEN_STORAGE_KEY
+from custom_components.evnex.tokens import EvnexTokenStore
+
+TOKENS = {"id_token": "id", "refresh_token": "refresh", "access_token": "access"}
+
+
+async def test_legacy_token_file_migrated(hass: HomeAssistant, hass_storage):
+    legacy_file = hass.config.path(TOKEN_FILE_NAME)
+    with open(legacy_file, "w") as file:
+        json.dump({"entry": TOKENS}, file)
+
+    assert await EvnexTokenStore(hass).async_get("entry") == TOKENS
+    assert hass_storage[TOKEN_STORAGE_KEY]["data"] == {"entry": TOKENS}
+    assert not os.path.exists(legacy_file)
+
+
+async def test_stored_tokens_preferred_to_legacy_file(
+    hass: HomeAssistant, hass_storage
+):
+    hass_storage[TOKEN_STORAGE_KEY] = {
+        "version": 1,
+        "key": TOKEN_STORAGE_KEY,
+        "data": {"entry": TOKENS},
+    }
+    legacy_file = hass.config.path(TOKEN_FILE_NAME)
+    with open(legacy_file, "w") as file:
+        json.dump({"entry": {**TOKENS, "access_token": "legacy"}}, file)
+
+    assert await EvnexTokenStore(hass).async_get("entry") == TOKENS
+    assert os.path.exists(legacy_file)
+    os.remove(legacy_file)
+
+
+async def test_unchanged_tokens_not_written(hass: HomeAssistant):
+    store = EvnexTokenStore(hass)
+    await store.async_load()
+
+    with patch.object(store._store, "async_delay_save") as delay_save:
+        store.async_set("entry", **TOKENS)
+        store.async_set("entry", **TOKENS)
+        assert delay_save.call_count == 1
+
+        store.async_set("entry", **{**TOKENS, "access_token": "renewed"})
+        assert delay_save.call_count == 2
+
+        store.async_remove("entry")
+        store.async_remove("entry")
+        assert delay_save.call_count == 3
@@ -0,0 +1,46 @@
+"""Tests for the capabilities of connectors in the topology."""
+
+from custom_components.evnex.topology import ConnectorInfo
+
+
+def connector(**capabilities) -> ConnectorInfo:
+    return ConnectorInfo(
+        **{
+            "connector_id": "1",
+            "power_type": "AC_3_PHASE",
+            "max_amperage": 32,
+            "max_voltage": 230,
+            "voltage_phases": ("l1",),
+            "current_phases": ("l1",),
+            "has_temperature": False,
+            **capabilities,
+        }
+    )
+
+
+def test_from_connector_without_meter():
+    class Connector:
+        connectorId = "1"
+        powerType = "AC_1_PHASE"
+        maxAmperage = 32
+        maxVoltage = 230
+        meter = None
+
+    assert ConnectorInfo.from_connector(Connector()) == connector(
+        power_type="AC_1_PHASE"
+    )
+
+
+def test_merged_keeps_previous_capabilities():
+    previous = connector(
+        voltage_phases=("l1", "l2", "l3"),
+        current_phases=("l1", "l3"),
+        has_temperature=True,
+    )
+    assert connector(max_amperage=None).merged(previous) == previous
+
+
+def test_merged_adds_new_capabilities():
+    previous = connector(current_phases=("l1", "l3"))
+    merged = connector(current_phases=("l1", "l2"), max_amperage=16).merged(previous)
+    assert merged == connector(current_phases=("l1", "l2", "l3"), max_amperage=16)